@@ -0,0 +1,65 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+MODULE = "usdm3_excel"
+
+
+def import_times(module: str) -> dict[str, int]:
+    # -X importtime reports the self and cumulative microseconds of every
+    # module imported, in a fresh interpreter so nothing is already loaded.
+    # A module is listed after those it imports, indented below it
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, PYTHONPATH="src"),
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not name.startswith("  "):
+            # A top level import, so those before were not imported by it
+            if name.strip() != module:
+                times = {}
+                continue
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure the time taken to import the package"
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=10)
+    parser.add_argument("-t", "--top", type=int, default=10)
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        help="exit with an error if the median import time is above this",
+    )
+    args = parser.parse_args()
+    runs = [import_times(MODULE) for _ in range(args.repeat)]
+    total = statistics.median(x[MODULE] for x in runs) / 1000
+    print(f"import {MODULE}: {total:.1f} ms (median of {args.repeat})")
+    print(f"{'module':56} {'ms':>8}")
+    modules = {name for run in runs for name in run}
+    medians = {
+        name: statistics.median(run.get(name, 0) for run in runs) / 1000
+        for name in modules
+        if name != MODULE
+    }
+    for name in sorted(medians, key=medians.get, reverse=True)[: args.top]:
+        print(f"{name:56} {medians[name]:>8.1f}")
+    if args.max_ms is not None and total > args.max_ms:
+        print(f"Import time {total:.1f} ms is above the limit of {args.max_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
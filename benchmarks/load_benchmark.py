@@ -0,0 +1,52 @@
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from simple_error_log import Errors
+from usdm4 import USDM4
+from usdm3_excel import USDM3Excel
+from usdm3_excel.loader.trusted_loader import TrustedLoader
+
+TEST_FILES = ["tests/test_files/usdm_1.json", "tests/test_files/usdm_2.json"]
+
+
+def measure(function, repeat: int) -> float:
+    function()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare the validating and trusted USDM load paths"
+    )
+    parser.add_argument("usdm_filepaths", nargs="*", default=TEST_FILES)
+    parser.add_argument("-r", "--repeat", type=int, default=20)
+    args = parser.parse_args()
+    print(
+        f"{'file':32} {'KB':>6} {'load':>8} {'trusted':>8} {'export':>8} {'trusted':>8}  (median ms)"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, "benchmark.xlsx")
+        for path in args.usdm_filepaths:
+            load = measure(lambda: USDM4().load(path, Errors()), args.repeat)
+            trusted_load = measure(
+                lambda: TrustedLoader().load(path, Errors()), args.repeat
+            )
+            export = measure(lambda: USDM3Excel().to_excel(path, output), args.repeat)
+            trusted_export = measure(
+                lambda: USDM3Excel().to_excel(path, output, trusted=True), args.repeat
+            )
+            print(
+                f"{os.path.basename(path):32} {os.path.getsize(path) // 1024:>6} "
+                f"{load:>8.1f} {trusted_load:>8.1f} {export:>8.1f} {trusted_export:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
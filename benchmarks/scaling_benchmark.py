@@ -0,0 +1,103 @@
+import argparse
+import io
+import json
+import math
+import statistics
+import time
+import tracemalloc
+from simple_error_log import Errors
+from usdm4 import USDM4
+from usdm4_excel.export.base.ct_version import CTVersion
+from usdm3_excel import USDM3Excel
+from usdm3_excel.export.base.study_index import StudyIndex
+from usdm3_excel.export.study_content_sheet.content_panel import ContentPanel
+from usdm3_excel.export.study_identifiers_sheet.identifiers_panel import (
+    IdentifiersPanel,
+)
+from usdm3_excel.export.study_sheet.dates_panel import DatesPanel
+from usdm3_excel.export.study_timeline_sheet.activities_panel import ActivitiesPanel
+from usdm3_excel.export.study_timeline_sheet.headings_panel import HeadingsPanel
+from usdm3_excel.export.study_timing_sheet.timing_panel import TimingPanel
+from synthetic_study import SyntheticStudy
+
+PANELS = {
+    "ActivitiesPanel": lambda study: ActivitiesPanel(CTVersion()).execute(study),
+    "HeadingsPanel": lambda study: HeadingsPanel(
+        CTVersion(), StudyIndex(study)
+    ).execute(study),
+    "TimingPanel": lambda study: TimingPanel(CTVersion()).execute(study),
+    "ContentPanel": lambda study: ContentPanel(CTVersion()).execute(study),
+    "DatesPanel": lambda study: DatesPanel(CTVersion()).execute(study),
+    "IdentifiersPanel": lambda study: IdentifiersPanel(CTVersion()).execute(study),
+}
+
+
+def measure(function, repeat: int) -> tuple[float, int]:
+    function()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return statistics.median(timings) * 1000, peak
+
+
+def exponent(previous: dict, current: dict) -> str:
+    # Slope of the log-log curve; about 1 for linear, 2 for quadratic
+    if not previous or previous["ms"] <= 0:
+        return ""
+    ratio = current["factor"] / previous["factor"]
+    return f"{math.log(current['ms'] / previous['ms']) / math.log(ratio):.2f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Time and memory of each panel and the full export as synthetic studies grow"
+    )
+    parser.add_argument("-f", "--factors", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("-p", "--panels", nargs="+", choices=list(PANELS))
+    parser.add_argument("--json", help="write the measured curves to this file")
+    args = parser.parse_args()
+    panels = args.panels if args.panels else list(PANELS)
+    curves = {name: [] for name in panels + ["to_excel"]}
+    for factor in args.factors:
+        synthetic = SyntheticStudy.scaled(factor)
+        data = synthetic.build()
+        study = USDM4().loadd(data, Errors()).study
+        print(f"factor {factor}: {synthetic.sizes()}")
+        for name in panels:
+            ms, peak = measure(lambda: PANELS[name](study), args.repeat)
+            curves[name].append(
+                {"factor": factor, "ms": ms, "peak_bytes": peak, **synthetic.sizes()}
+            )
+        ms, peak = measure(
+            lambda: USDM3Excel().to_excel(data, io.BytesIO()), max(1, args.repeat // 2)
+        )
+        curves["to_excel"].append(
+            {"factor": factor, "ms": ms, "peak_bytes": peak, **synthetic.sizes()}
+        )
+    print(
+        f"\n{'benchmark':18} {'factor':>6} {'ms':>10} {'peak KB':>10} {'exponent':>8}"
+    )
+    for name, points in curves.items():
+        previous = None
+        for point in points:
+            print(
+                f"{name:18} {point['factor']:>6} {point['ms']:>10.2f} "
+                f"{point['peak_bytes'] // 1024:>10} {exponent(previous, point):>8}"
+            )
+            previous = point
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(curves, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
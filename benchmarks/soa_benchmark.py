@@ -0,0 +1,57 @@
+import argparse
+import statistics
+import time
+from simple_error_log import Errors
+from usdm4 import USDM4
+from usdm4_excel.export.base.ct_version import CTVersion
+from usdm3_excel.export.study_timeline_sheet.activities_panel import ActivitiesPanel
+from synthetic_study import SyntheticStudy
+
+SIZES = [(50, 30), (100, 60), (200, 125), (400, 250)]
+
+
+def measure(function, repeat: int) -> float:
+    function()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Time the Schedule of Activities matrix against the number of scheduled pairs"
+    )
+    parser.add_argument(
+        "-s",
+        "--sizes",
+        nargs="+",
+        help="activities x timepoints, for example 400x250",
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=10)
+    args = parser.parse_args()
+    sizes = (
+        [tuple(int(x) for x in size.split("x")) for size in args.sizes]
+        if args.sizes
+        else SIZES
+    )
+    print(
+        f"{'activities':>10} {'timepoints':>10} {'pairs':>8} {'cells':>8} {'ms':>8} {'ns/pair':>8} {'ns/cell':>8}"
+    )
+    for activities, timepoints in sizes:
+        synthetic = SyntheticStudy(activities=activities, timepoints=timepoints)
+        study = USDM4().loadd(synthetic.build(), Errors()).study
+        timeline = study.versions[0].studyDesigns[0].main_timeline()
+        pairs = sum(len(x.activityIds) for x in timeline.instances)
+        cells = activities * timepoints
+        ms = measure(lambda: ActivitiesPanel(CTVersion()).execute(study), args.repeat)
+        print(
+            f"{activities:>10} {timepoints:>10} {pairs:>8} {cells:>8} {ms:>8.2f} "
+            f"{ms * 1e6 / pairs:>8.0f} {ms * 1e6 / cells:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import copy
+import json
+
+TEMPLATE = "tests/test_files/usdm_1.json"
+
+
+class SyntheticStudy:
+    """Builds a USDM study of a given size from a template study.
+
+    The template supplies the parts that are not scaled (titles, epochs,
+    encounters, organizations, ...). The scaled collections are replaced by
+    generated items cloned from the first template item of the same kind.
+    """
+
+    def __init__(
+        self,
+        activities: int = 50,
+        timepoints: int = 20,
+        timings: int = 20,
+        sections: int = 100,
+        identifiers: int = 5,
+        dates: int = 5,
+        template: str = TEMPLATE,
+    ):
+        self.activities = activities
+        self.timepoints = timepoints
+        self.timings = timings
+        self.sections = sections
+        self.identifiers = identifiers
+        self.dates = dates
+        with open(template) as f:
+            self._template = json.load(f)
+
+    @classmethod
+    def scaled(cls, factor: int, template: str = TEMPLATE) -> "SyntheticStudy":
+        return cls(
+            activities=50 * factor,
+            timepoints=20 * factor,
+            timings=20 * factor,
+            sections=100 * factor,
+            identifiers=5 * factor,
+            dates=5 * factor,
+            template=template,
+        )
+
+    def sizes(self) -> dict:
+        return {
+            "activities": self.activities,
+            "timepoints": self.timepoints,
+            "timings": self.timings,
+            "sections": self.sections,
+            "identifiers": self.identifiers,
+            "dates": self.dates,
+        }
+
+    def build(self) -> dict:
+        data = copy.deepcopy(self._template)
+        version = data["study"]["versions"][0]
+        design = version["studyDesigns"][0]
+        timeline = next(x for x in design["scheduleTimelines"] if x["mainTimeline"])
+        design["activities"] = self._activities(design["activities"][0])
+        timeline["instances"] = self._timepoints(
+            timeline["instances"][0], design["activities"], design
+        )
+        timeline["timings"] = self._timings(timeline["timings"][0], timeline)
+        document_version = data["study"]["documentedBy"][0]["versions"][0]
+        document_version["contents"], version["narrativeContentItems"] = self._sections(
+            document_version["contents"][0], version["narrativeContentItems"][0]
+        )
+        version["studyIdentifiers"] = self._identifiers(
+            version["studyIdentifiers"][0], version["organizations"]
+        )
+        version["amendments"][0]["dateValues"] = self._dates(
+            version["amendments"][0]["dateValues"][0]
+        )
+        return data
+
+    def to_json(self) -> bytes:
+        return json.dumps(self.build()).encode()
+
+    def _activities(self, template: dict) -> list:
+        items = []
+        for i in range(self.activities):
+            item = self._clone(template, f"SyntheticActivity_{i + 1}")
+            item.update(
+                {
+                    "name": f"ACTIVITY-S{i + 1}",
+                    "label": f"Synthetic activity {i + 1}",
+                    "description": f"Synthetic activity {i + 1}",
+                    "previousId": self._chain("SyntheticActivity", i, -1),
+                    "nextId": self._chain("SyntheticActivity", i, 1, self.activities),
+                    "childIds": [],
+                    "definedProcedures": [],
+                    "biomedicalConceptIds": [],
+                    "bcCategoryIds": [],
+                    "bcSurrogateIds": [],
+                    "timelineId": None,
+                }
+            )
+            items.append(item)
+        return items
+
+    def _timepoints(self, template: dict, activities: list, design: dict) -> list:
+        items = []
+        epochs = design["epochs"]
+        encounters = design["encounters"]
+        for i in range(self.timepoints):
+            item = self._clone(template, f"SyntheticInstance_{i + 1}")
+            item.update(
+                {
+                    "name": f"SAI-S{i + 1}",
+                    "label": f"Day {i + 1}",
+                    "description": f"Synthetic instance {i + 1}",
+                    "defaultConditionId": None,
+                    "epochId": epochs[i * len(epochs) // self.timepoints]["id"],
+                    "encounterId": encounters[i % len(encounters)]["id"],
+                    "timelineExitId": None,
+                    # About a third of the activities at each timepoint
+                    "activityIds": [
+                        x["id"] for j, x in enumerate(activities) if (i + j) % 3 == 0
+                    ],
+                }
+            )
+            items.append(item)
+        return items
+
+    def _timings(self, template: dict, timeline: dict) -> list:
+        items = []
+        instances = timeline["instances"]
+        for i in range(self.timings):
+            item = self._clone(template, f"SyntheticTiming_{i + 1}")
+            anchor = instances[0]["id"] if instances else None
+            instance = instances[i % len(instances)]["id"] if instances else None
+            item.update(
+                {
+                    "name": f"TIMING-S{i + 1}",
+                    "label": f"Day {i + 1}",
+                    "description": f"Synthetic timing {i + 1}",
+                    "value": f"P{i + 1}D",
+                    "valueLabel": f"{i + 1} Days",
+                    "relativeFromScheduledInstanceId": instance,
+                    "relativeToScheduledInstanceId": anchor,
+                    "windowLabel": "-1..1 Days",
+                }
+            )
+            items.append(item)
+        return items
+
+    def _sections(self, content_template: dict, item_template: dict) -> tuple:
+        contents = []
+        items = []
+        for i in range(self.sections):
+            item = self._clone(item_template, f"SyntheticContentItem_{i + 1}")
+            item.update(
+                {
+                    "name": f"NCI-S{i + 1}",
+                    "text": f'<div xmlns="http://www.w3.org/1999/xhtml"><p>Section {i + 1} text.</p></div>',
+                }
+            )
+            items.append(item)
+            content = self._clone(content_template, f"SyntheticContent_{i + 1}")
+            content.update(
+                {
+                    "name": f"NC-S{i + 1}",
+                    "sectionNumber": f"{i // 10 + 1}.{i % 10 + 1}",
+                    "sectionTitle": f"Section {i + 1}",
+                    "childIds": [],
+                    "previousId": self._chain("SyntheticContent", i, -1),
+                    "nextId": self._chain("SyntheticContent", i, 1, self.sections),
+                    "contentItemId": item["id"],
+                }
+            )
+            contents.append(content)
+        return contents, items
+
+    def _identifiers(self, template: dict, organizations: list) -> list:
+        items = []
+        for i in range(self.identifiers):
+            item = self._clone(template, f"SyntheticIdentifier_{i + 1}")
+            item["text"] = f"SYN-{i + 1:05d}"
+            item["scopeId"] = organizations[i % len(organizations)]["id"]
+            items.append(item)
+        return items
+
+    def _dates(self, template: dict) -> list:
+        items = []
+        for i in range(self.dates):
+            item = self._clone(template, f"SyntheticDate_{i + 1}")
+            item.update(
+                {
+                    "name": f"DATE-S{i + 1}",
+                    "dateValue": f"{2000 + i % 30}-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                }
+            )
+            for j, scope in enumerate(item["geographicScopes"]):
+                scope["id"] = f"SyntheticScope_{i + 1}_{j + 1}"
+            items.append(item)
+        return items
+
+    def _clone(self, template: dict, id: str) -> dict:
+        item = copy.deepcopy(template)
+        item["id"] = id
+        return item
+
+    def _chain(self, prefix: str, i: int, step: int, count: int = None) -> str:
+        other = i + step
+        if other < 0 or (count is not None and other >= count):
+            return None
+        return f"{prefix}_{other + 1}"
@@ -0,0 +1,56 @@
+import argparse
+import io
+import os
+import statistics
+import time
+from usdm3_excel import USDM3Excel
+
+TEST_FILES = ["tests/test_files/usdm_1.json", "tests/test_files/usdm_2.json"]
+
+
+def measure(function, repeat: int) -> float:
+    function()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def render(exporter: USDM3Excel, plan, writer: str) -> int:
+    buffer = io.BytesIO()
+    exporter.from_plan(plan, buffer, writer)
+    return len(buffer.getvalue())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare the writer backends rendering the same sheet plans"
+    )
+    parser.add_argument("usdm_filepaths", nargs="*", default=TEST_FILES)
+    parser.add_argument("-r", "--repeat", type=int, default=20)
+    parser.add_argument("-w", "--writers", nargs="+", choices=list(USDM3Excel.WRITERS))
+    args = parser.parse_args()
+    writers = args.writers if args.writers else list(USDM3Excel.WRITERS)
+    print(
+        f"{'file':20} {'writer':10} {'render':>8} {'export':>8} {'KB':>6}  (median ms)"
+    )
+    exporter = USDM3Excel()
+    for path in args.usdm_filepaths:
+        plan = exporter.to_plan(path)
+        for writer in writers:
+            size = render(exporter, plan, writer)
+            rendered = measure(lambda: render(exporter, plan, writer), args.repeat)
+            exported = measure(
+                lambda: USDM3Excel().to_excel(path, io.BytesIO(), writer=writer),
+                args.repeat,
+            )
+            print(
+                f"{os.path.basename(path):20} {writer:10} {rendered:>8.1f} "
+                f"{exported:>8.1f} {size // 1024:>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
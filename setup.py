@@ -19,6 +19,7 @@ setuptools.setup(
     packages=setuptools.find_packages(where="src"),
     package_dir={"": "src"},
     package_data={},
+    entry_points={"console_scripts": ["usdm3-excel=usdm3_excel.cli:main"]},
     tests_require=[
         "pytest",
         "pytest-cov",
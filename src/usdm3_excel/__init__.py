@@ -1,56 +1,233 @@
+import functools
+import io
+import json
 import os
+import threading
+from collections.abc import AsyncIterator
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, BinaryIO, Union
 from simple_error_log import Errors
-from usdm3_excel.export.study_sheet.study_sheet import StudySheet
-from usdm3_excel.export.study_population_sheet.study_population_sheet import (
-    StudyPopulationSheet,
-)
-from usdm3_excel.export.study_identifiers_sheet.study_identifiers_sheet import (
-    StudyIdentifiersSheet,
-)
-from usdm3_excel.export.study_content_sheet.study_content_sheet import (
-    StudyContentSheet,
-)
-from usdm4_excel.export.study_activities_sheet.study_activities_sheet import (
-    StudyActivitiesSheet,
-)
-from usdm4_excel.export.study_encounters_sheet.study_encounters_sheet import (
-    StudyEncountersSheet,
-)
-from usdm4_excel.export.study_epochs_sheet.study_epochs_sheet import (
-    StudyEpochsSheet,
-)
-from usdm4_excel.export.study_arms_sheet.study_arms_sheet import (
-    StudyArmsSheet,
-)
-from usdm3_excel.export.study_design_sheet.study_design_sheet import (
-    StudyDesignSheet,
-)
-from usdm3_excel.export.study_timeline_sheet.study_timeline_sheet import (
-    StudyTimelineSheet,
-)
-from usdm4_excel.export.study_procedures_sheet.study_procedures_sheet import (
-    StudyProceduresSheet,
-)
-from usdm4_excel.export.configuration_sheet.configuration_sheet import (
-    ConfigurationSheet,
-)
-from usdm3_excel.export.study_timing_sheet.study_timing_sheet import StudyTimingSheet
-from usdm4_excel.export.base.empty_sheet import EmptySheet
-from usdm4_excel.export.base.ct_version import CTVersion
-from usdm4_excel.export.excel_table_writer.excel_table_writer import ExcelTableWriter
-from usdm4 import USDM4
-from usdm4.api.wrapper import Wrapper
+from simple_error_log.error_location import KlassMethodLocation
+from usdm3_excel.export.plan.sheet_plan import SheetPlan
+from usdm3_excel.export.plan.workbook_plan import WorkbookPlan
+from usdm3_excel.export.plan.plan_renderer import PlanRenderer
+from usdm3_excel.cache.export_cache import ExportCache
+from usdm3_excel.profiling.export_profile import ExportProfile, measure
+from usdm3_excel.batch.batch_runner import BatchRunner
+from usdm3_excel.batch.batch_result import BatchResult
+
+if TYPE_CHECKING:  # pragma: no cover
+    from usdm4.api.wrapper import Wrapper
+
+USDMSource = Union[str, os.PathLike, "Wrapper", dict, bytes]
+ExcelTarget = Union[str, os.PathLike, BinaryIO]
 
 
 class USDM3Excel:
-    def to_excel(self, usdm_filepath: str, excel_filepath: str):
+    MODULE = "usdm3_excel.USDM3Excel"
+    WRITERS = ["openpyxl", "streaming", "xml"]
+    # The names of SheetRunner.MODES and XlsxArchive.COMPRESSION, for those
+    # offering the options without importing the export
+    PARALLEL_MODES = ["thread", "process"]
+    COMPRESSIONS = ["store", "fast", "max"]
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, cache: ExportCache = None):
+        self._errors = Errors()
+        self._cache = cache
+
+    def to_excel(
+        self,
+        usdm_filepath: USDMSource,
+        excel_filepath: ExcelTarget,
+        writer: str = "openpyxl",
+        parallel: str = None,
+        plan_filepath: str = None,
+        trusted: bool = False,
+        profile: bool = False,
+        compression: str = None,
+        deterministic: bool = False,
+    ) -> ExportProfile | None:
+        from usdm3_excel.export.excel_table_writer.xlsx_archive import XlsxArchive
+
+        # Reject bad options before doing the work of building the plan
+        self._writer(writer)
+        XlsxArchive.check(compression)
+        if profile and parallel:
+            raise ValueError("Profiling measures sheets one at a time, not in parallel")
+        report = ExportProfile() if profile else None
+        if report:
+            report.start()
+        try:
+            self._export(
+                usdm_filepath,
+                excel_filepath,
+                writer,
+                parallel,
+                plan_filepath,
+                trusted,
+                report,
+                compression,
+                deterministic,
+            )
+        finally:
+            if report:
+                report.stop()
+        return report
+
+    def to_bytes(self, usdm_filepath: USDMSource, **options) -> bytes:
+        buffer = io.BytesIO()
+        self.to_excel(usdm_filepath, buffer, **options)
+        return buffer.getvalue()
+
+    def to_excel_designs(
+        self,
+        usdm_filepath: USDMSource,
+        excel_filepath: str,
+        writer: str = "openpyxl",
+        parallel: str = None,
+        trusted: bool = False,
+        compression: str = None,
+        deterministic: bool = False,
+    ) -> list[str]:
+        # The study is loaded once and every design of every version exported
+        # to its own workbook, named after the workbook given with the
+        # positions of the version and design added, such as study_v1_d2.xlsx.
+        # In parallel the designs rather than the sheets are run concurrently
+        from usdm3_excel.export.design_runner import DesignRunner
+        from usdm3_excel.export.design_selection import DesignSelection
+        from usdm3_excel.export.excel_table_writer.xlsx_archive import XlsxArchive
+
+        self._writer(writer)
+        XlsxArchive.check(compression)
+        runner = DesignRunner(parallel)
+        self._errors = Errors()
+        wrapper = self._load(usdm_filepath, trusted)
+        if wrapper is None:
+            return []
+        stem, extension = os.path.splitext(os.fspath(excel_filepath))
+        jobs = [
+            (x, f"{stem}_{x.name}{extension}")
+            for x in DesignSelection.all(wrapper.study)
+        ]
+        options = {
+            "writer": writer,
+            "compression": compression,
+            "deterministic": deterministic,
+        }
+        for errors in runner.execute(wrapper, jobs, options):
+            self._errors.merge(errors)
+        return [path for _, path in jobs]
+
+    async def to_excel_async(
+        self,
+        usdm_filepath: USDMSource,
+        writer: str = "openpyxl",
+        parallel: str = None,
+        trusted: bool = False,
+        compression: str = None,
+        deterministic: bool = False,
+        executor: Executor = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        # Loading, the sheets and the save run in the executor, the default of
+        # the event loop if not given, which must run them in this process.
+        # Cancelling stops the export before its next sheet
+        import asyncio
+        from concurrent.futures import ProcessPoolExecutor
+        from usdm3_excel.export.excel_table_writer.xlsx_archive import XlsxArchive
+
+        if isinstance(executor, ProcessPoolExecutor):
+            raise ValueError(
+                "The executor must run the export in this process, not a ProcessPoolExecutor"
+            )
+        self._writer(writer)
+        XlsxArchive.check(compression)
+        cancel = threading.Event()
+        buffer = io.BytesIO()
+        export = functools.partial(
+            self._export,
+            usdm_filepath,
+            buffer,
+            writer,
+            parallel,
+            plan_filepath=None,
+            trusted=trusted,
+            profile=None,
+            compression=compression,
+            deterministic=deterministic,
+            cancel=cancel,
+        )
+        try:
+            await asyncio.get_running_loop().run_in_executor(executor, export)
+        except asyncio.CancelledError:
+            cancel.set()
+            raise
+        data = buffer.getbuffer()
+        for start in range(0, len(data), chunk_size):
+            yield bytes(data[start : start + chunk_size])
+
+    def to_plan(
+        self,
+        usdm_filepath: USDMSource,
+        parallel: str = None,
+        previous: WorkbookPlan = None,
+        trusted: bool = False,
+        profile: ExportProfile = None,
+        lazy: bool = False,
+        cancel: threading.Event = None,
+    ) -> WorkbookPlan | None:
+        # The sheets import usdm4, usdm4_excel and openpyxl, which take most of
+        # the time of importing the package, so they are imported when needed
+        from usdm4_excel.export.base.ct_version import CTVersion
+        from usdm4_excel.export.base.empty_sheet import EmptySheet
+        from usdm4_excel.export.study_activities_sheet.study_activities_sheet import (
+            StudyActivitiesSheet,
+        )
+        from usdm4_excel.export.study_encounters_sheet.study_encounters_sheet import (
+            StudyEncountersSheet,
+        )
+        from usdm4_excel.export.study_epochs_sheet.study_epochs_sheet import (
+            StudyEpochsSheet,
+        )
+        from usdm4_excel.export.study_arms_sheet.study_arms_sheet import StudyArmsSheet
+        from usdm4_excel.export.study_procedures_sheet.study_procedures_sheet import (
+            StudyProceduresSheet,
+        )
+        from usdm4_excel.export.configuration_sheet.configuration_sheet import (
+            ConfigurationSheet,
+        )
+        from usdm3_excel.export.study_sheet.study_sheet import StudySheet
+        from usdm3_excel.export.study_population_sheet.study_population_sheet import (
+            StudyPopulationSheet,
+        )
+        from usdm3_excel.export.study_identifiers_sheet.study_identifiers_sheet import (
+            StudyIdentifiersSheet,
+        )
+        from usdm3_excel.export.study_content_sheet.study_content_sheet import (
+            StudyContentSheet,
+        )
+        from usdm3_excel.export.study_design_sheet.study_design_sheet import (
+            StudyDesignSheet,
+        )
+        from usdm3_excel.export.study_timeline_sheet.study_timeline_sheet import (
+            StudyTimelineSheet,
+        )
+        from usdm3_excel.export.study_timing_sheet.study_timing_sheet import (
+            StudyTimingSheet,
+        )
+        from usdm3_excel.export.sheet_runner import SheetRunner
+        from usdm3_excel.export.base.study_index import StudyIndex
+
+        self._errors = Errors()
         ct_version = CTVersion()
-        self._remove_exisitng_file(excel_filepath)
-        etw = ExcelTableWriter(excel_filepath, default_sheet_name="study")
-        usdm = USDM4()
-        errors = Errors()
-        wrapper: Wrapper = usdm.load(usdm_filepath, errors)
+        with measure(profile, ExportProfile.LOAD, "usdm"):
+            wrapper = self._load(usdm_filepath, trusted)
+        if wrapper is None:
+            # The reason has been logged as an error
+            return None
         study = wrapper.study
+        index = StudyIndex(study)
         empty_sheets = {
             "studyDesignElements": [
                 "name",
@@ -125,10 +302,12 @@ class USDM3Excel:
                 "dictionary",
             ],
         }
+        empty_plan = SheetPlan(name=PlanRenderer.STATIC)
         for sheet_name, column_names in empty_sheets.items():
-            _ = EmptySheet(ct_version, etw).blank(column_names, sheet_name)
+            with measure(profile, ExportProfile.BLANK, sheet_name):
+                _ = EmptySheet(ct_version, empty_plan).blank(column_names, sheet_name)
 
-        for klass in [
+        sheets = [
             StudySheet,
             StudyPopulationSheet,
             StudyIdentifiersSheet,
@@ -142,9 +321,189 @@ class USDM3Excel:
             StudyTimelineSheet,
             StudyProceduresSheet,
             ConfigurationSheet,
-        ]:
-            klass(ct_version, etw).save(study)
-        etw.save()
+        ]
+        runner = SheetRunner(parallel, lazy=lazy, cancel=cancel)
+        plans = runner.execute(sheets, study, index, ct_version, previous, profile)
+        # Nor is the workbook rendered if cancelled during the last sheet
+        runner.check_cancelled()
+        return WorkbookPlan([empty_plan] + plans)
+
+    def from_plan(
+        self,
+        plan: WorkbookPlan,
+        excel_filepath: ExcelTarget,
+        writer: str = "openpyxl",
+        profile: ExportProfile = None,
+        compression: str = None,
+        deterministic: bool = False,
+    ) -> None:
+        renderer = PlanRenderer(
+            self._writer(writer),
+            compression=compression,
+            deterministic=deterministic,
+        )
+        if self._is_path(excel_filepath):
+            self._remove_exisitng_file(excel_filepath)
+        renderer.render(plan, excel_filepath, profile)
+
+    def to_excel_many(
+        self, jobs: list[tuple[str, str]], workers: int = None, **options
+    ) -> list[BatchResult]:
+        return BatchRunner(workers, options, self._cache).execute(jobs)
+
+    def errors(self) -> Errors:
+        return self._errors
+
+    def _read_plan(self, plan_filepath: str) -> WorkbookPlan:
+        # A missing or unreadable plan just means every sheet is rebuilt
+        try:
+            with open(plan_filepath) as f:
+                return WorkbookPlan.from_json(f.read())
+        except (OSError, ValueError, KeyError):
+            return WorkbookPlan()
+
+    def _export(
+        self,
+        usdm_filepath: USDMSource,
+        excel_filepath: ExcelTarget,
+        writer: str,
+        parallel: str,
+        plan_filepath: str,
+        trusted: bool,
+        profile: ExportProfile,
+        compression: str,
+        deterministic: bool,
+        cancel: threading.Event = None,
+    ) -> None:
+        # A failed export must not leave an earlier workbook behind
+        if self._is_path(excel_filepath):
+            self._remove_exisitng_file(excel_filepath)
+        # The compression and dating change the bytes of the workbook, not its
+        # content
+        options = {"writer": writer}
+        if compression:
+            options["compression"] = compression
+        if deterministic:
+            options["deterministic"] = True
+        # Trusted input is not validated, so its workbook may have been built
+        # from input that a validating export would reject
+        if trusted:
+            options["trusted"] = True
+        key = self._cache_key(usdm_filepath, options)
+        if key:
+            with measure(profile, ExportProfile.CACHE, "get"):
+                found = self._cache.get(key, excel_filepath)
+            if found:
+                self._errors = Errors()
+                return
+        previous = self._read_plan(plan_filepath) if plan_filepath else None
+        from usdm3_excel.export.excel_table_writer.streaming_table_writer import (
+            StreamingTableWriter,
+        )
+
+        # The streaming writers take the rows of the larger sheets as they are
+        # produced rather than after they are all built
+        lazy = (
+            issubclass(self._writer(writer), StreamingTableWriter) and parallel is None
+        )
+        plan = self.to_plan(
+            usdm_filepath, parallel, previous, trusted, profile, lazy, cancel
+        )
+        if plan is None:
+            return
+        if plan_filepath:
+            with open(plan_filepath, "w") as f:
+                f.write(plan.to_json())
+        if not key or self._errors.error_count():
+            self.from_plan(
+                plan, excel_filepath, writer, profile, compression, deterministic
+            )
+            return
+        if self._is_path(excel_filepath):
+            self.from_plan(
+                plan, excel_filepath, writer, profile, compression, deterministic
+            )
+            data = excel_filepath
+        else:
+            # A stream cannot be read back so the workbook is built in memory
+            # to be both cached and written
+            data = self._render_bytes(plan, writer, profile, compression, deterministic)
+            excel_filepath.write(data)
+        with measure(profile, ExportProfile.CACHE, "put"):
+            self._cache.put(key, data)
+
+    def _load(self, usdm: USDMSource, trusted: bool) -> "Wrapper | None":
+        from usdm4 import USDM4
+        from usdm4.api.wrapper import Wrapper
+        from usdm3_excel.loader.trusted_loader import TrustedLoader
+
+        if isinstance(usdm, Wrapper):
+            return usdm
+        loader = TrustedLoader() if trusted else USDM4()
+        if isinstance(usdm, (bytes, bytearray, memoryview)):
+            try:
+                usdm = json.loads(bytes(usdm))
+            except ValueError as e:
+                self._errors.exception(
+                    "Failed to parse the USDM JSON",
+                    e,
+                    KlassMethodLocation(self.MODULE, "_load"),
+                )
+                return None
+        if isinstance(usdm, dict):
+            return loader.loadd(usdm, self._errors)
+        return loader.load(usdm, self._errors)
+
+    def _render_bytes(
+        self,
+        plan: WorkbookPlan,
+        writer: str,
+        profile: ExportProfile,
+        compression: str,
+        deterministic: bool,
+    ) -> bytes:
+        buffer = io.BytesIO()
+        self.from_plan(plan, buffer, writer, profile, compression, deterministic)
+        return buffer.getvalue()
+
+    def _cache_key(self, usdm: USDMSource, options: dict) -> str:
+        # Options that only change how the export runs, such as parallel, give
+        # the same workbook and so are not part of the key. Only input held as
+        # bytes can be keyed without serializing it again
+        if not self._cache:
+            return None
+        if isinstance(usdm, (bytes, bytearray, memoryview)):
+            return self._cache.key(usdm, options)
+        if self._is_path(usdm) and os.path.isfile(usdm):
+            return self._cache.key(usdm, options)
+        return None
+
+    def _is_path(self, target) -> bool:
+        return isinstance(target, (str, os.PathLike))
+
+    def _writer(self, name: str) -> type:
+        # The writers import openpyxl, so only the one asked for is imported
+        if name == "openpyxl":
+            from usdm3_excel.export.excel_table_writer.excel_table_writer import (
+                ExcelTableWriter,
+            )
+
+            return ExcelTableWriter
+        if name == "streaming":
+            from usdm3_excel.export.excel_table_writer.streaming_table_writer import (
+                StreamingTableWriter,
+            )
+
+            return StreamingTableWriter
+        if name == "xml":
+            from usdm3_excel.export.excel_table_writer.xml_table_writer import (
+                XmlTableWriter,
+            )
+
+            return XmlTableWriter
+        raise ValueError(
+            f"Unknown writer '{name}', expected one of {', '.join(self.WRITERS)}"
+        )
 
     def _remove_exisitng_file(self, excel_filepath: str) -> None:
         try:
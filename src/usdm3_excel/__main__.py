@@ -0,0 +1,4 @@
+import sys
+from usdm3_excel.cli import main
+
+sys.exit(main())
@@ -0,0 +1,33 @@
+from simple_error_log import Errors
+
+
+class BatchResult:
+    SUCCESS = "success"
+    FAILED = "failed"
+
+    def __init__(
+        self,
+        usdm_filepath: str,
+        excel_filepath: str,
+        status: str,
+        duration: float,
+        errors: Errors,
+    ):
+        self.usdm_filepath = usdm_filepath
+        self.excel_filepath = excel_filepath
+        self.status = status
+        self.duration = duration
+        self.errors = errors
+
+    @property
+    def success(self) -> bool:
+        return self.status == self.SUCCESS
+
+    def to_dict(self) -> dict:
+        return {
+            "usdm_filepath": self.usdm_filepath,
+            "excel_filepath": self.excel_filepath,
+            "status": self.status,
+            "duration": self.duration,
+            "errors": self.errors.to_dict(),
+        }
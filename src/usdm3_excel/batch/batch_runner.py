@@ -0,0 +1,112 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from simple_error_log import Errors
+from simple_error_log.error_location import KlassMethodLocation
+from usdm3_excel.cache.export_cache import ExportCache
+from .batch_result import BatchResult
+
+
+def initialise() -> None:
+    # Pay the heavy import cost once per worker rather than once per study
+    import usdm4  # noqa: F401
+    import usdm4_excel  # noqa: F401
+    import usdm3_excel  # noqa: F401
+
+
+def convert(
+    usdm_filepath: str,
+    excel_filepath: str,
+    options: dict = None,
+    cache: ExportCache = None,
+) -> BatchResult:
+    from usdm3_excel import USDM3Excel
+
+    start = time.perf_counter()
+    exporter = USDM3Excel(cache)
+    errors = Errors()
+    try:
+        exporter.to_excel(usdm_filepath, excel_filepath, **(options or {}))
+    except Exception as e:
+        errors.exception(
+            f"Failed to convert '{usdm_filepath}'",
+            e,
+            KlassMethodLocation(BatchRunner.MODULE, "convert"),
+        )
+    errors.merge(exporter.errors())
+    status = BatchResult.FAILED if errors.error_count() else BatchResult.SUCCESS
+    return BatchResult(
+        usdm_filepath, excel_filepath, status, time.perf_counter() - start, errors
+    )
+
+
+class BatchRunner:
+    MODULE = "usdm3_excel.batch.batch_runner.BatchRunner"
+
+    def __init__(
+        self, workers: int = None, options: dict = None, cache: ExportCache = None
+    ):
+        self.workers = workers if workers else os.cpu_count()
+        self.options = options if options else {}
+        self.cache = cache
+
+    def execute(self, jobs: list[tuple[str, str]]) -> list[BatchResult]:
+        if not jobs:
+            return []
+        results = [None] * len(jobs)
+        pending = list(range(len(jobs)))
+        while pending:
+            crashed, pending = self._run(jobs, pending, self.workers, results)
+            # A crashed worker breaks the whole pool, failing every job still
+            # in it. Those that were running are rerun one per pool to isolate
+            # the study responsible, and those not yet started are then run
+            # in a fresh pool
+            for index in crashed:
+                if self._run(jobs, [index], 1, results)[0]:
+                    results[index] = self._crashed(*jobs[index])
+        return results
+
+    def _run(
+        self,
+        jobs: list[tuple[str, str]],
+        indexes: list[int],
+        workers: int,
+        results: list[BatchResult],
+    ) -> tuple[list[int], list[int]]:
+        # Jobs are submitted as workers become free, so those submitted and
+        # not finished when the pool breaks are the ones that were running
+        workers = min(workers, len(indexes))
+        queue = list(indexes)
+        running = {}
+        with ProcessPoolExecutor(max_workers=workers, initializer=initialise) as pool:
+            try:
+                while queue or running:
+                    while queue and len(running) < workers:
+                        future = pool.submit(
+                            convert, *jobs[queue[0]], self.options, self.cache
+                        )
+                        running[future] = queue.pop(0)
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results[running[future]] = future.result()
+                        del running[future]
+            except BrokenProcessPool:
+                pass
+        crashed = []
+        for future, index in running.items():
+            try:
+                results[index] = future.result()
+            except BrokenProcessPool:
+                crashed.append(index)
+        return sorted(crashed), queue
+
+    def _crashed(self, usdm_filepath: str, excel_filepath: str) -> BatchResult:
+        errors = Errors()
+        errors.error(
+            f"Worker process terminated while converting '{usdm_filepath}'",
+            KlassMethodLocation(self.MODULE, "execute"),
+        )
+        return BatchResult(
+            usdm_filepath, excel_filepath, BatchResult.FAILED, 0.0, errors
+        )
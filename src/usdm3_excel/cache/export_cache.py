@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from importlib import metadata
+from typing import BinaryIO
+from usdm3_excel.__info__ import __package_version__
+
+
+class ExportCache:
+    """
+    A size bounded, content addressed cache of exported workbooks held on disk.
+    Entries are keyed by a hash of the USDM file bytes, the versions of the
+    packages producing the export and the export options. The least recently
+    used entries are evicted once the cache grows beyond its maximum size.
+    """
+
+    EXTENSION = ".xlsx"
+    DEFAULT_MAX_SIZE = 1024 * 1024 * 1024
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, usdm: str | bytes, options: dict) -> str:
+        hasher = hashlib.sha256()
+        if isinstance(usdm, (bytes, bytearray, memoryview)):
+            hasher.update(usdm)
+        else:
+            with open(usdm, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    hasher.update(chunk)
+        context = {
+            "usdm3_excel": __package_version__,
+            "usdm4": metadata.version("usdm4"),
+            "usdm4_excel": metadata.version("usdm4_excel"),
+            "options": options,
+        }
+        hasher.update(json.dumps(context, sort_keys=True).encode())
+        return hasher.hexdigest()
+
+    def get(self, key: str, excel: str | BinaryIO) -> bool:
+        path = self._path(key)
+        try:
+            if isinstance(excel, (str, os.PathLike)):
+                shutil.copyfile(path, excel)
+            else:
+                with open(path, "rb") as f:
+                    shutil.copyfileobj(f, excel)
+            # Modification time records use, access times are often disabled
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def put(self, key: str, excel: str | bytes) -> None:
+        # Write then rename so concurrent readers never see a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        if isinstance(excel, bytes):
+            with os.fdopen(fd, "wb") as f:
+                f.write(excel)
+        else:
+            os.close(fd)
+            shutil.copyfile(excel, temp_path)
+        os.replace(temp_path, self._path(key))
+        self._evict()
+
+    def size(self) -> int:
+        return sum(x[2] for x in self._entries())
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda x: x[1])
+        total = sum(x[2] for x in entries)
+        for path, _, size in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def _entries(self) -> list[tuple[str, int, int]]:
+        entries = []
+        with os.scandir(self.directory) as items:
+            for item in items:
+                if not item.name.endswith(self.EXTENSION):
+                    continue
+                try:
+                    stat = item.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((item.path, stat.st_mtime_ns, stat.st_size))
+        return entries
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{self.EXTENSION}")
@@ -0,0 +1,189 @@
+import argparse
+import json
+import os
+import sys
+from usdm3_excel import USDM3Excel
+from usdm3_excel.batch.batch_result import BatchResult
+from usdm3_excel.cache.export_cache import ExportCache
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="usdm3-excel", description="Export USDM JSON files to USDM3 Excel"
+    )
+    options = argparse.ArgumentParser(add_help=False)
+    options.add_argument(
+        "--writer", choices=list(USDM3Excel.WRITERS), default="openpyxl"
+    )
+    options.add_argument(
+        "--compression",
+        choices=USDM3Excel.COMPRESSIONS,
+        help="store the workbook parts uncompressed, or deflate them fast or to the smallest size",
+    )
+    options.add_argument(
+        "--deterministic",
+        action="store_true",
+        help="date the workbook at a fixed time so the same input always gives the same bytes",
+    )
+    options.add_argument(
+        "--parallel",
+        choices=USDM3Excel.PARALLEL_MODES,
+        help="compute the sheets concurrently using threads or processes",
+    )
+    options.add_argument(
+        "--trusted",
+        action="store_true",
+        help="skip model validation for input already validated upstream",
+    )
+    options.add_argument(
+        "--cache-dir", help="reuse workbooks exported earlier from identical input"
+    )
+    options.add_argument(
+        "--cache-size",
+        type=int,
+        default=ExportCache.DEFAULT_MAX_SIZE // (1024 * 1024),
+        help="maximum size of the cache in MB",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    convert = commands.add_parser(
+        "convert", parents=[options], help="convert a single USDM file"
+    )
+    convert.add_argument("usdm_filepath")
+    convert.add_argument("excel_filepath")
+    convert.add_argument(
+        "--profile",
+        help="write the time and memory used by each stage of the export as JSON to this file",
+    )
+    convert.add_argument(
+        "--plan",
+        help="keep the sheet plans in this file and only rebuild the sheets whose inputs changed since the last export",
+    )
+    convert.add_argument(
+        "--all-designs",
+        action="store_true",
+        help="export every design of every version to its own workbook, named after the Excel file with the version and design added",
+    )
+    batch = commands.add_parser(
+        "batch",
+        parents=[options],
+        help="convert many USDM files using a pool of worker processes",
+    )
+    batch.add_argument("usdm_filepaths", nargs="+")
+    batch.add_argument("-o", "--output-dir", required=True)
+    batch.add_argument("-w", "--workers", type=int, default=None)
+    batch.add_argument("--report", help="write per-job results as JSON to this file")
+    serve = commands.add_parser(
+        "serve",
+        parents=[options],
+        help="keep worker processes ready and convert USDM JSON posted to a local HTTP endpoint",
+    )
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int)
+    serve.add_argument("-w", "--workers", type=int, default=None)
+    serve.add_argument(
+        "--max-size",
+        type=int,
+        help="largest request body accepted in MB, 100 if not given",
+    )
+    args = parser.parse_args(argv)
+    if args.command == "convert" and args.all_designs and (args.plan or args.profile):
+        parser.error("--all-designs cannot be combined with --plan or --profile")
+    if args.command == "convert":
+        return _convert(args)
+    if args.command == "serve":
+        return _serve(args)
+    return _batch(args)
+
+
+def _convert(args: argparse.Namespace) -> int:
+    exporter = USDM3Excel(_cache(args))
+    try:
+        if args.all_designs:
+            for path in exporter.to_excel_designs(
+                args.usdm_filepath, args.excel_filepath, **_options(args)
+            ):
+                print(path)
+        else:
+            report = exporter.to_excel(
+                args.usdm_filepath,
+                args.excel_filepath,
+                plan_filepath=args.plan,
+                profile=bool(args.profile),
+                **_options(args),
+            )
+            if report:
+                with open(args.profile, "w") as f:
+                    f.write(report.to_json())
+    except Exception as e:
+        print(f"Failed to convert '{args.usdm_filepath}': {e}", file=sys.stderr)
+        return 1
+    errors = exporter.errors()
+    if errors.error_count():
+        print(errors.dump(), file=sys.stderr)
+        return 1
+    return 0
+
+
+def _batch(args: argparse.Namespace) -> int:
+    os.makedirs(args.output_dir, exist_ok=True)
+    names = set()
+    jobs = [
+        (path, _excel_filepath(path, args.output_dir, names))
+        for path in args.usdm_filepaths
+    ]
+    results = USDM3Excel(_cache(args)).to_excel_many(
+        jobs, workers=args.workers, **_options(args)
+    )
+    for result in results:
+        print(f"{result.status:7} {result.duration:8.2f}s {result.usdm_filepath}")
+    failed = [x for x in results if x.status != BatchResult.SUCCESS]
+    print(f"{len(results) - len(failed)} converted, {len(failed)} failed")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump([x.to_dict() for x in results], f, indent=2)
+    return 1 if failed else 0
+
+
+def _serve(args: argparse.Namespace) -> int:
+    from usdm3_excel.server.export_server import ExportServer
+
+    port = ExportServer.DEFAULT_PORT if args.port is None else args.port
+    max_size = args.max_size * 1024 * 1024 if args.max_size else None
+    server = ExportServer(
+        args.host, port, args.workers, _options(args), _cache(args), max_size
+    )
+    server.start()
+    host, port = server.address
+    print(f"Converting at http://{host}:{port}/convert with {server.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _options(args: argparse.Namespace) -> dict:
+    return {
+        "writer": args.writer,
+        "parallel": args.parallel,
+        "trusted": args.trusted,
+        "compression": args.compression,
+        "deterministic": args.deterministic,
+    }
+
+
+def _cache(args: argparse.Namespace) -> ExportCache:
+    if not args.cache_dir:
+        return None
+    return ExportCache(args.cache_dir, args.cache_size * 1024 * 1024)
+
+
+def _excel_filepath(usdm_filepath: str, output_dir: str, names: set) -> str:
+    stem = os.path.splitext(os.path.basename(usdm_filepath))[0]
+    name = stem
+    count = 1
+    while name in names:
+        name = f"{stem}_{count}"
+        count += 1
+    names.add(name)
+    return os.path.join(output_dir, f"{name}.xlsx")
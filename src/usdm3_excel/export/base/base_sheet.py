@@ -0,0 +1,25 @@
+from usdm4.api.study import Study
+from usdm4_excel.export.base.base_sheet import BaseSheet as USDM4BaseSheet
+from usdm4_excel.export.base.ct_version import CTVersion
+from usdm4_excel.export.excel_table_writer.excel_table_writer import ExcelTableWriter
+from .study_index import StudyIndex
+
+
+class BaseSheet(USDM4BaseSheet):
+    def __init__(
+        self,
+        ct_version: CTVersion,
+        etw: ExcelTableWriter,
+        index: StudyIndex = None,
+        lazy: bool = False,
+    ):
+        super().__init__(ct_version, etw)
+        self.index = index
+        # Panels that can yield their rows as the table is written
+        self.lazy = lazy
+
+    @classmethod
+    def parts(cls, study: Study) -> list:
+        # A sheet written in parts that can be computed separately, such as
+        # one per timeline, lists them here and saves each with save_part
+        return []
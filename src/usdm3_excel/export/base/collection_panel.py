@@ -0,0 +1,25 @@
+from typing import Iterable
+from usdm4.api.study import Study
+from usdm4_excel.export.base.collection_panel import (
+    CollectionPanel as USDM4CollectionPanel,
+)
+from usdm4_excel.export.base.ct_version import CTVersion
+from .study_index import StudyIndex
+from .table import Table
+
+
+class CollectionPanel(USDM4CollectionPanel):
+    # Column headings; rows are projected straight into this order as tuples
+    COLUMNS: list[str] = []
+
+    def __init__(self, ct_version: CTVersion, index: StudyIndex = None):
+        super().__init__(ct_version)
+        self.index = index
+
+    def _table(self, collection: Iterable[tuple]) -> Table:
+        return Table(self.COLUMNS, collection)
+
+    def _study_index(self, study: Study) -> StudyIndex:
+        if self.index is None:
+            self.index = StudyIndex(study)
+        return self.index
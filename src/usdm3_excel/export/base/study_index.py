@@ -0,0 +1,62 @@
+from usdm4.api.study import Study
+from usdm4.api.study_epoch import StudyEpoch
+from usdm4.api.encounter import Encounter
+from usdm4.api.organization import Organization
+from usdm4.api.narrative_content import NarrativeContentItem
+from usdm4.api.study_definition_document_version import StudyDefinitionDocumentVersion
+from usdm4.api.scheduled_instance import (
+    ScheduledActivityInstance,
+    ScheduledDecisionInstance,
+)
+
+
+class StudyIndex:
+    def __init__(self, study: Study):
+        self._timepoints = {}
+        self._epochs = {}
+        self._encounters = {}
+        self._organizations = {}
+        self._content_items = {}
+        self._document_versions = {}
+        for version in study.versions:
+            self._organizations[version.id] = self._map(version.organizations)
+            self._content_items[version.id] = self._map(version.narrativeContentItems)
+            for design in version.studyDesigns:
+                self._epochs[design.id] = self._map(design.epochs)
+                self._encounters[design.id] = self._map(design.encounters)
+                for timeline in design.scheduleTimelines:
+                    self._timepoints[timeline.id] = self._map(timeline.instances)
+        for document in study.documentedBy:
+            for doc_version in document.versions:
+                self._document_versions.setdefault(doc_version.id, doc_version)
+
+    def timepoint(
+        self, timeline_id: str, id: str
+    ) -> ScheduledActivityInstance | ScheduledDecisionInstance | None:
+        return self._lookup(self._timepoints, timeline_id, id)
+
+    def epoch(self, design_id: str, id: str) -> StudyEpoch | None:
+        return self._lookup(self._epochs, design_id, id)
+
+    def encounter(self, design_id: str, id: str) -> Encounter | None:
+        return self._lookup(self._encounters, design_id, id)
+
+    def organization(self, version_id: str, id: str) -> Organization | None:
+        return self._lookup(self._organizations, version_id, id)
+
+    def content_item(self, version_id: str, id: str) -> NarrativeContentItem | None:
+        return self._lookup(self._content_items, version_id, id)
+
+    def document_version(self, id: str) -> StudyDefinitionDocumentVersion | None:
+        return self._document_versions.get(id)
+
+    def _lookup(self, scopes: dict, scope_id: str, id: str):
+        items = scopes.get(scope_id)
+        return items.get(id) if items else None
+
+    def _map(self, items: list) -> dict:
+        # First occurrence wins, matching the linear next(...) searches replaced
+        result = {}
+        for item in items:
+            result.setdefault(item.id, item)
+        return result
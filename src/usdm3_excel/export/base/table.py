@@ -0,0 +1,43 @@
+from typing import Any, Iterable, Iterator, Sequence
+
+
+class Table:
+    """Column headings and the row tuples under them.
+
+    Iterates and measures like the list of lists add_table takes,
+    headings first, so the writers consume it as is. The rows of a lazy
+    table are an iterator, produced once as the table is written, and the
+    table has no length until then.
+    """
+
+    __slots__ = ("columns", "rows")
+
+    def __init__(self, columns: Sequence[str], rows: Iterable[tuple] = None):
+        self.columns = tuple(columns)
+        self.rows = rows if rows is not None else []
+
+    @property
+    def lazy(self) -> bool:
+        return not isinstance(self.rows, list)
+
+    def append(self, row: tuple) -> None:
+        self.rows.append(row)
+
+    def to_list(self) -> list[list[Any]]:
+        return [list(row) for row in self]
+
+    def __len__(self) -> int:
+        return len(self.rows) + 1
+
+    def __iter__(self) -> Iterator[tuple]:
+        yield self.columns
+        yield from self.rows
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Table):
+            return self.columns == other.columns and self.rows == other.rows
+        if isinstance(other, list):
+            return self.to_list() == [list(row) for row in other]
+        return NotImplemented
+
+    __hash__ = None
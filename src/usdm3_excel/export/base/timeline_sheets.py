@@ -0,0 +1,70 @@
+import re
+from usdm4.api.study_design import StudyDesign
+from usdm4.api.schedule_timeline import ScheduleTimeline
+
+
+class TimelineSheets:
+    """
+    The timelines of a study design in the order their sheets are written,
+    the main timeline first, and the name of the sheet for each.
+
+    The main timeline is written to the mainTimeline sheet, even when the
+    design has none. The other timelines are written to sheets named after
+    them, made valid and unique within the workbook, as listed in the
+    otherTimelines of the design sheet.
+    """
+
+    MAIN = "mainTimeline"
+    MAX_LENGTH = 31
+
+    # Excel does not allow these in sheet names, and the list of other
+    # timelines is split on commas and quotes
+    INVALID = re.compile(r"[\[\]:*?/\\,'\"]")
+
+    # The other sheets of the workbook
+    RESERVED = {
+        "study",
+        "studyidentifiers",
+        "studydesign",
+        "studydesignactivities",
+        "studydesignarms",
+        "studydesigncontent",
+        "studydesignelements",
+        "studydesigneligibilitycriteria",
+        "studydesignencounters",
+        "studydesignepochs",
+        "studydesignestimands",
+        "studydesignindications",
+        "studydesigninterventions",
+        "studydesignoe",
+        "studydesignpopulations",
+        "studydesignprocedures",
+        "studydesigntiming",
+        "configuration",
+        "history",
+    }
+
+    def __init__(self, design: StudyDesign):
+        main = design.main_timeline()
+        others = [x for x in design.scheduleTimelines if x is not main]
+        self.timelines: list[ScheduleTimeline | None] = [main] + others
+        self.names = [self.MAIN]
+        used = self.RESERVED | {self.MAIN.lower()}
+        for position, timeline in enumerate(others, start=2):
+            name = self._name(timeline.name, f"timeline{position}", used)
+            used.add(name.lower())
+            self.names.append(name)
+
+    def __len__(self) -> int:
+        return len(self.timelines)
+
+    def _name(self, text: str, default: str, used: set) -> str:
+        base = " ".join(self.INVALID.sub(" ", text or "").split())
+        base = base[: self.MAX_LENGTH].strip() or default
+        name = base
+        count = 2
+        while name.lower() in used:
+            suffix = f" {count}"
+            name = base[: self.MAX_LENGTH - len(suffix)].rstrip() + suffix
+            count += 1
+        return name
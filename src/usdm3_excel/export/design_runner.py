@@ -0,0 +1,78 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from simple_error_log import Errors
+from usdm4.api.wrapper import Wrapper
+from .design_selection import DesignSelection
+from .sheet_runner import SheetRunner
+
+_worker = {}
+
+
+def export_design(
+    wrapper: Wrapper, selection: DesignSelection, excel_filepath: str, options: dict
+) -> Errors:
+    from usdm3_excel import USDM3Excel
+
+    exporter = USDM3Excel()
+    exporter.to_excel(selection.view(wrapper), excel_filepath, **options)
+    return exporter.errors()
+
+
+def _initialise(wrapper: Wrapper) -> None:
+    _worker["wrapper"] = wrapper
+
+
+def _export_in_process(
+    selection: DesignSelection, excel_filepath: str, options: dict
+) -> Errors:
+    return export_design(_worker["wrapper"], selection, excel_filepath, options)
+
+
+class DesignRunner:
+    """
+    Exports each design of a loaded study to its own workbook, one after the
+    other or concurrently on threads or processes. Processes are given the
+    study once, when they start.
+    """
+
+    MODES = SheetRunner.MODES
+
+    def __init__(self, mode: str = None, workers: int = None):
+        if mode is not None and mode not in self.MODES:
+            raise ValueError(
+                f"Unknown parallel mode '{mode}', expected one of {', '.join(self.MODES)}"
+            )
+        self.mode = mode
+        self.workers = workers if workers else os.cpu_count()
+
+    def execute(
+        self,
+        wrapper: Wrapper,
+        jobs: list[tuple[DesignSelection, str]],
+        options: dict = None,
+    ) -> list[Errors]:
+        options = options if options else {}
+        if self.mode is None or not jobs:
+            return [export_design(wrapper, *job, options) for job in jobs]
+        with self._executor(wrapper, len(jobs)) as executor:
+            futures = [self._submit(executor, wrapper, job, options) for job in jobs]
+            return [x.result() for x in futures]
+
+    def _executor(self, wrapper: Wrapper, count: int) -> Executor:
+        workers = max(1, min(self.workers, count))
+        if self.mode == SheetRunner.PROCESS:
+            return ProcessPoolExecutor(
+                max_workers=workers, initializer=_initialise, initargs=(wrapper,)
+            )
+        return ThreadPoolExecutor(max_workers=workers)
+
+    def _submit(
+        self,
+        executor: Executor,
+        wrapper: Wrapper,
+        job: tuple[DesignSelection, str],
+        options: dict,
+    ):
+        if self.mode == SheetRunner.PROCESS:
+            return executor.submit(_export_in_process, *job, options)
+        return executor.submit(export_design, wrapper, *job, options)
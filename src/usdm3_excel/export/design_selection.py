@@ -0,0 +1,38 @@
+from usdm4.api.study import Study
+from usdm4.api.wrapper import Wrapper
+
+
+class DesignSelection:
+    """
+    One design of one version of a study, by position.
+
+    The sheets export the first design of the first version of the study they
+    are given, so a design is exported from a view of the study holding just
+    its version with just that design. Views are shallow copies sharing
+    everything else with the study.
+    """
+
+    def __init__(self, version: int, design: int):
+        self.version = version
+        self.design = design
+
+    @classmethod
+    def all(cls, study: Study) -> list["DesignSelection"]:
+        return [
+            cls(v, d)
+            for v, version in enumerate(study.versions)
+            for d in range(len(version.studyDesigns))
+        ]
+
+    @property
+    def name(self) -> str:
+        return f"v{self.version + 1}_d{self.design + 1}"
+
+    def view(self, wrapper: Wrapper) -> Wrapper:
+        study = wrapper.study
+        version = study.versions[self.version]
+        version = version.model_copy(
+            update={"studyDesigns": [version.studyDesigns[self.design]]}
+        )
+        study = study.model_copy(update={"versions": [version]})
+        return wrapper.model_copy(update={"study": study})
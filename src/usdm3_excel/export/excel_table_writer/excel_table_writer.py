@@ -0,0 +1,71 @@
+import datetime
+import os
+import pickle
+from typing import Any, List
+from openpyxl import Workbook
+from usdm4_excel.export.excel_table_writer.excel_table_writer import (
+    ExcelTableWriter as USDM4ExcelTableWriter,
+)
+from usdm3_excel.export.base.table import Table
+from usdm3_excel.export.excel_table_writer.xlsx_archive import XlsxArchive
+
+
+class ExcelTableWriter(USDM4ExcelTableWriter):
+    def __init__(
+        self,
+        workbook_path: str,
+        default_sheet_name: str = "Sheet1",
+        template: bytes = None,
+        compression: str = None,
+        deterministic: bool = False,
+    ):
+        XlsxArchive.check(compression)
+        self.template = template
+        self.compression = compression
+        self.deterministic = deterministic
+        super().__init__(workbook_path, default_sheet_name)
+
+    def to_template(self) -> bytes:
+        return pickle.dumps(self.workbook, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def add_table(
+        self,
+        data: List[List[Any]],
+        sheet_name: str,
+        start_row: int = 1,
+        start_col: int = 1,
+    ) -> int:
+        # The whole workbook is held in memory here anyway, so a lazy table is
+        # simply produced in full
+        if isinstance(data, Table) and data.lazy:
+            data = data.to_list()
+        return super().add_table(data, sheet_name, start_row, start_col)
+
+    def save(self, output_path: str = None) -> None:
+        save_path = output_path if output_path else self.workbook_path
+        XlsxArchive.save_workbook(
+            self.workbook, save_path, self.compression, self.deterministic
+        )
+
+    def _load_workbook(self):
+        if self.template is not None:
+            self.workbook = pickle.loads(self.template)
+            # Unpickling drops the default factories of the dimension holders
+            for worksheet in self.workbook.worksheets:
+                worksheet.column_dimensions.default_factory = worksheet._add_column
+                worksheet.row_dimensions.default_factory = worksheet._add_row
+            # The template was created by an earlier export, not this one
+            self.workbook.properties.created = (
+                XlsxArchive.TIMESTAMP
+                if self.deterministic
+                else datetime.datetime.now(tz=datetime.timezone.utc).replace(
+                    tzinfo=None
+                )
+            )
+            return
+        # A workbook written to a file object, such as a BytesIO or a response
+        # stream, is always a new one
+        if isinstance(self.workbook_path, (str, os.PathLike)):
+            return super()._load_workbook()
+        self.workbook = Workbook()
+        self.workbook.active.title = self.default_sheet_name
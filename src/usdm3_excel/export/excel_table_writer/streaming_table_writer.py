@@ -0,0 +1,350 @@
+import pickle
+import tempfile
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, PatternFill
+from openpyxl.styles.fonts import DEFAULT_FONT
+from openpyxl.utils import get_column_letter, column_index_from_string
+from openpyxl.utils.cell import range_boundaries
+from typing import List, Any, Union, Tuple
+from usdm3_excel.export.base.table import Table
+from usdm3_excel.export.excel_table_writer.xlsx_archive import XlsxArchive
+
+
+class StreamingTableWriter:
+    """
+    A write-only alternative to ExcelTableWriter with the same table, format and
+    column width calls.
+
+    Only the sheet currently being written is held in memory. As soon as a
+    different sheet is addressed the current sheet's cell values and formats are
+    spilled to a temporary file, and are read back only if the sheet is addressed
+    again. On save each sheet is streamed in turn through an openpyxl write-only
+    worksheet, so peak memory is bounded by the largest sheet rather than the
+    whole workbook and no cell object model is built.
+
+    Formats are kept as ranges rather than per cell. The rows of a lazy table
+    are written to their own temporary file as they are produced, so a sheet
+    made of lazy tables holds a single row in memory at a time.
+    """
+
+    def __init__(
+        self,
+        workbook_path: str,
+        default_sheet_name: str = "Sheet1",
+        compression: str = None,
+        deterministic: bool = False,
+    ):
+        """
+        Args:
+            workbook_path (str): Path the workbook is saved to
+            default_sheet_name (str, optional): Name of the first sheet. Defaults to "Sheet1".
+            compression (str, optional): One of XlsxArchive.COMPRESSION. Defaults to None,
+                                         the zlib default level.
+            deterministic (bool, optional): Date the workbook at XlsxArchive.TIMESTAMP
+                                            rather than now. Defaults to False.
+        """
+        XlsxArchive.check(compression)
+        self.workbook_path = workbook_path
+        self.default_sheet_name = default_sheet_name
+        self.compression = compression
+        self.deterministic = deterministic
+        self.workbook = self._new_workbook()
+        self._worksheets = {}
+        self._buffers = {}
+        self._spills = {}
+        self._streams = {}
+        self._current = None
+        self._sheet(default_sheet_name)
+
+    def add_table(
+        self,
+        data: List[List[Any]],
+        sheet_name: str,
+        start_row: int = 1,
+        start_col: int = 1,
+    ) -> int:
+        """
+        Add a table (list of lists) to a specific position in a worksheet.
+
+        Args:
+            data (List[List[Any]]): The table data as a list of lists
+            sheet_name (str): Name of the sheet to add the table to
+            start_row (int, optional): Row number to start adding the table (1-based). Defaults to 1.
+            start_col (int, optional): Column number to start adding the table (1-based). Defaults to 1.
+
+        Returns:
+            int: The last row used in the sheet after adding the table
+        """
+        sheet = self._sheet(sheet_name)
+        sheet["tables"] += 1
+        if isinstance(data, Table) and data.lazy:
+            return self._stream(data, sheet_name, sheet, start_row, start_col)
+        cells = sheet["cells"]
+        for i, row_data in enumerate(data):
+            for j, cell_value in enumerate(row_data):
+                cells[(start_row + i, start_col + j)] = (sheet["tables"], cell_value)
+                self._extend(sheet, start_row + i, start_col + j)
+        return start_row + len(data) - 1
+
+    def format_cells(
+        self,
+        sheet_name: str,
+        cell_range: Union[Tuple[int, int, int, int], str],
+        font_size: int = None,
+        font_style: str = None,
+        vertical_alignment: str = None,
+        horizontal_alignment: str = None,
+        wrap_text: bool = None,
+        background_color: str = None,
+    ) -> None:
+        """
+        Format a range of cells on a specific worksheet. Arguments are as for
+        ExcelTableWriter.format_cells.
+
+        Raises:
+            ValueError: If the cell range format is invalid
+        """
+        if isinstance(cell_range, str):
+            start_col, start_row, end_col, end_row = range_boundaries(cell_range)
+        elif isinstance(cell_range, tuple) and len(cell_range) == 4:
+            start_row, start_col, end_row, end_col = cell_range
+        else:
+            raise ValueError(
+                "Invalid cell range format. Must be either a string (e.g., 'A1:C5') "
+                "or a tuple of (start_row, start_col, end_row, end_col)"
+            )
+        sheet = self._sheet(sheet_name)
+        # Match openpyxl iter_rows, where a zero bound means the sheet extent
+        start_row = start_row or 1
+        start_col = start_col or 1
+        end_row = end_row or max(sheet["extent"][0], 1)
+        end_col = end_col or max(sheet["extent"][1], 1)
+        style = {}
+        if font_size is not None:
+            style["size"] = font_size
+        if font_style:
+            font_style = font_style.lower()
+            style["bold"] = "bold" in font_style
+            style["italic"] = "italic" in font_style
+        if vertical_alignment and vertical_alignment.lower() in [
+            "top",
+            "center",
+            "bottom",
+        ]:
+            style["vertical"] = vertical_alignment.lower()
+        if horizontal_alignment and horizontal_alignment.lower() in [
+            "left",
+            "center",
+            "right",
+            "justify",
+        ]:
+            style["horizontal"] = horizontal_alignment.lower()
+        if wrap_text is not None:
+            style["wrap_text"] = wrap_text
+        if background_color is not None:
+            style["fill"] = background_color
+        if start_row <= end_row and start_col <= end_col:
+            sheet["formats"].append((start_row, start_col, end_row, end_col, style))
+            self._extend(sheet, end_row, end_col)
+
+    def set_column_width(
+        self,
+        sheet_name: str,
+        columns: Union[int, str, List[Union[int, str]]],
+        width: float,
+    ) -> None:
+        """
+        Set the width for one or more columns in a worksheet. Arguments are as
+        for ExcelTableWriter.set_column_width.
+
+        Raises:
+            ValueError: If the column format is invalid
+        """
+        sheet = self._sheet(sheet_name)
+        if not isinstance(columns, list):
+            columns = [columns]
+        for col in columns:
+            if isinstance(col, str):
+                try:
+                    col_idx = column_index_from_string(col)
+                except ValueError:
+                    raise ValueError(f"Invalid column letter: '{col}'")
+            elif isinstance(col, int):
+                if col < 1:
+                    raise ValueError(f"Column index must be positive: {col}")
+                col_idx = col
+            else:
+                raise ValueError(
+                    f"Invalid column format: {col}. Must be an integer or a string."
+                )
+            sheet["widths"][get_column_letter(col_idx)] = width
+
+    def save(self, output_path: str = None) -> None:
+        """
+        Stream any outstanding sheets and save the workbook.
+
+        Args:
+            output_path (str, optional): Path to save the workbook to.
+                                         If None, uses the original path. Defaults to None.
+        """
+        self._spill()
+        for name, worksheet in self._worksheets.items():
+            self._write(worksheet, self._restore(name), self._streams.pop(name, []))
+        save_path = output_path if output_path else self.workbook_path
+        XlsxArchive.save_workbook(
+            self.workbook, save_path, self.compression, self.deterministic
+        )
+
+    def close(self) -> None:
+        """Close the workbook."""
+        self.workbook.close()
+
+    def _new_workbook(self) -> Workbook:
+        return Workbook(write_only=True)
+
+    def _sheet(self, sheet_name: str) -> dict:
+        if sheet_name != self._current:
+            self._spill()
+            self._current = sheet_name
+            if sheet_name not in self._worksheets:
+                self._worksheets[sheet_name] = self._create_sheet(sheet_name)
+            self._buffers[sheet_name] = self._restore(sheet_name)
+        return self._buffers[sheet_name]
+
+    def _create_sheet(self, sheet_name: str):
+        return self.workbook.create_sheet(sheet_name)
+
+    def _spill(self) -> None:
+        sheet = self._buffers.pop(self._current, None)
+        if sheet and (sheet["extent"][0] or sheet["widths"]):
+            spill = tempfile.TemporaryFile()
+            pickle.dump(sheet, spill, protocol=pickle.HIGHEST_PROTOCOL)
+            self._spills[self._current] = spill
+        self._current = None
+
+    def _restore(self, sheet_name: str) -> dict:
+        spill = self._spills.pop(sheet_name, None)
+        if spill is None:
+            return {
+                "cells": {},
+                "formats": [],
+                "widths": {},
+                "extent": [0, 0],
+                "tables": 0,
+            }
+        with spill:
+            spill.seek(0)
+            return pickle.load(spill)
+
+    def _stream(
+        self, data: Table, sheet_name: str, sheet: dict, start_row: int, start_col: int
+    ) -> int:
+        stream = tempfile.TemporaryFile()
+        count = 0
+        for row_data in data:
+            row_data = tuple(row_data)
+            pickle.dump(row_data, stream, protocol=pickle.HIGHEST_PROTOCOL)
+            if row_data:
+                self._extend(sheet, start_row + count, start_col + len(row_data) - 1)
+            count += 1
+        self._streams.setdefault(sheet_name, []).append(
+            (sheet["tables"], start_row, start_col, count, stream)
+        )
+        return start_row + count - 1
+
+    def _extend(self, sheet: dict, row: int, col: int) -> None:
+        extent = sheet["extent"]
+        extent[0] = max(extent[0], row)
+        extent[1] = max(extent[1], col)
+
+    def _write(self, worksheet, sheet: dict, streams: list) -> None:
+        for letter, width in sheet["widths"].items():
+            worksheet.column_dimensions[letter].width = width
+        styles = {}
+        for cells in self._rows(sheet, streams):
+            worksheet.append(
+                [
+                    None if x is None else self._cell(worksheet, x[0], x[1], styles)
+                    for x in cells
+                ]
+            )
+
+    def _rows(self, sheet: dict, streams: list):
+        # Yields each row of the sheet as a list holding, for each column,
+        # either None for an empty cell or the (value, style) of the cell.
+        # Cell values are (table number, value), the latest table wins
+        rows = {}
+        for (row, col), value in sheet["cells"].items():
+            rows.setdefault(row, {})[col] = value
+        for stream in streams:
+            stream[4].seek(0)
+        for row in range(1, sheet["extent"][0] + 1):
+            values = rows.pop(row, {})
+            for table, start_row, start_col, count, stream in streams:
+                if start_row <= row < start_row + count:
+                    for j, value in enumerate(pickle.load(stream)):
+                        col = start_col + j
+                        if col not in values or values[col][0] < table:
+                            values[col] = (table, value)
+            formats = [x for x in sheet["formats"] if x[0] <= row <= x[2]]
+            end_col = max([x[3] for x in formats] + list(values) + [0])
+            cells = []
+            for col in range(1, end_col + 1):
+                style = {}
+                covered = False
+                for _, start_col, _, last_col, format_style in formats:
+                    if start_col <= col <= last_col:
+                        style.update(format_style)
+                        covered = True
+                if col in values:
+                    cells.append((values[col][1], style))
+                elif covered:
+                    cells.append((None, style))
+                else:
+                    cells.append(None)
+            yield cells
+        for stream in streams:
+            stream[4].close()
+
+    def _cell(self, worksheet, value: Any, style: dict, styles: dict) -> WriteOnlyCell:
+        result = WriteOnlyCell(worksheet, value=value)
+        key = tuple(sorted(style.items()))
+        if not key:
+            return result
+        if key not in styles:
+            styles[key] = self._style(style)
+        font, alignment, fill = styles[key]
+        if font:
+            result.font = font
+        if alignment:
+            result.alignment = alignment
+        if fill:
+            result.fill = fill
+        return result
+
+    def _style(self, cell: dict) -> tuple:
+        font = None
+        if "size" in cell or "bold" in cell or "italic" in cell:
+            font = Font(
+                name=DEFAULT_FONT.name,
+                size=cell.get("size", DEFAULT_FONT.size),
+                bold=cell.get("bold", DEFAULT_FONT.bold),
+                italic=cell.get("italic", DEFAULT_FONT.italic),
+                color=DEFAULT_FONT.color,
+                family=DEFAULT_FONT.family,
+                scheme=DEFAULT_FONT.scheme,
+            )
+        alignment = None
+        if "vertical" in cell or "horizontal" in cell or "wrap_text" in cell:
+            alignment = Alignment(
+                horizontal=cell.get("horizontal"),
+                vertical=cell.get("vertical"),
+                wrapText=cell.get("wrap_text"),
+            )
+        fill = None
+        if "fill" in cell:
+            fill = PatternFill(
+                start_color=cell["fill"], end_color=cell["fill"], fill_type="solid"
+            )
+        return font, alignment, fill
@@ -0,0 +1,97 @@
+import datetime
+import shutil
+from typing import Any
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED
+from openpyxl import Workbook
+from openpyxl.writer.excel import ExcelWriter
+
+
+class XlsxArchive:
+    """
+    Opens the zip container an xlsx workbook is written to.
+
+    The compression setting trades the time spent deflating the parts
+    against the size of the file: "store" does not compress at all, "fast"
+    and "max" deflate at the lowest and highest levels. Without a setting
+    parts are deflated at the zlib default level, as openpyxl does.
+
+    A deterministic archive dates every part and the document properties at
+    TIMESTAMP rather than now, so the same workbook always gives the same
+    bytes.
+    """
+
+    COMPRESSION = {
+        "store": (ZIP_STORED, None),
+        "fast": (ZIP_DEFLATED, 1),
+        "max": (ZIP_DEFLATED, 9),
+    }
+
+    # The earliest time a zip entry can hold
+    TIMESTAMP = datetime.datetime(1980, 1, 1)
+
+    @classmethod
+    def check(cls, compression: str) -> None:
+        if compression is not None and compression not in cls.COMPRESSION:
+            raise ValueError(
+                f"Unknown compression '{compression}', expected one of {', '.join(cls.COMPRESSION)}"
+            )
+
+    @classmethod
+    def open(
+        cls, target: Any, compression: str = None, deterministic: bool = False
+    ) -> ZipFile:
+        cls.check(compression)
+        method, level = cls.COMPRESSION.get(compression, (ZIP_DEFLATED, None))
+        klass = DeterministicZipFile if deterministic else ZipFile
+        return klass(target, "w", method, allowZip64=True, compresslevel=level)
+
+    @classmethod
+    def save_workbook(
+        cls,
+        workbook: Workbook,
+        target: Any,
+        compression: str = None,
+        deterministic: bool = False,
+    ) -> None:
+        # As openpyxl Workbook.save, but into an archive opened here
+        if workbook.write_only and not workbook.worksheets:
+            workbook.create_sheet()
+        archive = cls.open(target, compression, deterministic)
+        if deterministic:
+            workbook.properties.created = cls.TIMESTAMP
+            workbook.properties.modified = cls.TIMESTAMP
+        else:
+            workbook.properties.modified = datetime.datetime.now(
+                tz=datetime.timezone.utc
+            ).replace(tzinfo=None)
+        ExcelWriter(workbook, archive).save()
+
+
+class DeterministicZipFile(ZipFile):
+    """A ZipFile that dates every entry written by name at XlsxArchive.TIMESTAMP."""
+
+    def writestr(self, zinfo_or_arcname, data, *args, **kwargs) -> None:
+        if not isinstance(zinfo_or_arcname, ZipInfo):
+            zinfo_or_arcname = self._info(zinfo_or_arcname)
+        super().writestr(zinfo_or_arcname, data, *args, **kwargs)
+
+    def write(self, filename, arcname=None, *args, **kwargs) -> None:
+        # Parts written from files, such as openpyxl write-only worksheets,
+        # would otherwise take the time of the file
+        with (
+            open(filename, "rb") as source,
+            self.open(self._info(arcname if arcname else filename), "w") as part,
+        ):
+            shutil.copyfileobj(source, part)
+
+    def open(self, name, mode="r", *args, **kwargs):
+        if mode == "w" and not isinstance(name, ZipInfo):
+            name = self._info(name)
+        return super().open(name, mode, *args, **kwargs)
+
+    def _info(self, name: str) -> ZipInfo:
+        info = ZipInfo(name, date_time=XlsxArchive.TIMESTAMP.timetuple()[:6])
+        info.compress_type = self.compression
+        info._compresslevel = self.compresslevel
+        info.external_attr = 0o600 << 16
+        return info
@@ -0,0 +1,336 @@
+import datetime
+from numbers import Number
+from typing import Any
+from xml.sax.saxutils import escape, quoteattr
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.utils import get_column_letter, column_index_from_string
+from openpyxl.utils.exceptions import IllegalCharacterError
+from usdm3_excel.export.excel_table_writer.streaming_table_writer import (
+    StreamingTableWriter,
+)
+from usdm3_excel.export.excel_table_writer.xlsx_archive import XlsxArchive
+
+MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+RELATIONSHIPS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PACKAGE = "http://schemas.openxmlformats.org/package/2006/relationships"
+CONTENT_TYPES = "http://schemas.openxmlformats.org/package/2006/content-types"
+SPREADSHEET = "application/vnd.openxmlformats-officedocument.spreadsheetml"
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+# The package has no theme part, so fonts are named rather than themed
+DEFAULT_FONT = '<sz val="11"/><name val="Calibri"/><family val="2"/>'
+
+
+class XmlTableWriter(StreamingTableWriter):
+    """
+    A StreamingTableWriter that writes the SpreadsheetML of each worksheet
+    straight into the xlsx container.
+
+    Tables, formats and column widths are buffered and spilled exactly as by
+    StreamingTableWriter. On save each row is rendered as XML text and written
+    to the worksheet part of the zip in batches, so no cell objects, openpyxl
+    styles or write-only worksheets are created. Strings are shared across the
+    workbook and each distinct combination of formats becomes one cell style.
+    """
+
+    # Rows rendered before the text is written to the worksheet part
+    BATCH = 1000
+
+    MAX_STRING = 32767
+
+    def save(self, output_path: str = None) -> None:
+        """
+        Write any outstanding sheets and save the workbook.
+
+        Args:
+            output_path (str, optional): Path to save the workbook to.
+                                         If None, uses the original path. Defaults to None.
+        """
+        self._spill()
+        strings = {}
+        styles = {}
+        names = list(self._worksheets)
+        save_path = output_path if output_path else self.workbook_path
+        with XlsxArchive.open(
+            save_path, self.compression, self.deterministic
+        ) as archive:
+            archive.writestr("[Content_Types].xml", self._content_types(len(names)))
+            archive.writestr("_rels/.rels", self._package_relationships())
+            archive.writestr("docProps/app.xml", self._app())
+            archive.writestr("docProps/core.xml", self._core())
+            archive.writestr("xl/workbook.xml", self._workbook(names))
+            archive.writestr(
+                "xl/_rels/workbook.xml.rels", self._workbook_relationships(len(names))
+            )
+            for name, number in self._worksheets.items():
+                sheet = self._restore(name)
+                streams = self._streams.pop(name, [])
+                with archive.open(f"xl/worksheets/sheet{number}.xml", "w") as part:
+                    self._write_sheet(part, sheet, streams, number, strings, styles)
+            archive.writestr("xl/sharedStrings.xml", self._shared_strings(strings))
+            archive.writestr("xl/styles.xml", self._styles(styles))
+
+    def close(self) -> None:
+        """Discard anything written but not saved."""
+        self._spill()
+        for spill in self._spills.values():
+            spill.close()
+        for streams in self._streams.values():
+            for stream in streams:
+                stream[4].close()
+        self._spills = {}
+        self._streams = {}
+
+    def _new_workbook(self) -> None:
+        return None
+
+    def _create_sheet(self, sheet_name: str) -> int:
+        return len(self._worksheets) + 1
+
+    def _write_sheet(
+        self,
+        part,
+        sheet: dict,
+        streams: list,
+        number: int,
+        strings: dict,
+        styles: dict,
+    ) -> None:
+        selected = ' tabSelected="1"' if number == 1 else ""
+        head = [
+            XML_HEADER,
+            f'<worksheet xmlns="{MAIN}" xmlns:r="{RELATIONSHIPS}">',
+            '<sheetPr><outlinePr summaryBelow="1" summaryRight="1"/></sheetPr>',
+            f'<sheetViews><sheetView workbookViewId="0"{selected}/></sheetViews>',
+            '<sheetFormatPr baseColWidth="8" defaultRowHeight="15"/>',
+        ]
+        if sheet["widths"]:
+            head.append("<cols>")
+            for index, width in sorted(
+                (column_index_from_string(letter), width)
+                for letter, width in sheet["widths"].items()
+            ):
+                head.append(
+                    f'<col min="{index}" max="{index}" width="{width}" customWidth="1"/>'
+                )
+            head.append("</cols>")
+        head.append("<sheetData>")
+        part.write("".join(head).encode())
+        batch = []
+        for row, cells in enumerate(self._rows(sheet, streams), start=1):
+            batch.append(self._row(row, cells, strings, styles))
+            if len(batch) == self.BATCH:
+                part.write("".join(batch).encode())
+                batch = []
+        batch.append(
+            "</sheetData>"
+            '<pageMargins left="0.75" right="0.75" top="1" bottom="1" header="0.5" footer="0.5"/>'
+            "</worksheet>"
+        )
+        part.write("".join(batch).encode())
+
+    def _row(self, row: int, cells: list, strings: dict, styles: dict) -> str:
+        text = [f'<row r="{row}">']
+        for col, cell in enumerate(cells, start=1):
+            if cell is None:
+                continue
+            value, style = cell
+            reference = f"{get_column_letter(col)}{row}"
+            key = tuple(sorted(style.items()))
+            attributes = f' r="{reference}"'
+            if key:
+                if key not in styles:
+                    styles[key] = len(styles) + 1
+                attributes += f' s="{styles[key]}"'
+            text.append(self._cell_xml(attributes, value, strings))
+        text.append("</row>")
+        return "".join(text)
+
+    def _cell_xml(self, attributes: str, value: Any, strings: dict) -> str:
+        # As with openpyxl an empty string is an empty cell
+        if value is None or value == "":
+            return f"<c{attributes}/>"
+        if isinstance(value, bool):
+            return f'<c{attributes} t="b"><v>{int(value)}</v></c>'
+        if isinstance(value, Number):
+            return f'<c{attributes} t="n"><v>{value}</v></c>'
+        # Longer strings are truncated to the Excel limit, as by openpyxl
+        value = str(value)[: self.MAX_STRING]
+        if ILLEGAL_CHARACTERS_RE.search(value):
+            raise IllegalCharacterError(f"{value} cannot be used in worksheets.")
+        if value not in strings:
+            strings[value] = len(strings)
+        return f'<c{attributes} t="s"><v>{strings[value]}</v></c>'
+
+    def _shared_strings(self, strings: dict) -> str:
+        text = [
+            XML_HEADER,
+            f'<sst xmlns="{MAIN}" uniqueCount="{len(strings)}">',
+        ]
+        for value in strings:
+            space = ' xml:space="preserve"' if value != value.strip() else ""
+            text.append(f"<si><t{space}>{escape(value)}</t></si>")
+        text.append("</sst>")
+        return "".join(text)
+
+    def _styles(self, styles: dict) -> str:
+        fonts = {(): 0}
+        fills = {None: 0, "gray125": 1}
+        xfs = []
+        for key in styles:
+            style = dict(key)
+            font = tuple(
+                (x, style[x]) for x in ("size", "bold", "italic") if x in style
+            )
+            fill = style.get("fill")
+            font_id = fonts.setdefault(font, len(fonts))
+            fill_id = fills.setdefault(fill, len(fills))
+            xf = (
+                f'<xf numFmtId="0" fontId="{font_id}" fillId="{fill_id}" '
+                f'borderId="0" xfId="0"'
+            )
+            if font:
+                xf += ' applyFont="1"'
+            if fill:
+                xf += ' applyFill="1"'
+            alignment = ""
+            for attribute, name in (
+                ("horizontal", "horizontal"),
+                ("vertical", "vertical"),
+                ("wrap_text", "wrapText"),
+            ):
+                if style.get(attribute) is not None:
+                    value = style[attribute]
+                    if isinstance(value, bool):
+                        value = int(value)
+                    alignment += f' {name}="{value}"'
+            if alignment:
+                xf += f' applyAlignment="1"><alignment{alignment}/></xf>'
+            else:
+                xf += "/>"
+            xfs.append(xf)
+        text = [XML_HEADER, f'<styleSheet xmlns="{MAIN}">']
+        text.append(f'<fonts count="{len(fonts)}">')
+        for font in fonts:
+            font = dict(font)
+            bold = "<b/>" if font.get("bold") else ""
+            italic = "<i/>" if font.get("italic") else ""
+            size = DEFAULT_FONT
+            if "size" in font:
+                size = DEFAULT_FONT.replace('val="11"', f'val="{font["size"]}"', 1)
+            text.append(f"<font>{bold}{italic}{size}</font>")
+        text.append(f'</fonts><fills count="{len(fills)}">')
+        text.append('<fill><patternFill patternType="none"/></fill>')
+        text.append('<fill><patternFill patternType="gray125"/></fill>')
+        for fill in list(fills)[2:]:
+            color = f"00{fill}" if len(fill) == 6 else fill
+            text.append(
+                f'<fill><patternFill patternType="solid"><fgColor rgb="{color}"/>'
+                f'<bgColor rgb="{color}"/></patternFill></fill>'
+            )
+        text.append(
+            '</fills><borders count="1"><border><left/><right/><top/><bottom/>'
+            "<diagonal/></border></borders>"
+            '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/>'
+            f'</cellStyleXfs><cellXfs count="{len(xfs) + 1}">'
+            '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        )
+        text.extend(xfs)
+        text.append(
+            '</cellXfs><cellStyles count="1">'
+            '<cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+            "</styleSheet>"
+        )
+        return "".join(text)
+
+    def _workbook(self, names: list) -> str:
+        sheets = "".join(
+            f'<sheet name={quoteattr(name)} sheetId="{i}" r:id="rId{i}"/>'
+            for i, name in enumerate(names, start=1)
+        )
+        return (
+            f'{XML_HEADER}<workbook xmlns="{MAIN}" xmlns:r="{RELATIONSHIPS}">'
+            '<workbookPr/><bookViews><workbookView activeTab="0"/></bookViews>'
+            f'<sheets>{sheets}</sheets><calcPr calcId="124519" fullCalcOnLoad="1"/>'
+            "</workbook>"
+        )
+
+    def _workbook_relationships(self, count: int) -> str:
+        relationships = [
+            f'<Relationship Id="rId{i}" Target="worksheets/sheet{i}.xml" '
+            f'Type="{RELATIONSHIPS}/worksheet"/>'
+            for i in range(1, count + 1)
+        ]
+        relationships.append(
+            f'<Relationship Id="rId{count + 1}" Target="styles.xml" '
+            f'Type="{RELATIONSHIPS}/styles"/>'
+        )
+        relationships.append(
+            f'<Relationship Id="rId{count + 2}" Target="sharedStrings.xml" '
+            f'Type="{RELATIONSHIPS}/sharedStrings"/>'
+        )
+        return (
+            f'{XML_HEADER}<Relationships xmlns="{PACKAGE}">'
+            f"{''.join(relationships)}</Relationships>"
+        )
+
+    def _package_relationships(self) -> str:
+        return (
+            f'{XML_HEADER}<Relationships xmlns="{PACKAGE}">'
+            '<Relationship Id="rId1" Target="xl/workbook.xml" '
+            f'Type="{RELATIONSHIPS}/officeDocument"/>'
+            '<Relationship Id="rId2" Target="docProps/core.xml" '
+            f'Type="{PACKAGE}/metadata/core-properties"/>'
+            '<Relationship Id="rId3" Target="docProps/app.xml" '
+            f'Type="{RELATIONSHIPS}/extended-properties"/>'
+            "</Relationships>"
+        )
+
+    def _content_types(self, count: int) -> str:
+        sheets = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+            f'ContentType="{SPREADSHEET}.worksheet+xml"/>'
+            for i in range(1, count + 1)
+        )
+        return (
+            f'{XML_HEADER}<Types xmlns="{CONTENT_TYPES}">'
+            '<Default Extension="rels" '
+            'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            f'ContentType="{SPREADSHEET}.sheet.main+xml"/>'
+            f"{sheets}"
+            '<Override PartName="/xl/styles.xml" '
+            f'ContentType="{SPREADSHEET}.styles+xml"/>'
+            '<Override PartName="/xl/sharedStrings.xml" '
+            f'ContentType="{SPREADSHEET}.sharedStrings+xml"/>'
+            '<Override PartName="/docProps/core.xml" '
+            'ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>'
+            '<Override PartName="/docProps/app.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.extended-properties+xml"/>'
+            "</Types>"
+        )
+
+    def _app(self) -> str:
+        return (
+            f"{XML_HEADER}<Properties "
+            'xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties">'
+            "<Application>Microsoft Excel</Application></Properties>"
+        )
+
+    def _core(self) -> str:
+        if self.deterministic:
+            now = XlsxArchive.TIMESTAMP
+        else:
+            now = datetime.datetime.now(datetime.timezone.utc)
+        now = now.strftime("%Y-%m-%dT%H:%M:%SZ")
+        return (
+            f"{XML_HEADER}<cp:coreProperties "
+            'xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+            'xmlns:dc="http://purl.org/dc/elements/1.1/" '
+            'xmlns:dcterms="http://purl.org/dc/terms/" '
+            'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+            "<dc:creator>usdm3_excel</dc:creator>"
+            f'<dcterms:created xsi:type="dcterms:W3CDTF">{now}</dcterms:created>'
+            f'<dcterms:modified xsi:type="dcterms:W3CDTF">{now}</dcterms:modified>'
+            "</cp:coreProperties>"
+        )
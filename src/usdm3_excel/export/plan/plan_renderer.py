@@ -0,0 +1,95 @@
+import json
+import os
+from .sheet_plan import SheetPlan
+from .workbook_plan import WorkbookPlan
+from usdm3_excel.profiling.export_profile import ExportProfile, measure
+
+
+class PlanRenderer:
+    # The leading sheet plan holding the sheets that are the same for every study
+    STATIC = "EmptySheet"
+
+    # Workbooks with just the static sheets rendered, built once per process for
+    # writers that can start from one
+    _templates = {}
+
+    def __init__(
+        self,
+        writer: type,
+        default_sheet_name: str = "study",
+        compression: str = None,
+        deterministic: bool = False,
+    ):
+        self.writer = writer
+        self.default_sheet_name = default_sheet_name
+        self.compression = compression
+        self.deterministic = deterministic
+
+    def render(
+        self, plan: WorkbookPlan, excel_filepath: str, profile: ExportProfile = None
+    ) -> None:
+        sheets = plan.sheets
+        options = {"default_sheet_name": self.default_sheet_name}
+        if self.compression:
+            options["compression"] = self.compression
+        if self.deterministic:
+            options["deterministic"] = True
+        template = self._template(sheets, excel_filepath)
+        if template is not None:
+            options["template"] = template
+            sheets = sheets[1:]
+        etw = self.writer(excel_filepath, **options)
+        for sheet in sheets:
+            self.render_sheet(sheet, etw, profile)
+        with measure(profile, ExportProfile.SAVE, "workbook"):
+            etw.save()
+
+    def render_sheet(
+        self, sheet: SheetPlan, etw, profile: ExportProfile = None
+    ) -> None:
+        for operation in sheet.operations:
+            stage = (
+                ExportProfile.TABLE
+                if operation["type"] == SheetPlan.TABLE
+                else ExportProfile.FORMAT
+            )
+            with measure(profile, stage, sheet.name):
+                self._render_operation(operation, etw)
+
+    def _template(self, sheets: list[SheetPlan], excel_filepath: str) -> bytes | None:
+        if not sheets or sheets[0].name != self.STATIC:
+            return None
+        if not hasattr(self.writer, "to_template"):
+            return None
+        # An existing workbook is added to rather than replaced
+        if isinstance(excel_filepath, (str, os.PathLike)) and os.path.exists(
+            excel_filepath
+        ):
+            return None
+        key = (
+            self.writer,
+            self.default_sheet_name,
+            json.dumps(sheets[0].to_dict(), sort_keys=True),
+        )
+        if key not in self._templates:
+            etw = self.writer(None, default_sheet_name=self.default_sheet_name)
+            self.render_sheet(sheets[0], etw)
+            self._templates[key] = etw.to_template()
+        return self._templates[key]
+
+    def _render_operation(self, operation: dict, etw) -> None:
+        if operation["type"] == SheetPlan.TABLE:
+            etw.add_table(
+                operation["data"],
+                operation["sheet"],
+                operation["row"],
+                operation["col"],
+            )
+        elif operation["type"] == SheetPlan.FORMAT:
+            etw.format_cells(
+                operation["sheet"], operation["range"], **operation["style"]
+            )
+        else:
+            etw.set_column_width(
+                operation["sheet"], operation["columns"], operation["width"]
+            )
@@ -0,0 +1,139 @@
+import hashlib
+import json
+from importlib import metadata
+from usdm4.api.study import Study
+from usdm4_excel.export.study_activities_sheet.study_activities_sheet import (
+    StudyActivitiesSheet,
+)
+from usdm4_excel.export.study_arms_sheet.study_arms_sheet import StudyArmsSheet
+from usdm4_excel.export.study_encounters_sheet.study_encounters_sheet import (
+    StudyEncountersSheet,
+)
+from usdm4_excel.export.study_epochs_sheet.study_epochs_sheet import (
+    StudyEpochsSheet,
+)
+from usdm4_excel.export.study_procedures_sheet.study_procedures_sheet import (
+    StudyProceduresSheet,
+)
+from usdm3_excel.__info__ import __package_version__
+from usdm3_excel.export.study_content_sheet.study_content_sheet import (
+    StudyContentSheet,
+)
+from usdm3_excel.export.study_design_sheet.study_design_sheet import (
+    StudyDesignSheet,
+)
+from usdm3_excel.export.study_identifiers_sheet.study_identifiers_sheet import (
+    StudyIdentifiersSheet,
+)
+from usdm3_excel.export.study_population_sheet.study_population_sheet import (
+    StudyPopulationSheet,
+)
+from usdm3_excel.export.study_sheet.study_sheet import StudySheet
+from usdm3_excel.export.study_timeline_sheet.study_timeline_sheet import (
+    StudyTimelineSheet,
+)
+from usdm3_excel.export.study_timing_sheet.study_timing_sheet import StudyTimingSheet
+
+
+class SheetFingerprint:
+    """
+    Hashes the parts of a study read by a sheet so a sheet plan can be reused
+    when none of them have changed. Sources are given as the fields read at the
+    study, version and design level, taken across all versions and designs, in
+    any form accepted by the include of model_dump.
+    Sheets without listed sources are fingerprinted on the whole study.
+    """
+
+    STUDY = "study"
+    VERSION = "version"
+    DESIGN = "design"
+
+    SOURCES = {
+        StudySheet: {
+            STUDY: {"name", "documentedBy"},
+            VERSION: {
+                "versionIdentifier",
+                "rationale",
+                "dateValues",
+                "amendments",
+                "businessTherapeuticAreas",
+                "titles",
+            },
+            DESIGN: {"studyPhase"},
+        },
+        StudyPopulationSheet: {},
+        StudyIdentifiersSheet: {
+            VERSION: {"id", "studyIdentifiers", "organizations"},
+        },
+        StudyContentSheet: {
+            STUDY: {"documentedBy"},
+            VERSION: {"id", "documentVersionIds", "narrativeContentItems"},
+        },
+        StudyActivitiesSheet: {DESIGN: {"activities"}},
+        StudyTimingSheet: {DESIGN: {"scheduleTimelines"}},
+        StudyEncountersSheet: {DESIGN: {"encounters", "scheduleTimelines"}},
+        StudyEpochsSheet: {DESIGN: {"epochs"}},
+        StudyArmsSheet: {DESIGN: {"arms"}},
+        StudyDesignSheet: {
+            DESIGN: {
+                **dict.fromkeys(
+                    [
+                        "name",
+                        "label",
+                        "description",
+                        "rationale",
+                        "studyType",
+                        "studyPhase",
+                        "blindingSchema",
+                        "intentTypes",
+                        "subTypes",
+                        "model",
+                        "characteristics",
+                        "therapeuticAreas",
+                        "arms",
+                        "epochs",
+                    ],
+                    True,
+                ),
+                # Just what names the timeline sheets
+                "scheduleTimelines": {"__all__": {"name", "mainTimeline"}},
+            },
+        },
+        StudyTimelineSheet: {
+            DESIGN: {"id", "scheduleTimelines", "activities", "epochs", "encounters"},
+        },
+        StudyProceduresSheet: {DESIGN: {"activities"}},
+    }
+
+    def __init__(self, study: Study):
+        self._study = study
+        # Plans made by a different release may differ for the same input
+        self._context = {
+            "usdm3_excel": __package_version__,
+            "usdm4_excel": metadata.version("usdm4_excel"),
+        }
+
+    def value(self, klass: type) -> str:
+        sources = self.SOURCES.get(klass)
+        if sources is None:
+            data = self._study.model_dump(mode="json")
+        else:
+            data = {}
+            for level, fields in sources.items():
+                data[level] = [
+                    x.model_dump(mode="json", include=fields)
+                    for x in self._items(level)
+                ]
+        text = json.dumps(
+            {"context": self._context, "sheet": klass.__name__, "data": data},
+            sort_keys=True,
+        )
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def _items(self, level: str) -> list:
+        if level == self.STUDY:
+            return [self._study]
+        versions = self._study.versions
+        if level == self.VERSION:
+            return versions
+        return [design for version in versions for design in version.studyDesigns]
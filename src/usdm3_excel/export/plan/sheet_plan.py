@@ -0,0 +1,117 @@
+from typing import List, Any, Union, Tuple
+from usdm3_excel.export.base.table import Table
+
+
+class SheetPlan:
+    """
+    The tables, formatting and column widths produced by a sheet, held as plain
+    data so they can be serialized, cached or computed elsewhere and rendered
+    later. A plan accepts the same add_table, format_cells and set_column_width
+    calls as a table writer so sheets can save directly into it.
+    """
+
+    TABLE = "table"
+    FORMAT = "format"
+    WIDTH = "width"
+
+    def __init__(
+        self,
+        operations: list[dict] = None,
+        ct_versions: dict = None,
+        name: str = None,
+        fingerprint: str = None,
+    ):
+        self.operations = operations if operations else []
+        self.ct_versions = ct_versions if ct_versions else {}
+        self.name = name
+        self.fingerprint = fingerprint
+
+    def add_table(
+        self,
+        data: List[List[Any]],
+        sheet_name: str,
+        start_row: int = 1,
+        start_col: int = 1,
+    ) -> int:
+        self.operations.append(
+            {
+                "type": self.TABLE,
+                "sheet": sheet_name,
+                "row": start_row,
+                "col": start_col,
+                "data": data,
+            }
+        )
+        # The length of a lazy table is only known once it is written, so the
+        # last row is given as 0, which format_cells takes as the sheet extent
+        if isinstance(data, Table) and data.lazy:
+            return 0
+        return start_row + len(data) - 1
+
+    def format_cells(
+        self,
+        sheet_name: str,
+        cell_range: Union[Tuple[int, int, int, int], str],
+        **kwargs,
+    ) -> None:
+        self.operations.append(
+            {
+                "type": self.FORMAT,
+                "sheet": sheet_name,
+                "range": cell_range,
+                "style": kwargs,
+            }
+        )
+
+    def set_column_width(
+        self,
+        sheet_name: str,
+        columns: Union[int, str, List[Union[int, str]]],
+        width: float,
+    ) -> None:
+        self.operations.append(
+            {
+                "type": self.WIDTH,
+                "sheet": sheet_name,
+                "columns": columns,
+                "width": width,
+            }
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "fingerprint": self.fingerprint,
+            "operations": [self._serialisable(x) for x in self.operations],
+            "ct_versions": self.ct_versions,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SheetPlan":
+        operations = []
+        for operation in data["operations"]:
+            operation = dict(operation)
+            # Ranges read back from JSON are lists, the writers expect tuples
+            if operation["type"] == cls.FORMAT and isinstance(operation["range"], list):
+                operation["range"] = tuple(operation["range"])
+            operations.append(operation)
+        return cls(
+            operations,
+            dict(data["ct_versions"]),
+            data.get("name"),
+            data.get("fingerprint"),
+        )
+
+    @staticmethod
+    def _serialisable(operation: dict) -> dict:
+        # Panel tables are kept as recorded and only listed out for storage
+        if operation["type"] == SheetPlan.TABLE and isinstance(
+            operation["data"], Table
+        ):
+            table = operation["data"]
+            if table.lazy:
+                # Stored plans are still rendered afterwards, so the rows are
+                # produced once and kept
+                table.rows = list(table.rows)
+            return {**operation, "data": table.to_list()}
+        return operation
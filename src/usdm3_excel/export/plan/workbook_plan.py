@@ -0,0 +1,30 @@
+import json
+from .sheet_plan import SheetPlan
+
+
+class WorkbookPlan:
+    VERSION = 1
+
+    def __init__(self, sheets: list[SheetPlan] = None):
+        self.sheets = sheets if sheets else []
+
+    def to_dict(self) -> dict:
+        return {
+            "version": self.VERSION,
+            "sheets": [x.to_dict() for x in self.sheets],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "WorkbookPlan":
+        if data.get("version") != cls.VERSION:
+            raise ValueError(
+                f"Unsupported plan version '{data.get('version')}', expected {cls.VERSION}"
+            )
+        return cls([SheetPlan.from_dict(x) for x in data["sheets"]])
+
+    @classmethod
+    def from_json(cls, text: str) -> "WorkbookPlan":
+        return cls.from_dict(json.loads(text))
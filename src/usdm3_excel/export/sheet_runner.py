@@ -0,0 +1,181 @@
+import os
+import threading
+from concurrent.futures import (
+    CancelledError,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from usdm4.api.study import Study
+from usdm4_excel.export.base.base_sheet import BaseSheet as USDM4BaseSheet
+from usdm4_excel.export.base.ct_version import CTVersion
+from usdm4_excel.export.configuration_sheet.configuration_sheet import (
+    ConfigurationSheet,
+)
+from usdm3_excel.export.base.base_sheet import BaseSheet
+from usdm3_excel.export.base.study_index import StudyIndex
+from usdm3_excel.export.plan.sheet_plan import SheetPlan
+from usdm3_excel.export.plan.sheet_fingerprint import SheetFingerprint
+from usdm3_excel.export.plan.workbook_plan import WorkbookPlan
+from usdm3_excel.profiling.export_profile import ExportProfile, measure
+
+_worker = {}
+
+
+def create_sheet(
+    klass: type, ct_version: CTVersion, etw, index: StudyIndex, lazy: bool = False
+) -> USDM4BaseSheet:
+    if issubclass(klass, BaseSheet):
+        return klass(ct_version, etw, index, lazy)
+    return klass(ct_version, etw)
+
+
+def compute(
+    klass: type, study: Study, index: StudyIndex, lazy: bool = False, part=None
+) -> SheetPlan:
+    plan = SheetPlan()
+    ct_version = CTVersion()
+    sheet = create_sheet(klass, ct_version, plan, index, lazy)
+    if part is None:
+        sheet.save(study)
+    else:
+        sheet.save_part(study, part)
+    plan.name = klass.__name__
+    plan.ct_versions = ct_version.versions
+    return plan
+
+
+def _initialise(study: Study, index: StudyIndex) -> None:
+    _worker["study"] = study
+    _worker["index"] = index
+
+
+def _compute_in_process(klass: type, part=None) -> SheetPlan:
+    return compute(klass, _worker["study"], _worker["index"], part=part)
+
+
+class SheetRunner:
+    THREAD = "thread"
+    PROCESS = "process"
+    MODES = [THREAD, PROCESS]
+
+    # Sheets reporting on the CT versions collected by all of the other sheets
+    DEPENDENT = (ConfigurationSheet,)
+
+    def __init__(
+        self,
+        mode: str = None,
+        workers: int = None,
+        lazy: bool = False,
+        cancel: threading.Event = None,
+    ):
+        if mode is not None and mode not in self.MODES:
+            raise ValueError(
+                f"Unknown parallel mode '{mode}', expected one of {', '.join(self.MODES)}"
+            )
+        if mode is not None and lazy:
+            raise ValueError("Lazy tables are only produced by sequential sheets")
+        self.mode = mode
+        self.workers = workers if workers else os.cpu_count()
+        self.lazy = lazy
+        self.cancel = cancel
+
+    def execute(
+        self,
+        sheets: list[type],
+        study: Study,
+        index: StudyIndex,
+        ct_version: CTVersion,
+        previous: WorkbookPlan = None,
+        profile: ExportProfile = None,
+    ) -> list[SheetPlan]:
+        independent = [x for x in sheets if not issubclass(x, self.DEPENDENT)]
+        results = {}
+        fingerprints = {}
+        if previous is not None:
+            # Fingerprints are taken before any sheet runs as some panels update
+            # the study as they go
+            fingerprint = SheetFingerprint(study)
+            earlier = {x.name: x for x in previous.sheets}
+            for klass in independent:
+                fingerprints[klass] = fingerprint.value(klass)
+                plan = earlier.get(klass.__name__)
+                if plan and plan.fingerprint == fingerprints[klass]:
+                    results[klass] = plan
+        pending = [x for x in independent if x not in results]
+        # Sheets written in parts are computed a part at a time, concurrently
+        # when in parallel, and the parts joined in order
+        jobs = [(x, part) for x in pending for part in self._parts(x, study)]
+        if self.mode is None:
+            computed = {}
+            for klass, part in jobs:
+                self.check_cancelled()
+                with measure(profile, ExportProfile.SHEET, klass.__name__):
+                    computed[(klass, part)] = compute(
+                        klass, study, index, self.lazy, part
+                    )
+        else:
+            self.check_cancelled()
+            computed = self._concurrent(jobs, study, index)
+        for klass in pending:
+            plan = self._join(klass, [computed[job] for job in jobs if job[0] is klass])
+            plan.fingerprint = fingerprints.get(klass)
+            results[klass] = plan
+
+        # CT versions are merged in sheet order so the combined ordering matches
+        # saving every sheet against a single CTVersion
+        for klass in independent:
+            for name, version in results[klass].ct_versions.items():
+                ct_version.add(name, version)
+        plans = []
+        for klass in sheets:
+            if klass not in results:
+                self.check_cancelled()
+                plan = SheetPlan(name=klass.__name__)
+                with measure(profile, ExportProfile.SHEET, klass.__name__):
+                    create_sheet(klass, ct_version, plan, index).save(study)
+                results[klass] = plan
+            plans.append(results[klass])
+        return plans
+
+    def check_cancelled(self) -> None:
+        # Sheets are not interrupted, the export stops before the next one
+        if self.cancel is not None and self.cancel.is_set():
+            raise CancelledError("The export was cancelled")
+
+    def _parts(self, klass: type, study: Study) -> list:
+        parts = klass.parts(study) if issubclass(klass, BaseSheet) else []
+        return parts if len(parts) > 1 else [None]
+
+    def _join(self, klass: type, plans: list[SheetPlan]) -> SheetPlan:
+        if len(plans) == 1:
+            return plans[0]
+        plan = SheetPlan(name=klass.__name__)
+        # As if the parts were saved one after the other by one sheet
+        for part in plans:
+            plan.operations.extend(part.operations)
+            plan.ct_versions.update(part.ct_versions)
+        return plan
+
+    def _concurrent(
+        self, jobs: list[tuple], study: Study, index: StudyIndex
+    ) -> dict[tuple, SheetPlan]:
+        if not jobs:
+            return {}
+        with self._executor(study, index, len(jobs)) as executor:
+            futures = {job: self._submit(executor, job, study, index) for job in jobs}
+            return {job: future.result() for job, future in futures.items()}
+
+    def _executor(self, study: Study, index: StudyIndex, count: int) -> Executor:
+        workers = max(1, min(self.workers, count))
+        if self.mode == self.PROCESS:
+            return ProcessPoolExecutor(
+                max_workers=workers, initializer=_initialise, initargs=(study, index)
+            )
+        return ThreadPoolExecutor(max_workers=workers)
+
+    def _submit(self, executor: Executor, job: tuple, study: Study, index: StudyIndex):
+        klass, part = job
+        if self.mode == self.PROCESS:
+            return executor.submit(_compute_in_process, klass, part)
+        return executor.submit(compute, klass, study, index, False, part)
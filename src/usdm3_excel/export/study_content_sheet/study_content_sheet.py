@@ -1,15 +1,15 @@
 from .content_panel import ContentPanel
 from usdm4.api.study import Study
 
-from usdm4_excel.export.base.base_sheet import BaseSheet
+from usdm3_excel.export.base.base_sheet import BaseSheet
 
 
 class StudyContentSheet(BaseSheet):
     SHEET_NAME = "studyDesignContent"
 
     def save(self, study: Study):
-        op = ContentPanel(self.ct_version)
-        result = op.execute(study)
+        op = ContentPanel(self.ct_version, self.index)
+        result = op.execute(study, self.lazy)
         last_row = self.etw.add_table(result, self.SHEET_NAME)
         self.etw.format_cells(
             self.SHEET_NAME,
@@ -1,6 +1,7 @@
 from usdm4.api.study import Study
 from usdm4.api.study_design import StudyDesign
 from usdm4_excel.export.base.base_panel import BasePanel
+from usdm3_excel.export.base.timeline_sheets import TimelineSheets
 
 
 class MainPanel(BasePanel):
@@ -38,8 +39,9 @@ class MainPanel(BasePanel):
                 (", ").join([self._pt_from_code(x) for x in design.characteristics]),
             ]
         )
-        result.append(["mainTimeline", "mainTimeline"])
-        result.append(["otherTimelines", ""])
+        sheets = TimelineSheets(design)
+        result.append(["mainTimeline", sheets.names[0]])
+        result.append(["otherTimelines", ", ".join(sheets.names[1:])])
         # result.append(["studyType", self._pt_from_code(design.studyType)])
         # result.append(["studyPhase", self._pt_from_alias_code(design.studyPhase)])
         # result.append(["spare", ""])
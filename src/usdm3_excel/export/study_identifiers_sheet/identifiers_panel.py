@@ -3,39 +3,42 @@ from usdm4.api.identifier import StudyIdentifier
 from usdm4.api.address import Address
 from usdm4.api.organization import Organization
 from usdm4.api.study_version import StudyVersion
-from usdm4_excel.export.base.collection_panel import CollectionPanel
+from usdm3_excel.export.base.collection_panel import CollectionPanel
+from usdm3_excel.export.base.table import Table
 
 
 class IdentifiersPanel(CollectionPanel):
-    def execute(self, study: Study) -> list[list[dict]]:
+    COLUMNS = [
+        "organizationIdentifierScheme",
+        "organizationIdentifier",
+        "organizationName",
+        "organizationType",
+        "studyIdentifier",
+        "organizationAddress",
+    ]
+
+    def execute(self, study: Study) -> Table:
         collection = []
+        self._study_index(study)
         for version in study.versions:
             for item in version.studyIdentifiers:
                 self._add_identifier(collection, item, version)
-        return super().execute(
-            collection,
-            [
-                "organizationIdentifierScheme",
-                "organizationIdentifier",
-                "organizationName",
-                "organizationType",
-                "studyIdentifier",
-                "organizationAddress",
-            ],
-        )
+        return self._table(collection)
 
     def _add_identifier(
         self, collection: list, item: StudyIdentifier, version: StudyVersion
     ):
-        org: Organization = version.organization(item.scopeId)
-        data = org.model_dump()
-        data["organizationIdentifierScheme"] = data["identifierScheme"]
-        data["organizationIdentifier"] = data["identifier"]
-        data["organizationName"] = data["name"]
-        data["organizationType"] = self._map_org_type(self._pt_from_code(org.type))
-        data["organizationAddress"] = self._from_address(org.legalAddress)
-        data["studyIdentifier"] = item.text
-        collection.append(data)
+        org: Organization = self.index.organization(version.id, item.scopeId)
+        collection.append(
+            (
+                org.identifierScheme,
+                org.identifier,
+                org.name,
+                self._map_org_type(self._pt_from_code(org.type)),
+                item.text,
+                self._from_address(org.legalAddress),
+            )
+        )
 
     def _from_address(self, address: Address):
         if address is None:
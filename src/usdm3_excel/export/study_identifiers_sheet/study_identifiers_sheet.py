@@ -1,13 +1,13 @@
 from .identifiers_panel import IdentifiersPanel
 from usdm4.api.study import Study
-from usdm4_excel.export.base.base_sheet import BaseSheet
+from usdm3_excel.export.base.base_sheet import BaseSheet
 
 
 class StudyIdentifiersSheet(BaseSheet):
     SHEET_NAME = "studyIdentifiers"
 
     def save(self, study: Study):
-        op = IdentifiersPanel(self.ct_version)
+        op = IdentifiersPanel(self.ct_version, self.index)
         result = op.execute(study)
         self.etw.add_table(result, self.SHEET_NAME)
         self.etw.format_cells(
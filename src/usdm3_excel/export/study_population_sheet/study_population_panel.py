@@ -1,36 +1,37 @@
 from usdm4.api.study import Study
-from usdm4_excel.export.base.collection_panel import CollectionPanel
+from usdm3_excel.export.base.collection_panel import CollectionPanel
+from usdm3_excel.export.base.table import Table
 
 
 class StudyPopulationPanel(CollectionPanel):
-    def execute(self, study: Study) -> list[list[dict]]:
+    COLUMNS = [
+        "level",
+        "name",
+        "description",
+        "label",
+        "plannedCompletionNumber",
+        "plannedEnrollmentNumber",
+        "plannedAge",
+        "plannedSexOfParticipants",
+        "includesHealthySubjects",
+    ]
+
+    def execute(self, study: Study) -> Table:
         collection = []
         self._add_default(collection)
-        return super().execute(
-            collection,
-            [
-                "level",
-                "name",
-                "description",
-                "label",
-                "plannedCompletionNumber",
-                "plannedEnrollmentNumber",
-                "plannedAge",
-                "plannedSexOfParticipants",
-                "includesHealthySubjects",
-            ],
-        )
+        return self._table(collection)
 
     def _add_default(self, collection: list):
-        data = {
-            "level": "Main",
-            "name": "POP1",
-            "description": "Default Population",
-            "label": "Default Population",
-            "plannedCompletionNumber": "0",
-            "plannedEnrollmentNumber": "0",
-            "plannedAge": "18..100 years",
-            "plannedSexOfParticipants": "BOTH",
-            "includesHealthySubjects": "N",
-        }
-        collection.append(data)
+        collection.append(
+            (
+                "Main",
+                "POP1",
+                "Default Population",
+                "Default Population",
+                "0",
+                "0",
+                "18..100 years",
+                "BOTH",
+                "N",
+            )
+        )
@@ -1,6 +1,6 @@
 from .study_population_panel import StudyPopulationPanel
 from usdm4.api.study import Study
-from usdm4_excel.export.base.base_sheet import BaseSheet
+from usdm3_excel.export.base.base_sheet import BaseSheet
 
 
 class StudyPopulationSheet(BaseSheet):
@@ -1,10 +1,13 @@
 from usdm4.api.study import Study
 from usdm4.api.governance_date import GovernanceDate
-from usdm4_excel.export.base.collection_panel import CollectionPanel
+from usdm3_excel.export.base.collection_panel import CollectionPanel
+from usdm3_excel.export.base.table import Table
 
 
 class DatesPanel(CollectionPanel):
-    def execute(self, study: Study) -> list[list[dict]]:
+    COLUMNS = ["category", "name", "description", "label", "type", "date", "scopes"]
+
+    def execute(self, study: Study) -> Table:
         collection = []
         for version in study.versions:
             for date in version.dateValues:
@@ -16,15 +19,17 @@ class DatesPanel(CollectionPanel):
             for version in document.versions:
                 for date in version.dateValues:
                     self._add_date(collection, date, "protocol_document")
-        return super().execute(
-            collection,
-            ["category", "name", "description", "label", "type", "date", "scopes"],
-        )
+        return self._table(collection)
 
     def _add_date(self, collection: list, date: GovernanceDate, category: str):
-        data = date.model_dump()
-        data["type"] = self._pt_from_code(date.type)
-        data["date"] = self._date_from_date(date.dateValue)
-        data["scopes"] = self._scopes(date.geographicScopes)
-        data["category"] = category
-        collection.append(data)
+        collection.append(
+            (
+                category,
+                date.name,
+                date.description,
+                date.label,
+                self._pt_from_code(date.type),
+                self._date_from_date(date.dateValue),
+                self._scopes(date.geographicScopes),
+            )
+        )
@@ -2,7 +2,7 @@ from .main_panel import MainPanel
 from .dates_panel import DatesPanel
 
 from usdm4.api.study import Study
-from usdm4_excel.export.base.base_sheet import BaseSheet
+from usdm3_excel.export.base.base_sheet import BaseSheet
 
 
 class StudySheet(BaseSheet):
@@ -1,41 +1,59 @@
+from typing import Iterator
 from usdm4.api.study import Study
 from usdm4.api.study_version import StudyVersion
 from usdm4.api.study_design import StudyDesign
 from usdm4.api.schedule_timeline import ScheduleTimeline
-from usdm4_excel.export.base.collection_panel import CollectionPanel
+from usdm4.api.activity import Activity
+from usdm3_excel.export.base.collection_panel import CollectionPanel
+from usdm3_excel.export.base.table import Table
 
 
 class ActivitiesPanel(CollectionPanel):
-    def execute(self, study: Study) -> list[list[dict]]:
-        collection = []
+    def execute(
+        self, study: Study, lazy: bool = False, timeline: ScheduleTimeline = None
+    ) -> Table:
         version: StudyVersion = study.versions[0]
         design: StudyDesign = version.studyDesigns[0]
-        timeline: ScheduleTimeline = design.main_timeline()
+        if timeline is None:
+            timeline = design.main_timeline()
         activity_order = design.activity_list()
         timepoints = timeline.timepoint_list() if timeline else []
 
-        # Blank timepoints
-        row = {}
+        # Columns, one per distinct timepoint
+        columns = {}
         for timepoint in timepoints:
-            row[timepoint.id] = ""
+            columns.setdefault(timepoint.id, len(columns))
 
-        # Activities
+        # Invert timepoint -> activities into activity -> columns
+        scheduled = {}
+        for timepoint in timepoints:
+            column = columns[timepoint.id]
+            for activity_id in timepoint.activityIds:
+                scheduled.setdefault(activity_id, set()).add(column)
+
+        # Activities, merged by name
         activities = {}
         for activity in activity_order:
-            for timepoint in timepoints:
-                if activity.id in timepoint.activityIds:
-                    if activity.name not in activities:
-                        activities[activity.name] = row.copy()
-                    activities[activity.name][timepoint.id] = "X"
+            if activity.id in scheduled:
+                activities.setdefault(activity.name, set()).update(
+                    scheduled[activity.id]
+                )
 
         # Output
-        collection.append(
+        rows = self._rows(activity_order, activities, len(columns))
+        return Table(
             ["Parent Activity", "Child Activity", "BC/Procedure/Timeline"]
-            + list(row.values())
+            + [""] * len(columns),
+            rows if lazy else list(rows),
         )
+
+    def _rows(
+        self, activity_order: list[Activity], activities: dict, n_columns: int
+    ) -> Iterator[tuple]:
         for activity in activity_order:
             if activity.name in activities:
-                data = activities[activity.name]
+                data = [""] * n_columns
+                for column in activities[activity.name]:
+                    data[column] = "X"
                 label = activity.label if activity.label else activity.name
-                collection.append(["", label, ""] + list(data.values()))
-        return collection
+                yield ("", label, "", *data)
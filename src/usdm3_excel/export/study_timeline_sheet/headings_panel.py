@@ -6,11 +6,13 @@ from usdm4.api.scheduled_instance import (
     ScheduledActivityInstance,
     ScheduledDecisionInstance,
 )
-from usdm4_excel.export.base.collection_panel import CollectionPanel
+from usdm3_excel.export.base.collection_panel import CollectionPanel
 
 
 class HeadingsPanel(CollectionPanel):
-    def execute(self, study: Study) -> list[list[dict]]:
+    def execute(
+        self, study: Study, timeline: ScheduleTimeline = None
+    ) -> list[list[dict]]:
         collection = [
             ["name"],
             ["description"],
@@ -21,19 +23,18 @@ class HeadingsPanel(CollectionPanel):
             ["epoch"],
             ["encounter"],
         ]
+        self._study_index(study)
         version: StudyVersion = study.versions[0]
         design: StudyDesign = version.studyDesigns[0]
-        timeline: ScheduleTimeline = design.main_timeline()
+        if timeline is None:
+            timeline = design.main_timeline()
         if timeline:
+            timepoints = timeline.timepoint_list()
             # Workaround if defaultConditionId is not set in USDM4
-            n_timepoints = len(timeline.timepoint_list())
-            timepoint_list = timeline.timepoint_list()
-            for i in range(n_timepoints):
-                if not timepoint_list[i].defaultConditionId:
-                    if i != n_timepoints - 1:
-                        timepoint_list[i].defaultConditionId = timepoint_list[i + 1].id
-
-            for timepoint in timeline.timepoint_list():
+            for timepoint, following in zip(timepoints, timepoints[1:]):
+                if not timepoint.defaultConditionId:
+                    timepoint.defaultConditionId = following.id
+            for timepoint in timepoints:
                 self._add_instance(collection, timepoint, design, timeline)
         return collection
 
@@ -44,21 +45,21 @@ class HeadingsPanel(CollectionPanel):
         study_design: StudyDesign,
         timeline: ScheduleTimeline,
     ):
-        data = item.model_dump()
-        data["type"] = (
+        # data["default"] = timeline.find_timepoint(item.defaultConditionId)
+        default = self.index.timepoint(timeline.id, item.defaultConditionId)
+        epoch = self.index.epoch(study_design.id, item.epochId)
+        encounter = self.index.encounter(study_design.id, item.encounterId)
+        column = [
+            item.name,
+            item.description,
+            item.label,
             "Activity"
             if item.instanceType == "ScheduledActivityInstance"
-            else "Decision"
-        )
-        # data["default"] = timeline.find_timepoint(item.defaultConditionId)
-        k = timeline.find_timepoint(item.defaultConditionId)
-        data["default"] = k.name if k else ""
-        data["condition"] = ""  # @todo Not needed in this release
-        epoch = study_design.find_epoch(item.epochId)
-        data["epoch"] = epoch.name if epoch else ""
-        encounter = study_design.find_encounter(item.encounterId)
-        data["encounter"] = encounter.name if encounter else ""
-        for k, v in data.items():
-            for row in collection:
-                if row[0] == k:
-                    row.append(v)
+            else "Decision",
+            default.name if default else "",
+            "",  # @todo Condition not needed in this release
+            epoch.name if epoch else "",
+            encounter.name if encounter else "",
+        ]
+        for row, value in zip(collection, column):
+            row.append(value)
@@ -6,11 +6,14 @@ from usdm4_excel.export.base.base_panel import BasePanel
 
 
 class MainPanel(BasePanel):
-    def execute(self, study: Study) -> list[list[dict]]:
+    def execute(
+        self, study: Study, timeline: ScheduleTimeline = None
+    ) -> list[list[dict]]:
         result = []
-        version: StudyVersion = study.versions[0]
-        design: StudyDesign = version.studyDesigns[0]
-        timeline: ScheduleTimeline = design.main_timeline()
+        if timeline is None:
+            version: StudyVersion = study.versions[0]
+            design: StudyDesign = version.studyDesigns[0]
+            timeline = design.main_timeline()
         result.append(["Name", timeline.name if timeline else ""])
         result.append(["Description", timeline.description if timeline else ""])
         result.append(["Condition", timeline.entryCondition if timeline else ""])
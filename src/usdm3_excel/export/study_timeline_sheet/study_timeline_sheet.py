@@ -2,26 +2,43 @@ from .main_panel import MainPanel
 from .headings_panel import HeadingsPanel
 from .activities_panel import ActivitiesPanel
 from usdm4.api.study import Study
-from usdm4_excel.export.base.base_sheet import BaseSheet
+from usdm3_excel.export.base.base_sheet import BaseSheet
+from usdm3_excel.export.base.timeline_sheets import TimelineSheets
 
 
 class StudyTimelineSheet(BaseSheet):
-    SHEET_NAME = "mainTimeline"
+    SHEET_NAME = TimelineSheets.MAIN
+
+    @classmethod
+    def parts(cls, study: Study) -> list[int]:
+        # One part per timeline sheet, by position in TimelineSheets
+        return list(range(len(cls._timeline_sheets(study))))
 
     def save(self, study: Study):
+        for part in self.parts(study):
+            self.save_part(study, part)
+
+    def save_part(self, study: Study, part: int):
+        sheets = self._timeline_sheets(study)
+        timeline = sheets.timelines[part]
+        sheet_name = sheets.names[part]
         mp = MainPanel(self.ct_version)
-        result = mp.execute(study)
-        last_row = self.etw.add_table(result, self.SHEET_NAME, 1, 1)
-        mp = HeadingsPanel(self.ct_version)
-        result = mp.execute(study)
-        last_row = self.etw.add_table(result, self.SHEET_NAME, 1, 3)
+        result = mp.execute(study, timeline=timeline)
+        last_row = self.etw.add_table(result, sheet_name, 1, 1)
+        mp = HeadingsPanel(self.ct_version, self.index)
+        result = mp.execute(study, timeline=timeline)
+        last_row = self.etw.add_table(result, sheet_name, 1, 3)
         ap = ActivitiesPanel(self.ct_version)
-        result = ap.execute(study)
-        last_row = self.etw.add_table(result, self.SHEET_NAME, 9, 1)
+        result = ap.execute(study, self.lazy, timeline=timeline)
+        last_row = self.etw.add_table(result, sheet_name, 9, 1)
         self.etw.format_cells(
-            self.SHEET_NAME,
+            sheet_name,
             (1, 1, last_row, 1),
             font_style="bold",
             background_color=self.HEADING_BG,
         )
-        self.etw.set_column_width(self.SHEET_NAME, [1, 3, 4, 5, 6, 7], 20.0)
+        self.etw.set_column_width(sheet_name, [1, 3, 4, 5, 6, 7], 20.0)
+
+    @classmethod
+    def _timeline_sheets(cls, study: Study) -> TimelineSheets:
+        return TimelineSheets(study.versions[0].studyDesigns[0])
@@ -1,14 +1,14 @@
 from .timing_panel import TimingPanel
 from usdm4.api.study import Study
-from usdm4_excel.export.base.base_sheet import BaseSheet
+from usdm3_excel.export.base.base_sheet import BaseSheet
 
 
 class StudyTimingSheet(BaseSheet):
     SHEET_NAME = "studyDesignTiming"
 
     def save(self, study: Study):
-        op = TimingPanel(self.ct_version)
-        result = op.execute(study)
+        op = TimingPanel(self.ct_version, self.index)
+        result = op.execute(study, self.lazy)
         self.etw.add_table(result, self.SHEET_NAME)
         self.etw.format_cells(
             self.SHEET_NAME,
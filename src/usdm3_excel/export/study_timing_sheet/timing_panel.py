@@ -1,45 +1,54 @@
 import re
+from typing import Iterator
 from usdm4.api.study import Study
 from usdm4.api.timing import Timing
 from usdm4.api.code import Code
 from usdm4.api.schedule_timeline import ScheduleTimeline
-from usdm4_excel.export.base.collection_panel import CollectionPanel
+from usdm3_excel.export.base.collection_panel import CollectionPanel
+from usdm3_excel.export.base.table import Table
 
 
 class TimingPanel(CollectionPanel):
-    def execute(self, study: Study) -> list[list[dict]]:
-        collection = []
+    COLUMNS = [
+        "name",
+        "description",
+        "label",
+        "type",
+        "from",
+        "to",
+        "timingValue",
+        "toFrom",
+        "window",
+    ]
+
+    def execute(self, study: Study, lazy: bool = False) -> Table:
+        rows = self._rows(study)
+        return self._table(rows if lazy else list(rows))
+
+    def _rows(self, study: Study) -> Iterator[tuple]:
+        self._study_index(study)
         for version in study.versions:
             for design in version.studyDesigns:
                 for timeline in design.scheduleTimelines:
                     for item in timeline.timings:
-                        self._add_timing(collection, item, timeline)
-        return super().execute(
-            collection,
-            [
-                "name",
-                "description",
-                "label",
-                "type",
-                "from",
-                "to",
-                "timingValue",
-                "toFrom",
-                "window",
-            ],
-        )
+                        yield self._add_timing(item, timeline)
 
-    def _add_timing(self, collection: list, item: Timing, timeline: ScheduleTimeline):
-        data = item.model_dump()
-        data["type"] = self._encode_type(item.type)
-        from_tp = timeline.find_timepoint(item.relativeFromScheduledInstanceId)
-        data["from"] = from_tp.name if from_tp else ""
-        to_tp = timeline.find_timepoint(item.relativeToScheduledInstanceId)
-        data["to"] = to_tp.name if to_tp else ""
-        data["timingValue"] = self._decode_iso8601_duration(item.value)
-        data["window"] = item.windowLabel
-        data["toFrom"] = self._encode_to_from(item.relativeToFrom)
-        collection.append(data)
+    def _add_timing(self, item: Timing, timeline: ScheduleTimeline) -> tuple:
+        from_tp = self.index.timepoint(
+            timeline.id, item.relativeFromScheduledInstanceId
+        )
+        to_tp = self.index.timepoint(timeline.id, item.relativeToScheduledInstanceId)
+        return (
+            item.name,
+            item.description,
+            item.label,
+            self._encode_type(item.type),
+            from_tp.name if from_tp else "",
+            to_tp.name if to_tp else "",
+            self._decode_iso8601_duration(item.value),
+            self._encode_to_from(item.relativeToFrom),
+            item.windowLabel,
+        )
 
     def _encode_type(self, code: Code):
         mapping = {"C201358": "FIXED", "C201356": "AFTER", "C201357": "BEFORE"}
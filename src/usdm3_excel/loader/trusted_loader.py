@@ -0,0 +1,153 @@
+import datetime
+import functools
+import json
+import typing
+import uuid
+from pydantic import BaseModel
+from simple_error_log import Errors
+from simple_error_log.error_location import KlassMethodLocation
+from usdm4.api.wrapper import Wrapper
+
+
+def _date(value):
+    return datetime.date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _uuid(value):
+    return uuid.UUID(value) if isinstance(value, str) else value
+
+
+def _float(value):
+    return float(value) if type(value) is int else value
+
+
+class TrustedLoader:
+    """
+    Builds a Wrapper from USDM JSON that has already been validated upstream.
+    Models are constructed directly rather than validated. Where a field allows
+    several models the first one whose required fields are all present is used,
+    as validation would, and only the scalar conversions validation would have
+    made (dates, the study UUID and integral floats) are applied. Input that
+    does not conform gives undefined results.
+    """
+
+    MODULE = "usdm3_excel.loader.trusted_loader.TrustedLoader"
+    CONVERTERS = {datetime.date: _date, uuid.UUID: _uuid, float: _float}
+
+    _descriptions = {}
+
+    def loadd(self, data: dict, errors: Errors) -> Wrapper | None:
+        try:
+            return self._build(Wrapper, data)
+        except Exception as e:
+            errors.exception(
+                "Failed to load a dict into USDM",
+                e,
+                KlassMethodLocation(self.MODULE, "loadd"),
+            )
+            return None
+
+    def load(self, filepath: str, errors: Errors) -> Wrapper | None:
+        try:
+            with open(filepath, "rb") as f:
+                data = json.loads(f.read())
+            return self._build(Wrapper, data)
+        except Exception as e:
+            errors.exception(
+                f"Failed to load file '{filepath}' into USDM",
+                e,
+                KlassMethodLocation(self.MODULE, "load"),
+            )
+            return None
+
+    def _build(self, klass: type, data: dict) -> BaseModel:
+        description = self._description(klass)
+        if description is None:
+            return klass.model_validate(data)
+        values = {}
+        fields_set = set()
+        for name, field, default in description:
+            if name in data:
+                value = data[name]
+                if field is not None and value is not None:
+                    if isinstance(value, list):
+                        value = [self._value(field, x) for x in value]
+                    else:
+                        value = self._value(field, value)
+                values[name] = value
+                fields_set.add(name)
+            elif default is not None:
+                values[name] = default()
+        if "instanceType" in values:
+            values["instanceType"] = klass.__name__
+        # Set up the instance as model_construct would, without its per field
+        # alias handling which USDM does not use
+        model = klass.__new__(klass)
+        object.__setattr__(model, "__dict__", values)
+        object.__setattr__(model, "__pydantic_fields_set__", fields_set)
+        object.__setattr__(model, "__pydantic_extra__", None)
+        object.__setattr__(model, "__pydantic_private__", None)
+        return model
+
+    def _value(self, field: tuple, value):
+        models, converter = field
+        if isinstance(value, dict) and models:
+            klass = models[0][0]
+            if len(models) > 1:
+                klass = next(
+                    (x for x, required in models if required <= value.keys()), klass
+                )
+            return self._build(klass, value)
+        return converter(value) if converter else value
+
+    @classmethod
+    def _description(cls, klass: type) -> list | None:
+        # Worked out once per class. Fields holding models or needing conversion
+        # carry how to build them, optional fields carry how to make the default.
+        # Models needing more than plain construction are validated as usual
+        if klass not in cls._descriptions:
+            description = None
+            if cls._plain(klass):
+                description = []
+                for name, info in klass.model_fields.items():
+                    types = cls._types(info.annotation)
+                    models = [x for x in types if issubclass(x, BaseModel)]
+                    converter = next(
+                        (cls.CONVERTERS[x] for x in types if x in cls.CONVERTERS),
+                        None,
+                    )
+                    field = None
+                    if models or converter:
+                        field = ([(x, cls._required(x)) for x in models], converter)
+                    default = None
+                    if not info.is_required():
+                        default = functools.partial(
+                            info.get_default, call_default_factory=True
+                        )
+                    description.append((name, field, default))
+            cls._descriptions[klass] = description
+        return cls._descriptions[klass]
+
+    @staticmethod
+    def _plain(klass: type) -> bool:
+        return (
+            not klass.__pydantic_post_init__
+            and not klass.__private_attributes__
+            and klass.model_config.get("extra") != "allow"
+            and not any(
+                x.alias or x.validation_alias for x in klass.model_fields.values()
+            )
+        )
+
+    @staticmethod
+    def _required(klass: type) -> frozenset:
+        return frozenset(
+            name for name, info in klass.model_fields.items() if info.is_required()
+        )
+
+    @classmethod
+    def _types(cls, annotation) -> list[type]:
+        args = typing.get_args(annotation)
+        if not args:
+            return [annotation] if isinstance(annotation, type) else []
+        return [x for arg in args for x in cls._types(arg)]
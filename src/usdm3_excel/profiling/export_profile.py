@@ -0,0 +1,94 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from usdm3_excel.__info__ import __package_version__
+
+
+def measure(profile: "ExportProfile", stage: str, name: str):
+    return profile.measure(stage, name) if profile else nullcontext()
+
+
+class ExportProfile:
+    """
+    Wall time, CPU time and tracemalloc allocations for the stages of an
+    export. Repeated measurements of the same stage and name are combined,
+    times being summed and the largest peak kept. Peaks are those above the
+    memory in use as the stage started. Stages must not be nested as tracing
+    has a single peak. Tracing slows everything it measures, so times are for
+    comparing stages and releases rather than as absolutes.
+    """
+
+    LOAD = "load"
+    BLANK = "blank"
+    SHEET = "sheet"
+    TABLE = "table"
+    FORMAT = "format"
+    SAVE = "save"
+    CACHE = "cache"
+
+    def __init__(self):
+        self.stages = []
+        self.wall = 0.0
+        self.cpu = 0.0
+        self._index = {}
+        self._started = None
+        self._tracing = False
+
+    def start(self) -> None:
+        self._tracing = not tracemalloc.is_tracing()
+        if self._tracing:
+            tracemalloc.start()
+        self._started = (time.perf_counter(), time.process_time())
+
+    def stop(self) -> None:
+        self.wall = time.perf_counter() - self._started[0]
+        self.cpu = time.process_time() - self._started[1]
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    @contextmanager
+    def measure(self, stage: str, name: str):
+        tracemalloc.reset_peak()
+        memory = tracemalloc.get_traced_memory()[0]
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        yield
+        wall = time.perf_counter() - wall
+        cpu = time.process_time() - cpu
+        current, peak = tracemalloc.get_traced_memory()
+        self._add(stage, name, wall, cpu, peak - memory, current - memory)
+
+    def to_dict(self) -> dict:
+        return {
+            "usdm3_excel": __package_version__,
+            "wall": self.wall,
+            "cpu": self.cpu,
+            "stages": self.stages,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def _add(
+        self, stage: str, name: str, wall: float, cpu: float, peak: int, allocated: int
+    ) -> None:
+        key = (stage, name)
+        if key not in self._index:
+            self._index[key] = {
+                "stage": stage,
+                "name": name,
+                "count": 0,
+                "wall": 0.0,
+                "cpu": 0.0,
+                "peak_bytes": 0,
+                "allocated_bytes": 0,
+            }
+            self.stages.append(self._index[key])
+        entry = self._index[key]
+        entry["count"] += 1
+        entry["wall"] += wall
+        entry["cpu"] += cpu
+        entry["peak_bytes"] = max(entry["peak_bytes"], peak)
+        entry["allocated_bytes"] += allocated
@@ -0,0 +1,70 @@
+import json
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+
+
+class ExportHandler(BaseHTTPRequestHandler):
+    """
+    Handles the requests of an ExportServer.
+
+    POST /convert takes the USDM JSON as the request body and answers with
+    the workbook, or with the errors as JSON. GET /health reports the number
+    of workers.
+    """
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path != "/health":
+            self._json(404, {"error": "Not found"})
+            return
+        server = self.server.export_server
+        self._json(200, {"status": "ok", "workers": server.workers})
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        if url.path != "/convert":
+            self._json(404, {"error": "Not found"})
+            return
+        server = self.server.export_server
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._json(400, {"error": "The Content-Length of the request is invalid"})
+            return
+        if not length:
+            self._json(400, {"error": "The request body must be the USDM JSON"})
+            return
+        if length > server.max_size:
+            self._json(
+                413,
+                {
+                    "error": f"The request body is larger than the limit of {server.max_size} bytes"
+                },
+            )
+            return
+        data = self.rfile.read(length)
+        try:
+            options = server.request_options(url.query)
+        except ValueError as e:
+            self._json(400, {"error": str(e)})
+            return
+        try:
+            workbook, errors = server.convert(data, options)
+        except Exception as e:
+            self._json(500, {"error": str(e)})
+            return
+        if workbook is None:
+            self._json(422, {"errors": errors})
+            return
+        self._send(200, server.CONTENT_TYPE, workbook)
+
+    def _json(self, status: int, body: dict) -> None:
+        self._send(status, "application/json", json.dumps(body).encode())
+
+    def _send(self, status: int, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
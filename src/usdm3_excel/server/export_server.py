@@ -0,0 +1,152 @@
+import os
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from http.server import ThreadingHTTPServer
+from urllib.parse import parse_qs
+from simple_error_log import Errors
+from simple_error_log.error_location import KlassMethodLocation
+from usdm3_excel.batch.batch_runner import initialise
+from usdm3_excel.cache.export_cache import ExportCache
+from .export_handler import ExportHandler
+
+
+def initialise_worker() -> None:
+    # The server shuts the pool down on an interrupt, the workers need not
+    # handle it themselves
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    initialise()
+
+
+def export(
+    data: bytes, options: dict, cache: ExportCache = None
+) -> tuple[bytes | None, list[dict]]:
+    from usdm3_excel import USDM3Excel
+
+    exporter = USDM3Excel(cache)
+    errors = Errors()
+    workbook = None
+    try:
+        workbook = exporter.to_bytes(data, **options)
+    except Exception as e:
+        errors.exception(
+            "Failed to convert the USDM JSON",
+            e,
+            KlassMethodLocation(ExportServer.MODULE, "export"),
+        )
+    errors.merge(exporter.errors())
+    if errors.error_count():
+        return None, errors.to_dict()
+    return workbook, []
+
+
+class ExportServer:
+    """
+    Converts USDM JSON posted to a local HTTP endpoint using a pool of worker
+    processes that stay alive between requests.
+
+    The workers import the package once, when the server starts, so a
+    request pays only for the conversion. Requests are served on their own
+    threads and converted concurrently, up to the number of workers. Options
+    given to the server apply to every request and may be overridden per
+    request in the query string.
+    """
+
+    MODULE = "usdm3_excel.server.export_server.ExportServer"
+    CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    DEFAULT_PORT = 8765
+    # The largest request body accepted, as it is held in memory
+    DEFAULT_MAX_SIZE = 100 * 1024 * 1024
+    TEXT_OPTIONS = ["writer", "compression"]
+    FLAG_OPTIONS = ["trusted", "deterministic"]
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        workers: int = None,
+        options: dict = None,
+        cache: ExportCache = None,
+        max_size: int = None,
+    ):
+        self.host = host
+        self.port = port
+        self.workers = workers if workers else os.cpu_count()
+        self.options = options if options else {}
+        self.cache = cache
+        self.max_size = max_size if max_size else self.DEFAULT_MAX_SIZE
+        self._pool = None
+        self._httpd = None
+        self._lock = threading.Lock()
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self._httpd.server_address[:2]
+
+    def start(self) -> None:
+        self._pool = self._new_pool()
+        self._httpd = ThreadingHTTPServer((self.host, self.port), ExportHandler)
+        self._httpd.export_server = self
+
+    def serve_forever(self) -> None:
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+            self._pool.shutdown(cancel_futures=True)
+
+    def shutdown(self) -> None:
+        # Stops serve_forever running on another thread
+        self._httpd.shutdown()
+
+    def request_options(self, query: str) -> dict:
+        from usdm3_excel import USDM3Excel
+        from usdm3_excel.export.excel_table_writer.xlsx_archive import XlsxArchive
+
+        options = dict(self.options)
+        for name, values in parse_qs(query, keep_blank_values=True).items():
+            if name in self.TEXT_OPTIONS:
+                options[name] = values[-1]
+            elif name in self.FLAG_OPTIONS:
+                options[name] = values[-1].lower() in ["", "1", "true", "yes"]
+            else:
+                raise ValueError(f"Unknown option '{name}'")
+        writer = options.get("writer", "openpyxl")
+        if writer not in USDM3Excel.WRITERS:
+            raise ValueError(
+                f"Unknown writer '{writer}', expected one of {', '.join(USDM3Excel.WRITERS)}"
+            )
+        XlsxArchive.check(options.get("compression"))
+        return options
+
+    def convert(self, data: bytes, options: dict) -> tuple[bytes | None, list[dict]]:
+        pool = self._pool
+        try:
+            return pool.submit(export, data, options, self.cache).result()
+        except BrokenProcessPool:
+            # A crashed worker breaks the whole pool, so start a new one for
+            # the requests that follow
+            with self._lock:
+                if self._pool is pool:
+                    self._pool = self._new_pool()
+        # Every request in the broken pool failed with it, so convert this one
+        # again in a pool of its own, where only the request responsible for
+        # the crash fails once more
+        try:
+            with ProcessPoolExecutor(
+                max_workers=1, initializer=initialise_worker
+            ) as alone:
+                return alone.submit(export, data, options, self.cache).result()
+        except BrokenProcessPool:
+            raise RuntimeError(
+                "Worker process terminated while converting the USDM JSON"
+            )
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=initialise_worker
+        )
+        # Workers are started as tasks arrive, so give each one a task now
+        wait([pool.submit(initialise) for _ in range(self.workers)])
+        return pool
@@ -0,0 +1,32 @@
+from simple_error_log import Errors
+
+from usdm3_excel.batch.batch_result import BatchResult
+
+
+class TestBatchResult:
+    """Tests for the BatchResult class."""
+
+    def test_success(self):
+        """Test a successful result."""
+        errors = Errors()
+        result = BatchResult("a.json", "a.xlsx", BatchResult.SUCCESS, 1.5, errors)
+        assert result.success
+        assert result.errors is errors
+        assert result.to_dict() == {
+            "usdm_filepath": "a.json",
+            "excel_filepath": "a.xlsx",
+            "status": "success",
+            "duration": 1.5,
+            "errors": [],
+        }
+
+    def test_failed(self):
+        """Test a failed result includes the error log."""
+        errors = Errors()
+        errors.error("Broken")
+        result = BatchResult("a.json", "a.xlsx", BatchResult.FAILED, 0.1, errors)
+        assert not result.success
+        data = result.to_dict()
+        assert data["status"] == "failed"
+        assert len(data["errors"]) == 1
+        assert data["errors"][0]["message"] == "Broken"
@@ -0,0 +1,175 @@
+import os
+import time
+from unittest.mock import patch
+
+from usdm3_excel.batch.batch_result import BatchResult
+from usdm3_excel.batch.batch_runner import BatchRunner, convert, initialise
+from usdm3_excel.cache.export_cache import ExportCache
+
+USDM_1 = "tests/test_files/usdm_1.json"
+USDM_2 = "tests/test_files/usdm_2.json"
+
+
+def ready() -> None:
+    # Stands in for the initialiser, the workers not needing the package
+    pass
+
+
+def crash(usdm_filepath, excel_filepath, options, cache):
+    # Stands in for convert in the workers, ending the process for the study
+    # named crash.json while the others are still running
+    if usdm_filepath == "crash.json":
+        os._exit(1)
+    time.sleep(0.2)
+    return BatchResult(usdm_filepath, excel_filepath, BatchResult.SUCCESS, 0.2, None)
+
+
+class TestBatchRunner:
+    """Tests for the BatchRunner class and worker functions."""
+
+    def test_initialise(self):
+        """Test the worker initialiser imports without error."""
+        initialise()
+
+    def test_convert(self, tmp_path):
+        """Test converting a single study in process."""
+        output = os.path.join(tmp_path, "usdm_1.xlsx")
+        result = convert(USDM_1, output)
+        assert result.status == BatchResult.SUCCESS
+        assert result.usdm_filepath == USDM_1
+        assert result.excel_filepath == output
+        assert result.duration > 0.0
+        assert result.errors.error_count() == 0
+        assert os.path.exists(output)
+
+    def test_convert_failure(self, tmp_path):
+        """Test that a bad study is reported rather than raised."""
+        output = os.path.join(tmp_path, "missing.xlsx")
+        result = convert("tests/test_files/missing.json", output)
+        assert result.status == BatchResult.FAILED
+        assert result.errors.error_count() == 1
+        assert not os.path.exists(output)
+
+    def test_convert_exception(self, tmp_path):
+        """Test that an exception raised by the export is reported."""
+        output = os.path.join(tmp_path, "usdm_1.xlsx")
+        with patch("usdm3_excel.USDM3Excel.to_excel", side_effect=OSError("disk")):
+            result = convert("tests/test_files/usdm_1.json", output)
+        assert result.status == BatchResult.FAILED
+        messages = [x["message"].split("\n")[0] for x in result.errors.to_dict()]
+        assert messages == ["Failed to convert 'tests/test_files/usdm_1.json'"]
+
+    def test_convert_options(self, tmp_path):
+        """Test export options are passed through to the exporter."""
+        output = os.path.join(tmp_path, "usdm_1.xlsx")
+        with patch("usdm3_excel.USDM3Excel.to_excel") as mock_to_excel:
+            result = convert(USDM_1, output, {"writer": "streaming"})
+        mock_to_excel.assert_called_once_with(USDM_1, output, writer="streaming")
+        assert result.status == BatchResult.SUCCESS
+
+    def test_workers_default(self):
+        """Test the number of workers defaults to the CPU count."""
+        assert BatchRunner().workers == os.cpu_count()
+        assert BatchRunner(3).workers == 3
+        assert BatchRunner().options == {}
+        assert BatchRunner().cache is None
+        assert BatchRunner(3, {"writer": "streaming"}).options == {
+            "writer": "streaming"
+        }
+
+    def test_execute_empty(self):
+        """Test an empty batch."""
+        assert BatchRunner(2).execute([]) == []
+
+    def test_execute(self, tmp_path):
+        """Test a batch including a failing study keeps its order."""
+        jobs = [
+            (USDM_1, os.path.join(tmp_path, "usdm_1.xlsx")),
+            ("tests/test_files/missing.json", os.path.join(tmp_path, "x.xlsx")),
+            (USDM_2, os.path.join(tmp_path, "usdm_2.xlsx")),
+        ]
+        results = BatchRunner(2).execute(jobs)
+        assert [x.status for x in results] == ["success", "failed", "success"]
+        assert [x.usdm_filepath for x in results] == [x[0] for x in jobs]
+        assert os.path.exists(jobs[0][1])
+        assert os.path.exists(jobs[2][1])
+
+    def test_execute_crashed_worker(self):
+        """Test jobs in a broken pool are rerun in isolation."""
+        runner = BatchRunner(2)
+        jobs = [("a.json", "a.xlsx"), ("b.json", "b.xlsx")]
+        ok = BatchResult("b.json", "b.xlsx", BatchResult.SUCCESS, 1.0, None)
+
+        def run(jobs, indexes, workers, results):
+            if len(indexes) > 1:
+                return indexes, []
+            if indexes == [1]:
+                results[1] = ok
+                return [], []
+            return indexes, []
+
+        with patch.object(runner, "_run", side_effect=run):
+            results = runner.execute(jobs)
+        assert results[0].status == BatchResult.FAILED
+        assert results[0].errors.to_dict()[0]["message"] == (
+            "Worker process terminated while converting 'a.json'"
+        )
+        assert results[1] is ok
+
+    def test_execute_resubmit(self):
+        """Test jobs not started when the pool broke run in a fresh pool."""
+        runner = BatchRunner(2)
+        jobs = [(f"{x}.json", f"{x}.xlsx") for x in "abcde"]
+        calls = []
+
+        def run(jobs, indexes, workers, results):
+            calls.append((indexes, workers))
+            if indexes == [0, 1, 2, 3, 4]:
+                results[2] = 2
+                return [0, 1], [3, 4]
+            for index in indexes:
+                results[index] = index
+            return [], []
+
+        with patch.object(runner, "_run", side_effect=run):
+            assert runner.execute(jobs) == [0, 1, 2, 3, 4]
+        assert calls == [([0, 1, 2, 3, 4], 2), ([0], 1), ([1], 1), ([3, 4], 2)]
+
+    def test_run_broken_pool(self, tmp_path):
+        """Test only the jobs running when a worker crashed are reported."""
+        runner = BatchRunner(2)
+        jobs = [("crash.json", "a.xlsx")] + [
+            (USDM_1, os.path.join(tmp_path, f"{x}.xlsx")) for x in range(4)
+        ]
+        results = [None] * len(jobs)
+        with (
+            patch("usdm3_excel.batch.batch_runner.initialise", ready),
+            patch("usdm3_excel.batch.batch_runner.convert", crash),
+        ):
+            crashed, queue = runner._run(jobs, [0, 1, 2, 3, 4], 2, results)
+        assert crashed == [0, 1]
+        assert queue == [2, 3, 4]
+        assert results == [None] * len(jobs)
+
+    def test_execute_broken_pool(self, tmp_path):
+        """Test a crashing study fails and the rest of the batch converts."""
+        jobs = [("crash.json", "a.xlsx")] + [
+            (USDM_1, os.path.join(tmp_path, f"{x}.xlsx")) for x in range(4)
+        ]
+        with (
+            patch("usdm3_excel.batch.batch_runner.initialise", ready),
+            patch("usdm3_excel.batch.batch_runner.convert", crash),
+        ):
+            results = BatchRunner(2).execute(jobs)
+        assert [x.status for x in results] == ["failed"] + ["success"] * 4
+        assert results[0].errors.to_dict()[0]["message"] == (
+            "Worker process terminated while converting 'crash.json'"
+        )
+
+    def test_execute_cache(self, tmp_path):
+        """Test the cache is shared with the worker processes."""
+        cache = ExportCache(os.path.join(tmp_path, "cache"))
+        jobs = [(USDM_1, os.path.join(tmp_path, "usdm_1.xlsx"))]
+        results = BatchRunner(1, cache=cache).execute(jobs)
+        assert results[0].status == BatchResult.SUCCESS
+        assert len(os.listdir(cache.directory)) == 1
@@ -0,0 +1,124 @@
+import io
+import os
+from unittest.mock import MagicMock, patch
+
+from usdm3_excel.cache.export_cache import ExportCache
+
+USDM_1 = "tests/test_files/usdm_1.json"
+USDM_2 = "tests/test_files/usdm_2.json"
+
+
+def _file(path: str, size: int) -> str:
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    return path
+
+
+class TestExportCache:
+    """Tests for the ExportCache class."""
+
+    def test_create(self, tmp_path):
+        """Test the cache directory is created."""
+        directory = os.path.join(tmp_path, "cache")
+        cache = ExportCache(directory)
+        assert os.path.isdir(directory)
+        assert cache.max_size == ExportCache.DEFAULT_MAX_SIZE
+        assert cache.size() == 0
+
+    def test_key(self, tmp_path):
+        """Test keys depend on the file content and options."""
+        cache = ExportCache(str(tmp_path))
+        key = cache.key(USDM_1, {"writer": "openpyxl"})
+        assert len(key) == 64
+        assert key == cache.key(USDM_1, {"writer": "openpyxl"})
+        assert key != cache.key(USDM_2, {"writer": "openpyxl"})
+        assert key != cache.key(USDM_1, {"writer": "streaming"})
+        copy = os.path.join(tmp_path, "copy.json")
+        with open(USDM_1, "rb") as f, open(copy, "wb") as g:
+            g.write(f.read())
+        assert key == cache.key(copy, {"writer": "openpyxl"})
+
+    def test_key_bytes(self, tmp_path):
+        """Test content held as bytes has the same key as the file."""
+        cache = ExportCache(str(tmp_path))
+        with open(USDM_1, "rb") as f:
+            data = f.read()
+        assert cache.key(data, {}) == cache.key(USDM_1, {})
+
+    def test_key_versions(self, tmp_path):
+        """Test keys change with the package versions."""
+        cache = ExportCache(str(tmp_path))
+        key = cache.key(USDM_1, {})
+        with patch("usdm3_excel.cache.export_cache.metadata.version") as version:
+            version.return_value = "99.0.0"
+            assert cache.key(USDM_1, {}) != key
+
+    def test_get_missing(self, tmp_path):
+        """Test a miss leaves the output untouched."""
+        cache = ExportCache(os.path.join(tmp_path, "cache"))
+        output = os.path.join(tmp_path, "out.xlsx")
+        assert not cache.get("abc", output)
+        assert not os.path.exists(output)
+
+    def test_put_get(self, tmp_path):
+        """Test a stored workbook is copied back out."""
+        cache = ExportCache(os.path.join(tmp_path, "cache"))
+        source = _file(os.path.join(tmp_path, "in.xlsx"), 10)
+        cache.put("abc", source)
+        output = os.path.join(tmp_path, "out.xlsx")
+        assert cache.get("abc", output)
+        with open(output, "rb") as f:
+            assert f.read() == b"x" * 10
+        assert cache.size() == 10
+        assert [x for x in os.listdir(cache.directory)] == ["abc.xlsx"]
+
+    def test_put_bytes_get_stream(self, tmp_path):
+        """Test a workbook held as bytes is stored and copied into a stream."""
+        cache = ExportCache(os.path.join(tmp_path, "cache"))
+        cache.put("abc", b"workbook")
+        buffer = io.BytesIO()
+        assert cache.get("abc", buffer)
+        assert buffer.getvalue() == b"workbook"
+        assert not cache.get("def", io.BytesIO())
+
+    def test_evict_least_recently_used(self, tmp_path):
+        """Test the least recently used entries are evicted first."""
+        cache = ExportCache(os.path.join(tmp_path, "cache"), max_size=25)
+        source = _file(os.path.join(tmp_path, "in.xlsx"), 10)
+        output = os.path.join(tmp_path, "out.xlsx")
+        cache.put("a", source)
+        cache.put("b", source)
+        os.utime(cache._path("a"), ns=(1, 1))
+        os.utime(cache._path("b"), ns=(2, 2))
+        # Using "a" makes "b" the least recently used
+        assert cache.get("a", output)
+        cache.put("c", source)
+        assert cache.get("a", output)
+        assert not cache.get("b", output)
+        assert cache.get("c", output)
+        assert cache.size() == 20
+
+    def test_evict_ignores_other_files(self, tmp_path):
+        """Test files that are not entries are neither counted nor removed."""
+        directory = os.path.join(tmp_path, "cache")
+        cache = ExportCache(directory, max_size=5)
+        other = _file(os.path.join(directory, "notes.txt"), 10)
+        cache._evict()
+        assert os.path.exists(other)
+        assert cache.size() == 0
+
+    def test_evict_concurrent_removal(self, tmp_path):
+        """Test entries removed by another process are skipped."""
+        cache = ExportCache(os.path.join(tmp_path, "cache"))
+        source = _file(os.path.join(tmp_path, "in.xlsx"), 10)
+        cache.put("a", source)
+        cache.max_size = 5
+        with patch("usdm3_excel.cache.export_cache.os.remove") as remove:
+            remove.side_effect = FileNotFoundError()
+            cache._evict()
+        with patch("usdm3_excel.cache.export_cache.os.scandir") as scandir:
+            entry = MagicMock()
+            entry.name = "x.xlsx"
+            entry.stat.side_effect = FileNotFoundError()
+            scandir.return_value.__enter__.return_value = [entry]
+            assert cache.size() == 0
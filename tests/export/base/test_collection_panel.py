@@ -0,0 +1,40 @@
+from unittest.mock import MagicMock, patch
+
+from usdm3_excel.export.base.collection_panel import CollectionPanel
+from usdm3_excel.export.base.study_index import StudyIndex
+from usdm4_excel.export.base.ct_version import CTVersion
+
+
+class TestCollectionPanel:
+    """Tests for the CollectionPanel class."""
+
+    def test_init(self):
+        """Test initialization of CollectionPanel."""
+        ct_version = CTVersion()
+        mock_index = MagicMock(spec=StudyIndex)
+        panel = CollectionPanel(ct_version, mock_index)
+        assert panel.ct_version is ct_version
+        assert panel.index is mock_index
+        assert CollectionPanel(ct_version).index is None
+
+    def test_study_index_supplied(self):
+        """Test that a supplied index is used rather than building one."""
+        mock_index = MagicMock(spec=StudyIndex)
+        panel = CollectionPanel(CTVersion(), mock_index)
+        with patch(
+            "usdm3_excel.export.base.collection_panel.StudyIndex"
+        ) as mock_index_class:
+            assert panel._study_index(MagicMock()) is mock_index
+            mock_index_class.assert_not_called()
+
+    def test_study_index_built_once(self):
+        """Test that an index is built from the study when none is supplied."""
+        panel = CollectionPanel(CTVersion())
+        mock_study = MagicMock()
+        with patch(
+            "usdm3_excel.export.base.collection_panel.StudyIndex"
+        ) as mock_index_class:
+            first = panel._study_index(mock_study)
+            second = panel._study_index(mock_study)
+            mock_index_class.assert_called_once_with(mock_study)
+            assert first is second is mock_index_class.return_value
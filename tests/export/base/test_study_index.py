@@ -0,0 +1,69 @@
+from unittest.mock import MagicMock
+
+from usdm3_excel.export.base.study_index import StudyIndex
+
+
+def _item(id: str) -> MagicMock:
+    item = MagicMock()
+    item.id = id
+    return item
+
+
+class TestStudyIndex:
+    """Tests for the StudyIndex class."""
+
+    def _study(self):
+        mock_study = MagicMock()
+        mock_version = _item("version_1")
+        mock_design = _item("design_1")
+        mock_timeline = _item("timeline_1")
+        mock_doc = MagicMock()
+
+        mock_study.versions = [mock_version]
+        mock_study.documentedBy = [mock_doc]
+        mock_doc.versions = [_item("doc_version_1")]
+        mock_version.organizations = [_item("org_1"), _item("org_2")]
+        mock_version.narrativeContentItems = [_item("nci_1")]
+        mock_version.studyDesigns = [mock_design]
+        mock_design.epochs = [_item("epoch_1")]
+        mock_design.encounters = [_item("encounter_1")]
+        mock_design.scheduleTimelines = [mock_timeline]
+        mock_timeline.instances = [_item("tp_1"), _item("tp_2")]
+        return mock_study
+
+    def test_lookups(self):
+        """Test that each id is found within its owning scope."""
+        study = self._study()
+        index = StudyIndex(study)
+        version = study.versions[0]
+        design = version.studyDesigns[0]
+        timeline = design.scheduleTimelines[0]
+        assert index.timepoint("timeline_1", "tp_2") is timeline.instances[1]
+        assert index.epoch("design_1", "epoch_1") is design.epochs[0]
+        assert index.encounter("design_1", "encounter_1") is design.encounters[0]
+        assert index.organization("version_1", "org_2") is version.organizations[1]
+        assert (
+            index.content_item("version_1", "nci_1") is version.narrativeContentItems[0]
+        )
+        assert (
+            index.document_version("doc_version_1") is study.documentedBy[0].versions[0]
+        )
+
+    def test_lookups_not_found(self):
+        """Test that missing ids and unknown scopes return None."""
+        index = StudyIndex(self._study())
+        assert index.timepoint("timeline_1", "tp_3") is None
+        assert index.timepoint("timeline_2", "tp_1") is None
+        assert index.epoch("design_2", "epoch_1") is None
+        assert index.encounter("design_1", "encounter_2") is None
+        assert index.organization("version_2", "org_1") is None
+        assert index.content_item("version_1", "nci_2") is None
+        assert index.document_version("doc_version_2") is None
+
+    def test_first_occurrence_wins(self):
+        """Test that duplicate ids resolve to the first item, as a linear search would."""
+        study = self._study()
+        first = _item("org_1")
+        study.versions[0].organizations = [first, _item("org_1")]
+        index = StudyIndex(study)
+        assert index.organization("version_1", "org_1") is first
@@ -0,0 +1,80 @@
+import os
+import pickle
+from openpyxl import load_workbook
+
+from usdm3_excel.export.base.table import Table
+from usdm3_excel.export.plan.sheet_plan import SheetPlan
+from usdm3_excel.export.excel_table_writer.streaming_table_writer import (
+    StreamingTableWriter,
+)
+
+
+class TestTable:
+    """Tests for the Table class."""
+
+    def test_init(self):
+        """Test a table starts with its headings and no rows."""
+        table = Table(["a", "b"])
+        assert table.columns == ("a", "b")
+        assert table.rows == []
+        assert len(table) == 1
+        assert list(table) == [("a", "b")]
+
+    def test_append(self):
+        """Test rows are kept as given after the headings."""
+        rows = [(1, 2)]
+        table = Table(["a", "b"], rows)
+        table.append((3, 4))
+        assert table.rows is rows
+        assert len(table) == 3
+        assert list(table) == [("a", "b"), (1, 2), (3, 4)]
+        assert table.to_list() == [["a", "b"], [1, 2], [3, 4]]
+
+    def test_eq(self):
+        """Test a table compares with tables and lists of lists."""
+        table = Table(["a"], [(1,)])
+        assert table == Table(["a"], [(1,)])
+        assert table != Table(["b"], [(1,)])
+        assert table == [["a"], [1]]
+        assert table != [["a"], [2]]
+        assert table != "a"
+
+    def test_pickle(self):
+        """Test a table survives the trip to and from a worker process."""
+        table = Table(["a"], [(1,)])
+        assert pickle.loads(pickle.dumps(table)) == table
+
+    def test_lazy(self):
+        """Test a table of iterated rows is lazy and produced once."""
+        table = Table(["a"], iter([(1,), (2,)]))
+        assert table.lazy
+        assert not Table(["a"]).lazy
+        assert table.to_list() == [["a"], [1], [2]]
+        assert table.to_list() == [["a"]]
+
+    def test_writer(self, tmp_path):
+        """Test writers consume a table like a list of lists."""
+        path = os.path.join(tmp_path, "test.xlsx")
+        writer = StreamingTableWriter(path)
+        last_row = writer.add_table(Table(["a", "b"], [(1, 2)]), "sheet", 2, 3)
+        assert last_row == 3
+        writer.save()
+        assert load_workbook(path)["sheet"]["D3"].value == 2
+
+    def test_plan(self):
+        """Test a plan records the table and lists it out for storage."""
+        plan = SheetPlan()
+        table = Table(["a"], [(1,)])
+        assert plan.add_table(table, "sheet") == 2
+        assert plan.operations[0]["data"] is table
+        assert plan.to_dict()["operations"][0]["data"] == [["a"], [1]]
+        assert plan.operations[0]["data"] is table
+
+    def test_plan_lazy(self):
+        """Test a lazy table has an open last row and is kept when stored."""
+        plan = SheetPlan()
+        table = Table(["a"], iter([(1,)]))
+        assert plan.add_table(table, "sheet", 3) == 0
+        assert plan.to_dict()["operations"][0]["data"] == [["a"], [1]]
+        assert not table.lazy
+        assert table.to_list() == [["a"], [1]]
@@ -0,0 +1,67 @@
+from unittest.mock import MagicMock
+
+from usdm3_excel.export.base.timeline_sheets import TimelineSheets
+
+
+def _timeline(name, main=False):
+    timeline = MagicMock()
+    timeline.name = name
+    timeline.mainTimeline = main
+    return timeline
+
+
+def _design(timelines):
+    design = MagicMock()
+    design.scheduleTimelines = timelines
+    mains = [x for x in timelines if x.mainTimeline]
+    design.main_timeline.return_value = mains[0] if mains else None
+    return design
+
+
+class TestTimelineSheets:
+    """Tests for the TimelineSheets class."""
+
+    def test_main_first(self):
+        """Test the main timeline comes first, written to mainTimeline."""
+        other = _timeline("Adverse Event Timeline")
+        main = _timeline("Main Timeline", True)
+        sheets = TimelineSheets(_design([other, main]))
+        assert sheets.timelines == [main, other]
+        assert sheets.names == ["mainTimeline", "Adverse Event Timeline"]
+        assert len(sheets) == 2
+
+    def test_no_main(self):
+        """Test the mainTimeline sheet is kept when there is no main timeline."""
+        other = _timeline("Other")
+        sheets = TimelineSheets(_design([other]))
+        assert sheets.timelines == [None, other]
+        assert sheets.names == ["mainTimeline", "Other"]
+        sheets = TimelineSheets(_design([]))
+        assert sheets.timelines == [None]
+        assert sheets.names == ["mainTimeline"]
+
+    def test_names(self):
+        """Test names are valid, unique and clear of the other sheets."""
+        names = [
+            "Cycle [1]: days 1/21, 'extended'",
+            "A timeline with a name much longer than Excel allows",
+            "A timeline with a name much longer than Excel allows too",
+            "STUDY",
+            "mainTimeline",
+            "?*",
+            None,
+        ]
+        sheets = TimelineSheets(
+            _design([_timeline("Main", True)] + [_timeline(x) for x in names])
+        )
+        assert sheets.names == [
+            "mainTimeline",
+            "Cycle 1 days 1 21 extended",
+            "A timeline with a name much lon",
+            "A timeline with a name much l 2",
+            "STUDY 2",
+            "mainTimeline 2",
+            "timeline7",
+            "timeline8",
+        ]
+        assert all(len(x) <= TimelineSheets.MAX_LENGTH for x in sheets.names)
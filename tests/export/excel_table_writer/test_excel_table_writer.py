@@ -0,0 +1,96 @@
+import datetime
+import io
+import zipfile
+import openpyxl
+import pytest
+
+from usdm3_excel.export.base.table import Table
+from usdm3_excel.export.excel_table_writer.excel_table_writer import ExcelTableWriter
+from usdm3_excel.export.excel_table_writer.xlsx_archive import XlsxArchive
+
+
+class TestExcelTableWriter:
+    """Tests for the ExcelTableWriter class."""
+
+    def test_path(self, tmp_path):
+        """Test a workbook is written to a path."""
+        path = str(tmp_path / "test.xlsx")
+        etw = ExcelTableWriter(path, default_sheet_name="first")
+        etw.add_table([["a", "b"]], "first")
+        etw.save()
+        assert openpyxl.load_workbook(path)["first"]["B1"].value == "b"
+        etw = ExcelTableWriter(path)
+        assert etw.workbook.sheetnames == ["first"]
+
+    def test_stream(self):
+        """Test a workbook is written to a file object."""
+        buffer = io.BytesIO()
+        etw = ExcelTableWriter(buffer, default_sheet_name="first")
+        assert etw.workbook.sheetnames == ["first"]
+        etw.add_table([["a", "b"]], "first")
+        etw.save()
+        buffer.seek(0)
+        assert openpyxl.load_workbook(buffer)["first"]["A1"].value == "a"
+
+    def test_lazy_table(self):
+        """Test a lazy table is written in full."""
+        etw = ExcelTableWriter(io.BytesIO(), default_sheet_name="first")
+        table = Table(["a"], iter([("b",), ("c",)]))
+        assert etw.add_table(table, "first", 2) == 4
+        assert etw.workbook["first"]["A4"].value == "c"
+
+    def test_template(self):
+        """Test a workbook is started from the template of another."""
+        etw = ExcelTableWriter(None, default_sheet_name="first")
+        etw.add_table([["a", "b"]], "first")
+        template = etw.to_template()
+        buffer = io.BytesIO()
+        etw = ExcelTableWriter(buffer, default_sheet_name="first", template=template)
+        etw.set_column_width("first", [1], 30.0)
+        etw.add_table([["c"]], "second")
+        etw.save()
+        buffer.seek(0)
+        workbook = openpyxl.load_workbook(buffer)
+        assert workbook.sheetnames == ["first", "second"]
+        assert workbook["first"]["B1"].value == "b"
+        assert workbook["first"].column_dimensions["A"].width == 30.0
+
+    @pytest.mark.parametrize("deterministic", [False, True])
+    def test_template_created(self, deterministic):
+        """Test a workbook started from a template is dated when it is created."""
+        etw = ExcelTableWriter(None, default_sheet_name="first")
+        etw.workbook.properties.created = datetime.datetime(2000, 1, 1)
+        template = etw.to_template()
+        start = datetime.datetime.now(tz=datetime.timezone.utc).replace(tzinfo=None)
+        etw = ExcelTableWriter(
+            io.BytesIO(), template=template, deterministic=deterministic
+        )
+        created = etw.workbook.properties.created
+        if deterministic:
+            assert created == XlsxArchive.TIMESTAMP
+        else:
+            assert created >= start.replace(microsecond=0)
+
+    def test_compression(self):
+        """Test the workbook parts are stored with the compression given."""
+        buffer = io.BytesIO()
+        writer = ExcelTableWriter(buffer, compression="store")
+        writer.add_table([["a"]], "Sheet1")
+        writer.save()
+        types = {x.compress_type for x in zipfile.ZipFile(buffer).infolist()}
+        assert types == {zipfile.ZIP_STORED}
+        with pytest.raises(ValueError, match="Unknown compression"):
+            ExcelTableWriter(io.BytesIO(), compression="zip")
+
+    def test_deterministic(self):
+        """Test the same tables always give the same bytes."""
+        results = []
+        for _ in range(2):
+            buffer = io.BytesIO()
+            writer = ExcelTableWriter(buffer, deterministic=True)
+            writer.add_table([["a"]], "Sheet1")
+            writer.save()
+            results.append(buffer.getvalue())
+        assert results[0] == results[1]
+        infos = zipfile.ZipFile(buffer).infolist()
+        assert {x.date_time for x in infos} == {(1980, 1, 1, 0, 0, 0)}
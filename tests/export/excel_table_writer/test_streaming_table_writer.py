@@ -0,0 +1,219 @@
+import io
+import os
+import zipfile
+import pytest
+from openpyxl import load_workbook
+
+from usdm3_excel.export.base.table import Table
+from usdm3_excel.export.excel_table_writer.streaming_table_writer import (
+    StreamingTableWriter,
+)
+
+
+class TestStreamingTableWriter:
+    """Tests for the StreamingTableWriter class."""
+
+    def _load(self, path):
+        return load_workbook(path)
+
+    def test_init(self, tmp_path):
+        """Test the default sheet is created first."""
+        path = os.path.join(tmp_path, "test.xlsx")
+        writer = StreamingTableWriter(path, default_sheet_name="study")
+        writer.add_table([["a"]], "other")
+        writer.add_table([["b"]], "study")
+        writer.save()
+        workbook = self._load(path)
+        assert workbook.sheetnames == ["study", "other"]
+        assert workbook["study"]["A1"].value == "b"
+
+    def test_add_table(self, tmp_path):
+        """Test tables are positioned and the last row returned."""
+        path = os.path.join(tmp_path, "test.xlsx")
+        writer = StreamingTableWriter(path)
+        assert writer.add_table([["a", "b"], ["c", None]], "Sheet1") == 2
+        assert writer.add_table([["x"], ["y"], ["z"]], "Sheet1", 4, 3) == 6
+        assert writer.add_table([], "Sheet1", 8) == 7
+        writer.save()
+        worksheet = self._load(path)["Sheet1"]
+        assert [[c.value for c in row] for row in worksheet.iter_rows()] == [
+            ["a", "b", None],
+            ["c", None, None],
+            [None, None, None],
+            [None, None, "x"],
+            [None, None, "y"],
+            [None, None, "z"],
+        ]
+
+    def test_revisit_sheet(self, tmp_path):
+        """Test a sheet can be written again after another sheet was used."""
+        path = os.path.join(tmp_path, "test.xlsx")
+        writer = StreamingTableWriter(path)
+        writer.add_table([["a", "b", "c"]], "first")
+        writer.format_cells("first", (1, 1, 1, 3), font_style="bold")
+        writer.add_table([["x"]], "second")
+        writer.add_table([["d"], ["e"]], "first")
+        writer.set_column_width("first", 1, 30.0)
+        writer.save()
+        workbook = self._load(path)
+        assert workbook.sheetnames == ["Sheet1", "first", "second"]
+        worksheet = workbook["first"]
+        assert [[c.value for c in row] for row in worksheet.iter_rows()] == [
+            ["d", "b", "c"],
+            ["e", None, None],
+        ]
+        assert worksheet["C1"].font.b
+        assert worksheet.column_dimensions["A"].width == 30.0
+
+    def test_format_cells(self, tmp_path):
+        """Test formatting matches the options of ExcelTableWriter."""
+        path = os.path.join(tmp_path, "test.xlsx")
+        writer = StreamingTableWriter(path)
+        writer.add_table([["a", "b"], ["c", "d"]], "Sheet1")
+        writer.format_cells(
+            "Sheet1",
+            (1, 1, 1, 2),
+            font_style="Bold Italic",
+            font_size=14,
+            background_color="D9D9D9",
+        )
+        writer.format_cells(
+            "Sheet1",
+            "A2:B2",
+            vertical_alignment="Top",
+            horizontal_alignment="Right",
+            wrap_text=True,
+        )
+        writer.format_cells(
+            "Sheet1", (2, 2, 2, 2), vertical_alignment="middle", font_style="italic"
+        )
+        writer.format_cells("Sheet1", (3, 1, 3, 1), horizontal_alignment="justify")
+        writer.save()
+        worksheet = self._load(path)["Sheet1"]
+        assert worksheet["A1"].font.b and worksheet["A1"].font.i
+        assert worksheet["B1"].font.sz == 14
+        assert worksheet["B1"].fill.fill_type == "solid"
+        assert worksheet["B1"].fill.start_color.rgb == "00D9D9D9"
+        assert worksheet["A2"].alignment.vertical == "top"
+        assert worksheet["A2"].alignment.horizontal == "right"
+        assert worksheet["A2"].alignment.wrap_text
+        assert worksheet["B2"].alignment.vertical == "top"
+        assert worksheet["B2"].font.i and not worksheet["B2"].font.b
+        assert not worksheet["A2"].font.i
+        assert worksheet["A3"].value is None
+        assert worksheet["A3"].alignment.horizontal == "justify"
+
+    def test_format_cells_zero_bounds(self, tmp_path):
+        """Test zero bounds cover the sheet extent as openpyxl does."""
+        path = os.path.join(tmp_path, "test.xlsx")
+        writer = StreamingTableWriter(path)
+        last_row = writer.add_table([], "empty")
+        writer.format_cells("empty", (1, 1, last_row, 1), font_style="bold")
+        writer.add_table([["a", "b"], ["c", "d"]], "full")
+        writer.format_cells("full", (0, 0, 0, 0), font_style="bold")
+        writer.save()
+        workbook = self._load(path)
+        assert workbook["empty"]["A1"].font.b
+        assert workbook["full"]["B2"].font.b
+
+    def test_format_cells_invalid_range(self, tmp_path):
+        """Test an invalid range is rejected."""
+        writer = StreamingTableWriter(os.path.join(tmp_path, "test.xlsx"))
+        with pytest.raises(ValueError):
+            writer.format_cells("Sheet1", (1, 2, 3), font_style="bold")
+
+    def test_set_column_width(self, tmp_path):
+        """Test column widths using indexes and letters."""
+        path = os.path.join(tmp_path, "test.xlsx")
+        writer = StreamingTableWriter(path)
+        writer.set_column_width("Sheet1", [1, "C"], 20.0)
+        writer.set_column_width("Sheet1", 2, 40.0)
+        writer.save()
+        worksheet = self._load(path)["Sheet1"]
+        assert worksheet.column_dimensions["A"].width == 20.0
+        assert worksheet.column_dimensions["B"].width == 40.0
+        assert worksheet.column_dimensions["C"].width == 20.0
+
+    def test_set_column_width_invalid(self, tmp_path):
+        """Test invalid columns are rejected."""
+        writer = StreamingTableWriter(os.path.join(tmp_path, "test.xlsx"))
+        with pytest.raises(ValueError, match="Invalid column letter"):
+            writer.set_column_width("Sheet1", "1A", 20.0)
+        with pytest.raises(ValueError, match="must be positive"):
+            writer.set_column_width("Sheet1", 0, 20.0)
+        with pytest.raises(ValueError, match="Invalid column format"):
+            writer.set_column_width("Sheet1", 1.5, 20.0)
+
+    def test_save_output_path(self, tmp_path):
+        """Test saving to an alternative path and closing."""
+        path = os.path.join(tmp_path, "test.xlsx")
+        other = os.path.join(tmp_path, "other.xlsx")
+        writer = StreamingTableWriter(path)
+        writer.add_table([["a"]], "Sheet1")
+        writer.save(other)
+        writer.close()
+        assert os.path.exists(other)
+        assert not os.path.exists(path)
+
+    def test_lazy_table(self, tmp_path):
+        """Test lazy rows are streamed to file and merged with the sheet on save."""
+        path = os.path.join(tmp_path, "test.xlsx")
+        writer = StreamingTableWriter(path)
+        writer.add_table([["h1", "h2", "h3"]], "Sheet1")
+        writer.add_table([["old"], ["old"]], "Sheet1", 2, 2)
+        rows = iter([("a", "b"), (), ("c",)])
+        last_row = writer.add_table(Table(["x", "y"], rows), "Sheet1", 2, 1)
+        assert last_row == 5
+        assert writer._buffers["Sheet1"]["cells"].keys() == {
+            (1, 1),
+            (1, 2),
+            (1, 3),
+            (2, 2),
+            (3, 2),
+        }
+        writer.add_table([["new"]], "Sheet1", 3, 2)
+        writer.format_cells("Sheet1", (2, 1, 0, 1), font_style="bold")
+        writer.add_table(Table(["z"], iter([])), "other")
+        writer.save()
+        workbook = self._load(path)
+        worksheet = workbook["Sheet1"]
+        assert [[c.value for c in row] for row in worksheet.iter_rows()] == [
+            ["h1", "h2", "h3"],
+            ["x", "y", None],
+            ["a", "new", None],
+            [None, None, None],
+            ["c", None, None],
+        ]
+        assert [worksheet.cell(row, 1).font.b for row in range(1, 6)] == [
+            False,
+            True,
+            True,
+            True,
+            True,
+        ]
+        assert workbook["other"]["A1"].value == "z"
+        assert writer._streams == {}
+
+    def test_compression(self):
+        """Test the workbook parts are stored with the compression given."""
+        buffer = io.BytesIO()
+        writer = StreamingTableWriter(buffer, compression="store")
+        writer.add_table([["a"]], "Sheet1")
+        writer.save()
+        types = {x.compress_type for x in zipfile.ZipFile(buffer).infolist()}
+        assert types == {zipfile.ZIP_STORED}
+        with pytest.raises(ValueError, match="Unknown compression"):
+            StreamingTableWriter(io.BytesIO(), compression="zip")
+
+    def test_deterministic(self):
+        """Test the same tables always give the same bytes."""
+        results = []
+        for _ in range(2):
+            buffer = io.BytesIO()
+            writer = StreamingTableWriter(buffer, deterministic=True)
+            writer.add_table([["a"]], "Sheet1")
+            writer.save()
+            results.append(buffer.getvalue())
+        assert results[0] == results[1]
+        infos = zipfile.ZipFile(buffer).infolist()
+        assert {x.date_time for x in infos} == {(1980, 1, 1, 0, 0, 0)}
@@ -0,0 +1,91 @@
+import io
+import zipfile
+import pytest
+from openpyxl import Workbook, load_workbook
+from zipfile import ZipInfo
+
+from usdm3_excel.export.excel_table_writer.xlsx_archive import (
+    DeterministicZipFile,
+    XlsxArchive,
+)
+
+
+class TestXlsxArchive:
+    """Tests for the XlsxArchive class."""
+
+    def _write(self, compression):
+        buffer = io.BytesIO()
+        with XlsxArchive.open(buffer, compression) as archive:
+            archive.writestr("part.xml", "<a>" + "text " * 1000 + "</a>")
+        buffer.seek(0)
+        return zipfile.ZipFile(buffer).infolist()[0]
+
+    def test_open(self):
+        """Test each setting gives the compression method and level."""
+        assert self._write("store").compress_type == zipfile.ZIP_STORED
+        assert self._write(None).compress_type == zipfile.ZIP_DEFLATED
+        fast = self._write("fast")
+        best = self._write("max")
+        assert fast.compress_type == best.compress_type == zipfile.ZIP_DEFLATED
+        assert best.compress_size <= fast.compress_size
+        assert self._write("store").compress_size > fast.compress_size
+
+    def test_check(self):
+        """Test an unknown setting is rejected."""
+        XlsxArchive.check(None)
+        XlsxArchive.check("max")
+        with pytest.raises(ValueError, match="Unknown compression 'zip'"):
+            XlsxArchive.check("zip")
+        with pytest.raises(ValueError):
+            XlsxArchive.open(io.BytesIO(), "zip")
+
+    def test_save_workbook(self):
+        """Test workbooks are saved as by openpyxl, with the compression."""
+        buffer = io.BytesIO()
+        workbook = Workbook()
+        workbook.active["A1"] = "a"
+        XlsxArchive.save_workbook(workbook, buffer, "store")
+        buffer.seek(0)
+        assert load_workbook(buffer).active["A1"].value == "a"
+        types = {x.compress_type for x in zipfile.ZipFile(buffer).infolist()}
+        assert types == {zipfile.ZIP_STORED}
+
+    def test_save_empty_write_only(self):
+        """Test a write-only workbook without sheets is given one."""
+        buffer = io.BytesIO()
+        XlsxArchive.save_workbook(Workbook(write_only=True), buffer)
+        buffer.seek(0)
+        assert len(load_workbook(buffer).sheetnames) == 1
+
+    def test_deterministic(self, tmp_path):
+        """Test every part written is dated at the fixed timestamp."""
+        source = tmp_path / "part.xml"
+        source.write_text("<c/>")
+        buffer = io.BytesIO()
+        with XlsxArchive.open(buffer, "max", deterministic=True) as archive:
+            assert isinstance(archive, DeterministicZipFile)
+            archive.writestr("a.xml", "<a/>")
+            with archive.open("b.xml", "w") as part:
+                part.write(b"<b/>")
+            archive.write(str(source), "c.xml")
+            archive.write(str(source))
+            archive.writestr(ZipInfo("d.xml", (2020, 1, 1, 0, 0, 0)), "<d/>")
+        buffer.seek(0)
+        with zipfile.ZipFile(buffer) as archive:
+            infos = archive.infolist()
+            assert archive.read("c.xml") == b"<c/>"
+        assert [x.date_time for x in infos[:4]] == [(1980, 1, 1, 0, 0, 0)] * 4
+        assert {x.compress_type for x in infos[:4]} == {zipfile.ZIP_DEFLATED}
+        assert infos[4].date_time == (2020, 1, 1, 0, 0, 0)
+
+    def test_save_workbook_deterministic(self):
+        """Test the document properties are dated at the fixed timestamp."""
+        results = []
+        for _ in range(2):
+            buffer = io.BytesIO()
+            workbook = Workbook()
+            XlsxArchive.save_workbook(workbook, buffer, deterministic=True)
+            results.append(buffer.getvalue())
+        assert workbook.properties.created == XlsxArchive.TIMESTAMP
+        assert workbook.properties.modified == XlsxArchive.TIMESTAMP
+        assert results[0] == results[1]
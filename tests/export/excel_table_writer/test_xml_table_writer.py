@@ -0,0 +1,191 @@
+import io
+import os
+import zipfile
+import pytest
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import IllegalCharacterError
+
+from usdm3_excel.export.base.table import Table
+from usdm3_excel.export.excel_table_writer.xml_table_writer import XmlTableWriter
+
+
+class TestXmlTableWriter:
+    """Tests for the XmlTableWriter class."""
+
+    def _load(self, path):
+        return load_workbook(path)
+
+    def _values(self, worksheet):
+        return [[c.value for c in row] for row in worksheet.iter_rows()]
+
+    def test_save(self, tmp_path):
+        """Test sheets are written in order with their tables."""
+        path = os.path.join(tmp_path, "test.xlsx")
+        writer = XmlTableWriter(path, default_sheet_name="study")
+        writer.add_table([["a", "b"], ["c", None]], "other")
+        writer.add_table([["x"]], "study", 2, 2)
+        writer.add_table([["d"]], "other", 3)
+        writer.save()
+        workbook = self._load(path)
+        assert workbook.sheetnames == ["study", "other"]
+        assert self._values(workbook["study"]) == [[None, None], [None, "x"]]
+        assert self._values(workbook["other"]) == [
+            ["a", "b"],
+            ["c", None],
+            ["d", None],
+        ]
+
+    def test_values(self, tmp_path):
+        """Test the cell types written and strings shared between sheets."""
+        path = os.path.join(tmp_path, "test.xlsx")
+        writer = XmlTableWriter(path)
+        long = "x" * 40000
+        writer.add_table(
+            [[1, 2.5, True, False], ["", " a ", "<b>&", long], ["a", None, "a", 0]],
+            "Sheet1",
+        )
+        writer.add_table([["a"]], "second")
+        writer.save()
+        worksheet = self._load(path)["Sheet1"]
+        assert self._values(worksheet) == [
+            [1, 2.5, True, False],
+            [None, " a ", "<b>&", "x" * 32767],
+            ["a", None, "a", 0],
+        ]
+        with zipfile.ZipFile(path) as archive:
+            strings = archive.read("xl/sharedStrings.xml").decode()
+        assert 'uniqueCount="4"' in strings
+        assert '<t xml:space="preserve"> a </t>' in strings
+
+    def test_illegal_character(self, tmp_path):
+        """Test control characters are rejected as by openpyxl."""
+        writer = XmlTableWriter(os.path.join(tmp_path, "test.xlsx"))
+        writer.add_table([["a\x01"]], "Sheet1")
+        with pytest.raises(IllegalCharacterError):
+            writer.save()
+
+    def test_format_cells(self, tmp_path):
+        """Test formats are written as cell styles."""
+        path = os.path.join(tmp_path, "test.xlsx")
+        writer = XmlTableWriter(path)
+        writer.add_table([["a", "b"], ["c", "d"]], "Sheet1")
+        writer.format_cells(
+            "Sheet1",
+            (1, 1, 1, 2),
+            font_style="Bold Italic",
+            font_size=14,
+            background_color="D9D9D9",
+        )
+        writer.format_cells(
+            "Sheet1",
+            "A2:B2",
+            vertical_alignment="Top",
+            horizontal_alignment="Right",
+            wrap_text=True,
+        )
+        writer.format_cells("Sheet1", (2, 2, 2, 2), font_style="italic")
+        writer.format_cells("Sheet1", (3, 1, 3, 1), wrap_text=False)
+        writer.add_table([["e"]], "other")
+        writer.format_cells("other", (1, 1, 1, 1), font_style="bold")
+        writer.save()
+        workbook = self._load(path)
+        worksheet = workbook["Sheet1"]
+        assert worksheet["A1"].font.b and worksheet["A1"].font.i
+        assert worksheet["B1"].font.sz == 14
+        assert worksheet["B1"].fill.fill_type == "solid"
+        assert worksheet["B1"].fill.start_color.rgb == "00D9D9D9"
+        assert worksheet["A2"].alignment.vertical == "top"
+        assert worksheet["A2"].alignment.horizontal == "right"
+        assert worksheet["A2"].alignment.wrap_text
+        assert not worksheet["A2"].font.b
+        assert worksheet["B2"].font.i and not worksheet["B2"].font.b
+        assert worksheet["B2"].alignment.wrap_text
+        assert worksheet["A3"].value is None
+        assert worksheet["A3"].alignment.wrap_text is False
+        assert workbook["other"]["A1"].font.b
+
+    def test_set_column_width(self, tmp_path):
+        """Test column widths are written in column order."""
+        path = os.path.join(tmp_path, "test.xlsx")
+        writer = XmlTableWriter(path)
+        writer.set_column_width("Sheet1", ["C", 1], 20.0)
+        writer.set_column_width("Sheet1", 2, 40.5)
+        writer.save()
+        worksheet = self._load(path)["Sheet1"]
+        assert worksheet.column_dimensions["A"].width == 20.0
+        assert worksheet.column_dimensions["B"].width == 40.5
+        assert worksheet.column_dimensions["C"].width == 20.0
+
+    def test_lazy_table(self, tmp_path):
+        """Test lazy rows are merged with the sheet on save."""
+        path = os.path.join(tmp_path, "test.xlsx")
+        writer = XmlTableWriter(path)
+        writer.BATCH = 2
+        writer.add_table([["h1", "h2"]], "Sheet1")
+        rows = iter([("a", "b"), (), ("c",)])
+        assert writer.add_table(Table(["x", "y"], rows), "Sheet1", 2) == 5
+        writer.add_table([["new"]], "Sheet1", 3, 2)
+        writer.save()
+        assert self._values(self._load(path)["Sheet1"]) == [
+            ["h1", "h2"],
+            ["x", "y"],
+            ["a", "new"],
+            [None, None],
+            ["c", None],
+        ]
+        assert writer._streams == {}
+
+    def test_stream(self):
+        """Test a workbook is written to a file object."""
+        buffer = io.BytesIO()
+        writer = XmlTableWriter(buffer, default_sheet_name="first")
+        writer.add_table([["a"]], "first")
+        writer.save()
+        buffer.seek(0)
+        assert self._load(buffer)["first"]["A1"].value == "a"
+
+    def test_save_output_path(self, tmp_path):
+        """Test saving to an alternative path."""
+        path = os.path.join(tmp_path, "test.xlsx")
+        other = os.path.join(tmp_path, "other.xlsx")
+        writer = XmlTableWriter(path)
+        writer.add_table([["a"]], "Sheet1")
+        writer.save(other)
+        assert os.path.exists(other)
+        assert not os.path.exists(path)
+
+    def test_close(self, tmp_path):
+        """Test closing discards spilled sheets and lazy rows."""
+        writer = XmlTableWriter(os.path.join(tmp_path, "test.xlsx"))
+        writer.add_table(Table(["a"], iter([("b",)])), "Sheet1")
+        writer.add_table([["c"]], "other")
+        writer.add_table([["d"]], "Sheet1")
+        spill = writer._spills["other"]
+        stream = writer._streams["Sheet1"][0][4]
+        writer.close()
+        assert spill.closed and stream.closed
+        assert writer._spills == {} and writer._streams == {}
+
+    def test_compression(self):
+        """Test the workbook parts are stored with the compression given."""
+        buffer = io.BytesIO()
+        writer = XmlTableWriter(buffer, compression="store")
+        writer.add_table([["a"]], "Sheet1")
+        writer.save()
+        types = {x.compress_type for x in zipfile.ZipFile(buffer).infolist()}
+        assert types == {zipfile.ZIP_STORED}
+        with pytest.raises(ValueError, match="Unknown compression"):
+            XmlTableWriter(io.BytesIO(), compression="zip")
+
+    def test_deterministic(self):
+        """Test the same tables always give the same bytes."""
+        results = []
+        for _ in range(2):
+            buffer = io.BytesIO()
+            writer = XmlTableWriter(buffer, deterministic=True)
+            writer.add_table([["a"]], "Sheet1")
+            writer.save()
+            results.append(buffer.getvalue())
+        assert results[0] == results[1]
+        infos = zipfile.ZipFile(buffer).infolist()
+        assert {x.date_time for x in infos} == {(1980, 1, 1, 0, 0, 0)}
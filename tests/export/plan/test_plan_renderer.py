@@ -0,0 +1,91 @@
+import io
+from unittest.mock import MagicMock, call, patch
+
+import openpyxl
+
+from usdm3_excel.export.plan.plan_renderer import PlanRenderer
+from usdm3_excel.export.plan.sheet_plan import SheetPlan
+from usdm3_excel.export.plan.workbook_plan import WorkbookPlan
+from usdm4_excel.export.excel_table_writer.excel_table_writer import ExcelTableWriter
+from usdm3_excel.export.excel_table_writer.excel_table_writer import (
+    ExcelTableWriter as LocalExcelTableWriter,
+)
+
+
+class TestPlanRenderer:
+    """Tests for the PlanRenderer class."""
+
+    def test_render(self):
+        """Test sheet plans are written in order and the workbook saved."""
+        first = SheetPlan()
+        first.add_table([["a"]], "first", 3, 2)
+        first.format_cells("first", (3, 2, 3, 2), font_style="bold")
+        second = SheetPlan()
+        second.set_column_width("second", [1, 2], 20.0)
+        mock_etw = MagicMock(spec=ExcelTableWriter)
+        mock_writer = MagicMock(return_value=mock_etw)
+        PlanRenderer(mock_writer).render(WorkbookPlan([first, second]), "x.xlsx")
+        mock_writer.assert_called_once_with("x.xlsx", default_sheet_name="study")
+        assert mock_etw.mock_calls == [
+            call.add_table([["a"]], "first", 3, 2),
+            call.format_cells("first", (3, 2, 3, 2), font_style="bold"),
+            call.set_column_width("second", [1, 2], 20.0),
+            call.save(),
+        ]
+
+    def test_default_sheet_name(self):
+        """Test the default sheet name can be set."""
+        mock_writer = MagicMock()
+        PlanRenderer(mock_writer, "other").render(WorkbookPlan(), "x.xlsx")
+        mock_writer.assert_called_once_with("x.xlsx", default_sheet_name="other")
+
+    def test_template(self, monkeypatch):
+        """Test the static sheets are rendered once into a template."""
+        monkeypatch.setattr(PlanRenderer, "_templates", {})
+        static = SheetPlan(name=PlanRenderer.STATIC)
+        static.add_table([["a"]], "static")
+        other = SheetPlan()
+        other.add_table([["b"]], "other")
+        renderer = PlanRenderer(LocalExcelTableWriter)
+        for _ in range(2):
+            buffer = io.BytesIO()
+            with patch.object(
+                renderer, "render_sheet", wraps=renderer.render_sheet
+            ) as mock_render:
+                renderer.render(WorkbookPlan([static, other]), buffer)
+            buffer.seek(0)
+            workbook = openpyxl.load_workbook(buffer)
+            assert workbook.sheetnames == ["study", "static", "other"]
+            assert workbook["static"]["A1"].value == "a"
+            assert workbook["other"]["A1"].value == "b"
+        assert len(PlanRenderer._templates) == 1
+        assert [x.args[0] for x in mock_render.call_args_list] == [other]
+
+    def test_template_skipped(self, monkeypatch, tmp_path):
+        """Test no template is used where one cannot be."""
+        monkeypatch.setattr(PlanRenderer, "_templates", {})
+        static = SheetPlan(name=PlanRenderer.STATIC)
+        plan = WorkbookPlan([static])
+        assert PlanRenderer(ExcelTableWriter)._template(plan.sheets, None) is None
+        path = tmp_path / "x.xlsx"
+        path.write_bytes(b"")
+        renderer = PlanRenderer(LocalExcelTableWriter)
+        assert renderer._template(plan.sheets, str(path)) is None
+        assert renderer._template([], None) is None
+        assert PlanRenderer._templates == {}
+
+    def test_compression(self):
+        """Test the compression is passed to the writer."""
+        mock_writer = MagicMock()
+        PlanRenderer(mock_writer, compression="fast").render(WorkbookPlan(), "x.xlsx")
+        mock_writer.assert_called_once_with(
+            "x.xlsx", default_sheet_name="study", compression="fast"
+        )
+
+    def test_deterministic(self):
+        """Test a deterministic workbook is asked of the writer."""
+        mock_writer = MagicMock()
+        PlanRenderer(mock_writer, deterministic=True).render(WorkbookPlan(), "x.xlsx")
+        mock_writer.assert_called_once_with(
+            "x.xlsx", default_sheet_name="study", deterministic=True
+        )
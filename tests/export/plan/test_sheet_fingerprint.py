@@ -0,0 +1,110 @@
+import json
+from unittest.mock import patch
+
+from usdm4 import USDM4
+from usdm4_excel.export.study_arms_sheet.study_arms_sheet import StudyArmsSheet
+from usdm4_excel.export.configuration_sheet.configuration_sheet import (
+    ConfigurationSheet,
+)
+from usdm3_excel.export.plan.sheet_fingerprint import SheetFingerprint
+from usdm3_excel.export.study_sheet.study_sheet import StudySheet
+from usdm3_excel.export.study_design_sheet.study_design_sheet import (
+    StudyDesignSheet,
+)
+from usdm3_excel.export.study_timing_sheet.study_timing_sheet import StudyTimingSheet
+from usdm3_excel.export.study_timeline_sheet.study_timeline_sheet import (
+    StudyTimelineSheet,
+)
+from simple_error_log import Errors
+
+
+def _study(tmp_path, change=None):
+    with open("tests/test_files/usdm_1.json") as f:
+        data = json.load(f)
+    if change:
+        change(data["study"])
+    path = tmp_path / "usdm.json"
+    with open(path, "w") as f:
+        json.dump(data, f)
+    return USDM4().load(str(path), Errors()).study
+
+
+def _values(study) -> dict:
+    fingerprint = SheetFingerprint(study)
+    return {x: fingerprint.value(x) for x in SheetFingerprint.SOURCES}
+
+
+class TestSheetFingerprint:
+    """Tests for the SheetFingerprint class."""
+
+    def test_value(self, tmp_path):
+        """Test values are stable and distinct per sheet."""
+        values = _values(_study(tmp_path))
+        assert values == _values(_study(tmp_path))
+        assert len(set(values.values())) == len(values)
+        assert all(len(x) == 64 for x in values.values())
+
+    def test_timing_change(self, tmp_path):
+        """Test a timing change only affects the sheets reading timelines."""
+
+        def change(study):
+            timing = study["versions"][0]["studyDesigns"][0]["scheduleTimelines"][0]
+            timing["timings"][0]["label"] = "Changed"
+
+        before = _values(_study(tmp_path))
+        after = _values(_study(tmp_path, change))
+        changed = [x.__name__ for x in before if before[x] != after[x]]
+        assert sorted(changed) == [
+            "StudyEncountersSheet",
+            "StudyTimelineSheet",
+            "StudyTimingSheet",
+        ]
+
+    def test_timeline_name_change(self, tmp_path):
+        """Test a timeline name also affects the design sheet listing it."""
+
+        def change(study):
+            timeline = study["versions"][0]["studyDesigns"][0]["scheduleTimelines"][1]
+            timeline["name"] = "Changed"
+
+        before = _values(_study(tmp_path))
+        after = _values(_study(tmp_path, change))
+        changed = [x for x in before if before[x] != after[x]]
+        assert StudyDesignSheet in changed
+        assert StudyTimelineSheet in changed
+
+    def test_name_change(self, tmp_path):
+        """Test a study level change only affects the study sheet."""
+
+        def change(study):
+            study["name"] = "Changed"
+
+        before = _values(_study(tmp_path))
+        after = _values(_study(tmp_path, change))
+        assert [x for x in before if before[x] != after[x]] == [StudySheet]
+
+    def test_unlisted_sheet(self, tmp_path):
+        """Test sheets without sources depend on the whole study."""
+
+        def change(study):
+            study["versions"][0]["notes"] = []
+            study["description"] = "Changed"
+
+        before = SheetFingerprint(_study(tmp_path)).value(ConfigurationSheet)
+        after = SheetFingerprint(_study(tmp_path, change)).value(ConfigurationSheet)
+        assert before != after
+
+    def test_release_change(self, tmp_path):
+        """Test values change with the package release."""
+        study = _study(tmp_path)
+        before = SheetFingerprint(study).value(StudyArmsSheet)
+        with patch("usdm3_excel.export.plan.sheet_fingerprint.metadata.version") as v:
+            v.return_value = "99.0.0"
+            assert SheetFingerprint(study).value(StudyArmsSheet) != before
+
+    def test_taken_per_sheet(self, tmp_path):
+        """Test the timing and timeline sheets are fingerprinted separately."""
+        fingerprint = SheetFingerprint(_study(tmp_path))
+        assert fingerprint.value(StudyTimingSheet) != fingerprint.value(
+            StudyTimelineSheet
+        )
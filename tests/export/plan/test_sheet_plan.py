@@ -0,0 +1,56 @@
+import json
+
+from usdm3_excel.export.plan.sheet_plan import SheetPlan
+
+
+class TestSheetPlan:
+    """Tests for the SheetPlan class."""
+
+    def test_add_table(self):
+        """Test add_table records the table and returns the last row."""
+        plan = SheetPlan()
+        assert plan.add_table([["a"], ["b"]], "sheet") == 2
+        assert plan.add_table([["a"], ["b"], ["c"]], "sheet", 9, 2) == 11
+        assert plan.add_table([], "sheet") == 0
+        assert plan.operations[1] == {
+            "type": "table",
+            "sheet": "sheet",
+            "row": 9,
+            "col": 2,
+            "data": [["a"], ["b"], ["c"]],
+        }
+
+    def test_format_cells(self):
+        """Test format_cells records the range and style."""
+        plan = SheetPlan()
+        plan.format_cells("sheet", (1, 1, 2, 2), font_style="bold", wrap_text=True)
+        assert plan.operations == [
+            {
+                "type": "format",
+                "sheet": "sheet",
+                "range": (1, 1, 2, 2),
+                "style": {"font_style": "bold", "wrap_text": True},
+            }
+        ]
+
+    def test_set_column_width(self):
+        """Test set_column_width records the columns and width."""
+        plan = SheetPlan()
+        plan.set_column_width("sheet", [1, 2], 20.0)
+        assert plan.operations == [
+            {"type": "width", "sheet": "sheet", "columns": [1, 2], "width": 20.0}
+        ]
+
+    def test_round_trip(self):
+        """Test a plan survives conversion to and from JSON."""
+        plan = SheetPlan(ct_versions={"A": "1"}, name="Sheet", fingerprint="abc")
+        plan.add_table([["a", 1, True, None]], "sheet")
+        plan.format_cells("sheet", (1, 1, 1, 4), font_style="bold")
+        plan.format_cells("sheet", "A1:B2", wrap_text=True)
+        plan.set_column_width("sheet", 2, 40.0)
+        result = SheetPlan.from_dict(json.loads(json.dumps(plan.to_dict())))
+        assert result.operations == plan.operations
+        assert result.ct_versions == {"A": "1"}
+        assert result.name == "Sheet"
+        assert result.fingerprint == "abc"
+        assert isinstance(result.operations[1]["range"], tuple)
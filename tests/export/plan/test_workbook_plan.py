@@ -0,0 +1,31 @@
+import pytest
+
+from usdm3_excel.export.plan.sheet_plan import SheetPlan
+from usdm3_excel.export.plan.workbook_plan import WorkbookPlan
+
+
+class TestWorkbookPlan:
+    """Tests for the WorkbookPlan class."""
+
+    def test_empty(self):
+        """Test an empty plan."""
+        assert WorkbookPlan().sheets == []
+        assert WorkbookPlan().to_dict() == {"version": 1, "sheets": []}
+
+    def test_round_trip(self):
+        """Test sheet plans keep their order through JSON."""
+        first = SheetPlan()
+        first.add_table([["a"]], "first")
+        second = SheetPlan(ct_versions={"A": "1"})
+        second.format_cells("second", (1, 1, 1, 1), font_style="bold")
+        result = WorkbookPlan.from_json(WorkbookPlan([first, second]).to_json())
+        assert [x.operations for x in result.sheets] == [
+            first.operations,
+            second.operations,
+        ]
+        assert result.sheets[1].ct_versions == {"A": "1"}
+
+    def test_unknown_version(self):
+        """Test a plan from an incompatible version is rejected."""
+        with pytest.raises(ValueError, match="Unsupported plan version '2'"):
+            WorkbookPlan.from_dict({"version": 2, "sheets": []})
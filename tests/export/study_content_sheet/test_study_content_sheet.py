@@ -59,10 +59,10 @@ class TestStudyContentSheet:
             sheet.save(mock_study)
 
             # Verify that the ContentPanel was created with the correct CTVersion
-            mock_content_panel_class.assert_called_once_with(ct_version)
+            mock_content_panel_class.assert_called_once_with(ct_version, None)
 
             # Verify that the ContentPanel's execute method was called with the mock Study
-            mock_content_panel.execute.assert_called_once_with(mock_study)
+            mock_content_panel.execute.assert_called_once_with(mock_study, False)
 
             # Verify that the ExcelTableWriter's add_table method was called with the result from the ContentPanel
             mock_etw.add_table.assert_called_once_with(
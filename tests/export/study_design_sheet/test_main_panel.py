@@ -1,4 +1,6 @@
 from unittest.mock import MagicMock, patch
+from simple_error_log import Errors
+from usdm4 import USDM4
 
 from usdm3_excel.export.study_design_sheet.main_panel import MainPanel
 from usdm4_excel.export.base.ct_version import CTVersion
@@ -47,6 +49,8 @@ class TestMainPanel:
         # Configure the mock objects
         mock_study.versions = [mock_version]
         mock_version.studyDesigns = [mock_design]
+        mock_design.scheduleTimelines = []
+        mock_design.main_timeline.return_value = None
 
         mock_design.name = "Test Design"
         mock_design.description = "Test Description"
@@ -173,3 +177,13 @@ class TestMainPanel:
 
         # Verify the result
         assert result == ""
+
+    def test_execute_timelines(self):
+        """Test the timeline sheets are listed."""
+        study = USDM4().load("tests/test_files/usdm_1.json", Errors()).study
+        result = dict((x[0], x[1]) for x in MainPanel(CTVersion()).execute(study))
+        assert result["mainTimeline"] == "mainTimeline"
+        assert result["otherTimelines"] == (
+            "Adverse Event Timeline, Early Termination Timeline, PKPD Timeline, "
+            "Unscheduled Timeline"
+        )
@@ -4,6 +4,7 @@ from usdm3_excel.export.study_identifiers_sheet.identifiers_panel import (
     IdentifiersPanel,
 )
 from usdm4_excel.export.base.ct_version import CTVersion
+from usdm3_excel.export.base.study_index import StudyIndex
 from usdm4.api.identifier import StudyIdentifier
 from usdm4.api.organization import Organization
 from usdm4.api.address import Address
@@ -58,7 +59,8 @@ class TestIdentifiersPanel:
         ct_version = CTVersion()
 
         # Create an IdentifiersPanel instance
-        panel = IdentifiersPanel(ct_version)
+        mock_index = MagicMock(spec=StudyIndex)
+        panel = IdentifiersPanel(ct_version, mock_index)
 
         # Create mock objects
         collection = []
@@ -70,19 +72,16 @@ class TestIdentifiersPanel:
         mock_identifier.scopeId = "org123"
         mock_identifier.text = "Study-123"
 
-        mock_version.organization.return_value = mock_organization
+        mock_version.id = "version_id"
+        mock_index.organization.return_value = mock_organization
 
         # Set the attributes directly on the mock_organization
         mock_organization.type = MagicMock()
         mock_organization.legalAddress = MagicMock(spec=Address)
 
-        mock_organization.model_dump.return_value = {
-            "identifierScheme": "Scheme-123",
-            "identifier": "Org-123",
-            "name": "Test Organization",
-            "type": mock_organization.type,
-            "legalAddress": mock_organization.legalAddress,
-        }
+        mock_organization.identifierScheme = "Scheme-123"
+        mock_organization.identifier = "Org-123"
+        mock_organization.name = "Test Organization"
 
         # Mock the helper methods
         with (
@@ -98,21 +97,22 @@ class TestIdentifiersPanel:
             # Call the _add_identifier method
             panel._add_identifier(collection, mock_identifier, mock_version)
 
+            # Verify that the organization was found via the index
+            mock_index.organization.assert_called_once_with("version_id", "org123")
+
             # Verify that the helper methods were called with the correct arguments
             mock_pt_from_code.assert_called_once_with(mock_organization.type)
             mock_from_address.assert_called_once_with(mock_organization.legalAddress)
 
             # Verify that the collection was updated correctly
             assert len(collection) == 1
-            assert collection[0]["organizationIdentifierScheme"] == "Scheme-123"
-            assert collection[0]["organizationIdentifier"] == "Org-123"
-            assert collection[0]["organizationName"] == "Test Organization"
-            assert collection[0]["organizationType"] == "Organization Type"
-            assert collection[0]["studyIdentifier"] == "Study-123"
-            assert (
-                collection[0]["organizationAddress"]
-                == "Address Line 1|City|State|12345|US"
-            )
+            row = dict(zip(IdentifiersPanel.COLUMNS, collection[0]))
+            assert row["organizationIdentifierScheme"] == "Scheme-123"
+            assert row["organizationIdentifier"] == "Org-123"
+            assert row["organizationName"] == "Test Organization"
+            assert row["organizationType"] == "Organization Type"
+            assert row["studyIdentifier"] == "Study-123"
+            assert row["organizationAddress"] == "Address Line 1|City|State|12345|US"
 
     def test_from_address_with_address(self):
         """Test the _from_address method with a valid address."""
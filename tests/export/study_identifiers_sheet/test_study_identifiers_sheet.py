@@ -61,7 +61,7 @@ class TestStudyIdentifiersSheet:
             sheet.save(mock_study)
 
             # Verify that the IdentifiersPanel was created with the correct CTVersion
-            mock_identifiers_panel_class.assert_called_once_with(ct_version)
+            mock_identifiers_panel_class.assert_called_once_with(ct_version, None)
 
             # Verify that the IdentifiersPanel's execute method was called with the mock Study
             mock_identifiers_panel.execute.assert_called_once_with(mock_study)
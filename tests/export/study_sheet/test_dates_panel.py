@@ -74,14 +74,12 @@ class TestDatesPanel:
         # Create a mock collection and date
         collection = []
         mock_date = MagicMock()
-        mock_date.model_dump.return_value = {
-            "name": "Test Date",
-            "description": "Test Description",
-            "label": "Test Label",
-            "type": "Test Type",
-            "dateValue": date(2023, 1, 1),
-            "geographicScopes": [],
-        }
+        mock_date.name = "Test Date"
+        mock_date.description = "Test Description"
+        mock_date.label = "Test Label"
+        mock_date.type = "Test Type"
+        mock_date.dateValue = date(2023, 1, 1)
+        mock_date.geographicScopes = []
 
         # Mock the helper methods
         with (
@@ -103,10 +101,11 @@ class TestDatesPanel:
 
             # Verify that the collection was updated correctly
             assert len(collection) == 1
-            assert collection[0]["category"] == "test_category"
-            assert collection[0]["type"] == "Decoded Type"
-            assert collection[0]["date"] == "01/01/2023"
-            assert collection[0]["scopes"] == "Global"
+            row = dict(zip(DatesPanel.COLUMNS, collection[0]))
+            assert row["category"] == "test_category"
+            assert row["type"] == "Decoded Type"
+            assert row["date"] == "01/01/2023"
+            assert row["scopes"] == "Global"
 
     def test_date_from_date(self):
         """Test the _date_from_date method."""
@@ -184,3 +184,61 @@ class TestActivitiesPanel:
             ["", "Activity1 Label", "", "X", "X"],
         ]
         assert result == expected_result
+
+    def test_execute_with_repeated_names_and_timepoints(self):
+        """Test activities sharing a name are merged and timepoints sharing an id share a column."""
+        panel = ActivitiesPanel(CTVersion())
+        mock_study = MagicMock()
+        mock_version = MagicMock()
+        mock_design = MagicMock()
+        mock_timeline = MagicMock(spec=ScheduleTimeline)
+        mock_study.versions = [mock_version]
+        mock_version.studyDesigns = [mock_design]
+        mock_design.main_timeline.return_value = mock_timeline
+        activities = [MagicMock(), MagicMock(), MagicMock()]
+        for activity, id, name in zip(
+            activities, ["a1", "a2", "a3"], ["Same", "Same", "Unscheduled"]
+        ):
+            activity.id = id
+            activity.name = name
+            activity.label = None
+        mock_design.activity_list.return_value = activities
+        timepoints = [MagicMock(), MagicMock(), MagicMock()]
+        for timepoint, id, activity_ids in zip(
+            timepoints, ["t1", "t2", "t1"], [["a1", "a1"], [], ["a2", "missing"]]
+        ):
+            timepoint.id = id
+            timepoint.activityIds = activity_ids
+        mock_timeline.timepoint_list.return_value = timepoints
+
+        result = panel.execute(mock_study)
+
+        assert result == [
+            ["Parent Activity", "Child Activity", "BC/Procedure/Timeline", "", ""],
+            ["", "Same", "", "X", ""],
+            ["", "Same", "", "X", ""],
+        ]
+
+    def test_execute_lazy(self):
+        """Test lazy activity rows match the rows built in full."""
+        mock_study = MagicMock()
+        mock_version = MagicMock()
+        mock_design = MagicMock()
+        mock_timeline = MagicMock(spec=ScheduleTimeline)
+        mock_study.versions = [mock_version]
+        mock_version.studyDesigns = [mock_design]
+        mock_design.main_timeline.return_value = mock_timeline
+        mock_activity = MagicMock()
+        mock_activity.id = "a1"
+        mock_activity.name = "Activity1"
+        mock_activity.label = None
+        mock_design.activity_list.return_value = [mock_activity]
+        mock_timepoint = MagicMock()
+        mock_timepoint.id = "t1"
+        mock_timepoint.activityIds = ["a1"]
+        mock_timeline.timepoint_list.return_value = [mock_timepoint]
+
+        table = ActivitiesPanel(CTVersion()).execute(mock_study, lazy=True)
+
+        assert table.lazy
+        assert table.to_list() == ActivitiesPanel(CTVersion()).execute(mock_study)
@@ -2,6 +2,7 @@ from unittest.mock import MagicMock, patch
 
 from usdm3_excel.export.study_timeline_sheet.headings_panel import HeadingsPanel
 from usdm4_excel.export.base.ct_version import CTVersion
+from usdm3_excel.export.base.study_index import StudyIndex
 from usdm4.api.schedule_timeline import ScheduleTimeline
 from usdm4.api.scheduled_instance import (
     ScheduledActivityInstance,
@@ -141,7 +142,8 @@ class TestHeadingsPanel:
         ct_version = CTVersion()
 
         # Create a HeadingsPanel instance
-        panel = HeadingsPanel(ct_version)
+        mock_index = MagicMock(spec=StudyIndex)
+        panel = HeadingsPanel(ct_version, mock_index)
 
         # Create mock objects
         collection = [
@@ -168,18 +170,13 @@ class TestHeadingsPanel:
         mock_instance.epochId = "epoch_id"
         mock_instance.encounterId = "encounter_id"
 
-        mock_instance.model_dump.return_value = {
-            "name": "Activity1",
-            "description": "Activity description",
-            "label": "Activity label",
-            "instanceType": "ScheduledActivityInstance",
-            "defaultConditionId": "default_condition_id",
-            "epochId": "epoch_id",
-            "encounterId": "encounter_id",
-        }
-        mock_timeline.find_timepoint.return_value = mock_default
-        mock_design.find_epoch.return_value = mock_epoch
-        mock_design.find_encounter.return_value = mock_encounter
+        mock_instance.name = "Activity1"
+        mock_instance.description = "Activity description"
+        mock_instance.label = "Activity label"
+        mock_timeline.id = "timeline_id"
+        mock_index.timepoint.return_value = mock_default
+        mock_index.epoch.return_value = mock_epoch
+        mock_index.encounter.return_value = mock_encounter
         mock_default.name = "Default Condition"
         mock_epoch.name = "Epoch1"
         mock_encounter.name = "Encounter1"
@@ -196,6 +193,11 @@ class TestHeadingsPanel:
         assert collection[5] == ["condition", ""]
         assert collection[6] == ["epoch", "Epoch1"]
         assert collection[7] == ["encounter", "Encounter1"]
+        mock_index.timepoint.assert_called_once_with(
+            "timeline_id", "default_condition_id"
+        )
+        mock_index.epoch.assert_called_once_with(mock_design.id, "epoch_id")
+        mock_index.encounter.assert_called_once_with(mock_design.id, "encounter_id")
 
     def test_add_instance_decision(self):
         """Test the _add_instance method with a decision instance."""
@@ -203,7 +205,8 @@ class TestHeadingsPanel:
         ct_version = CTVersion()
 
         # Create a HeadingsPanel instance
-        panel = HeadingsPanel(ct_version)
+        mock_index = MagicMock(spec=StudyIndex)
+        panel = HeadingsPanel(ct_version, mock_index)
 
         # Create mock objects
         collection = [
@@ -228,18 +231,13 @@ class TestHeadingsPanel:
         mock_instance.epochId = "epoch_id"
         mock_instance.encounterId = "encounter_id"
 
-        mock_instance.model_dump.return_value = {
-            "name": "Decision1",
-            "description": "Decision description",
-            "label": "Decision label",
-            "instanceType": "ScheduledDecisionInstance",
-            "defaultConditionId": "default_condition_id",
-            "epochId": "epoch_id",
-            "encounterId": "encounter_id",
-        }
-        mock_timeline.find_timepoint.return_value = mock_default
-        mock_design.find_epoch.return_value = None
-        mock_design.find_encounter.return_value = None
+        mock_instance.name = "Decision1"
+        mock_instance.description = "Decision description"
+        mock_instance.label = "Decision label"
+        mock_timeline.id = "timeline_id"
+        mock_index.timepoint.return_value = mock_default
+        mock_index.epoch.return_value = None
+        mock_index.encounter.return_value = None
         mock_default.name = "Default Condition"
 
         # Call the _add_instance method
@@ -254,3 +252,26 @@ class TestHeadingsPanel:
         assert collection[5] == ["condition", ""]
         assert collection[6] == ["epoch", ""]
         assert collection[7] == ["encounter", ""]
+
+    def test_execute_default_conditions(self):
+        """Test missing default conditions are set to the following timepoint."""
+        panel = HeadingsPanel(CTVersion(), MagicMock(spec=StudyIndex))
+        mock_study = MagicMock()
+        mock_version = MagicMock()
+        mock_design = MagicMock()
+        mock_timeline = MagicMock()
+        mock_study.versions = [mock_version]
+        mock_version.studyDesigns = [mock_design]
+        mock_design.main_timeline.return_value = mock_timeline
+        timepoints = [MagicMock() for _ in range(3)]
+        for i, timepoint in enumerate(timepoints):
+            timepoint.id = f"tp{i + 1}"
+            timepoint.defaultConditionId = None
+        timepoints[1].defaultConditionId = "other"
+        mock_timeline.timepoint_list.return_value = timepoints
+
+        result = panel.execute(mock_study)
+
+        assert [x.defaultConditionId for x in timepoints] == ["tp2", "other", None]
+        assert mock_timeline.timepoint_list.call_count == 1
+        assert all(len(row) == 4 for row in result)
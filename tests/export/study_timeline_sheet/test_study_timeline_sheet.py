@@ -1,8 +1,12 @@
 from unittest.mock import MagicMock, patch
+from simple_error_log import Errors
+from usdm4 import USDM4
 
 from usdm3_excel.export.study_timeline_sheet.study_timeline_sheet import (
     StudyTimelineSheet,
 )
+from usdm3_excel.export.base.study_index import StudyIndex
+from usdm3_excel.export.plan.sheet_plan import SheetPlan
 from usdm4_excel.export.base.ct_version import CTVersion
 from usdm4_excel.export.excel_table_writer.excel_table_writer import ExcelTableWriter
 
@@ -43,8 +47,11 @@ class TestStudyTimelineSheet:
         # Create a StudyTimelineSheet instance
         sheet = StudyTimelineSheet(ct_version, mock_etw)
 
-        # Create a mock Study
+        # Create a mock Study with just a main timeline
         mock_study = MagicMock()
+        mock_design = mock_study.versions[0].studyDesigns[0]
+        mock_timeline = mock_design.main_timeline.return_value
+        mock_design.scheduleTimelines = [mock_timeline]
 
         # Mock the MainPanel, HeadingsPanel, and ActivitiesPanel classes
         with (
@@ -92,7 +99,9 @@ class TestStudyTimelineSheet:
             mock_main_panel_class.assert_called_once_with(ct_version)
 
             # Verify that the MainPanel's execute method was called with the mock Study
-            mock_main_panel.execute.assert_called_once_with(mock_study)
+            mock_main_panel.execute.assert_called_once_with(
+                mock_study, timeline=mock_timeline
+            )
 
             # Verify that the ExcelTableWriter's add_table method was called with the result from the MainPanel
             mock_etw.add_table.assert_any_call(
@@ -107,10 +116,12 @@ class TestStudyTimelineSheet:
             )
 
             # Verify that the HeadingsPanel was created with the correct CTVersion
-            mock_headings_panel_class.assert_called_once_with(ct_version)
+            mock_headings_panel_class.assert_called_once_with(ct_version, None)
 
             # Verify that the HeadingsPanel's execute method was called with the mock Study
-            mock_headings_panel.execute.assert_called_once_with(mock_study)
+            mock_headings_panel.execute.assert_called_once_with(
+                mock_study, timeline=mock_timeline
+            )
 
             # Verify that the ExcelTableWriter's add_table method was called with the result from the HeadingsPanel
             mock_etw.add_table.assert_any_call(
@@ -128,7 +139,9 @@ class TestStudyTimelineSheet:
             mock_activities_panel_class.assert_called_once_with(ct_version)
 
             # Verify that the ActivitiesPanel's execute method was called with the mock Study
-            mock_activities_panel.execute.assert_called_once_with(mock_study)
+            mock_activities_panel.execute.assert_called_once_with(
+                mock_study, False, timeline=mock_timeline
+            )
 
             # Verify that the ExcelTableWriter's add_table method was called with the result from the ActivitiesPanel
             mock_etw.add_table.assert_any_call(
@@ -160,3 +173,28 @@ class TestStudyTimelineSheet:
             mock_etw.set_column_width.assert_called_once_with(
                 "mainTimeline", [1, 3, 4, 5, 6, 7], 20.0
             )
+
+    def test_parts(self, tmp_path):
+        """Test every timeline is written to its own sheet."""
+        study = USDM4().load("tests/test_files/usdm_1.json", Errors()).study
+        assert StudyTimelineSheet.parts(study) == [0, 1, 2, 3, 4]
+        plan = SheetPlan()
+        StudyTimelineSheet(CTVersion(), plan, StudyIndex(study)).save(study)
+        sheets = []
+        for operation in plan.operations:
+            if operation["sheet"] not in sheets:
+                sheets.append(operation["sheet"])
+        assert sheets == [
+            "mainTimeline",
+            "Adverse Event Timeline",
+            "Early Termination Timeline",
+            "PKPD Timeline",
+            "Unscheduled Timeline",
+        ]
+        pkpd = [
+            x["data"]
+            for x in plan.operations
+            if x["sheet"] == "PKPD Timeline" and x["type"] == SheetPlan.TABLE
+        ]
+        assert pkpd[0][0] == ["Name", "PKPD Timeline"]
+        assert len(pkpd[1][0]) == 12
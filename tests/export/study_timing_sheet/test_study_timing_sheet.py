@@ -89,10 +89,10 @@ class TestStudyTimingSheet:
             sheet.save(mock_study)
 
             # Verify that the TimingPanel was created with the correct CTVersion
-            mock_timing_panel_class.assert_called_once_with(ct_version)
+            mock_timing_panel_class.assert_called_once_with(ct_version, None)
 
             # Verify that the TimingPanel's execute method was called with the mock Study
-            mock_timing_panel.execute.assert_called_once_with(mock_study)
+            mock_timing_panel.execute.assert_called_once_with(mock_study, False)
 
             # Verify that the ExcelTableWriter's add_table method was called with the result from the TimingPanel
             mock_etw.add_table.assert_called_once_with(
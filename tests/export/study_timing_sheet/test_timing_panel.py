@@ -2,6 +2,7 @@ from unittest.mock import MagicMock, patch
 
 from usdm3_excel.export.study_timing_sheet.timing_panel import TimingPanel
 from usdm4_excel.export.base.ct_version import CTVersion
+from usdm3_excel.export.base.study_index import StudyIndex
 from usdm4.api.timing import Timing
 from usdm4.api.schedule_timeline import ScheduleTimeline
 
@@ -28,7 +29,7 @@ class TestTimingPanel:
         ct_version = CTVersion()
 
         # Create a TimingPanel instance
-        panel = TimingPanel(ct_version)
+        panel = TimingPanel(ct_version, MagicMock(spec=StudyIndex))
 
         # Create mock objects
         mock_study = MagicMock()
@@ -49,7 +50,7 @@ class TestTimingPanel:
             panel.execute(mock_study)
 
             # Verify that _add_timing was called with the correct arguments
-            mock_add_timing.assert_called_once_with([], mock_timing, mock_timeline)
+            mock_add_timing.assert_called_once_with(mock_timing, mock_timeline)
 
     def test_add_timing(self):
         """Test the _add_timing method."""
@@ -57,10 +58,10 @@ class TestTimingPanel:
         ct_version = CTVersion()
 
         # Create a TimingPanel instance
-        panel = TimingPanel(ct_version)
+        mock_index = MagicMock(spec=StudyIndex)
+        panel = TimingPanel(ct_version, mock_index)
 
         # Create mock objects
-        collection = []
         mock_timing = MagicMock(spec=Timing)
         mock_timeline = MagicMock(spec=ScheduleTimeline)
         mock_from_timepoint = MagicMock()
@@ -77,19 +78,11 @@ class TestTimingPanel:
         mock_timing.valueLabel = "Value1"
         mock_timing.windowLabel = "Window1"
         mock_timing.relativeToFrom = mock_relative_to_from
-
-        mock_timing.model_dump.return_value = {
-            "name": "Timing1",
-            "description": "Description1",
-            "label": "Label1",
-            "type": mock_type,
-            "relativeFromScheduledInstanceId": "from_id",
-            "relativeToScheduledInstanceId": "to_id",
-            "valueLabel": "Value1",
-            "windowLabel": "Window1",
-            "relativeToFrom": mock_relative_to_from,
-        }
-        mock_timeline.find_timepoint.side_effect = lambda id: {
+        mock_timing.name = "Timing1"
+        mock_timing.description = "Description1"
+        mock_timing.label = "Label1"
+        mock_timeline.id = "timeline_id"
+        mock_index.timepoint.side_effect = lambda timeline_id, id: {
             "from_id": mock_from_timepoint,
             "to_id": mock_to_timepoint,
         }.get(id)
@@ -106,35 +99,35 @@ class TestTimingPanel:
             mock_encode_to_from.return_value = "ToFrom1"
 
             # Call the _add_timing method
-            panel._add_timing(collection, mock_timing, mock_timeline)
+            result = panel._add_timing(mock_timing, mock_timeline)
 
             # Verify that the helper methods were called with the correct arguments
             mock_encode_type.assert_called_once_with(mock_type)
             mock_encode_to_from.assert_called_once_with(mock_relative_to_from)
 
-            # Verify that the timeline's find_timepoint method was called with the correct arguments
-            mock_timeline.find_timepoint.assert_any_call("from_id")
-            mock_timeline.find_timepoint.assert_any_call("to_id")
-
-            # Verify that the collection was updated correctly
-            assert len(collection) == 1
-            assert collection[0]["name"] == "Timing1"
-            assert collection[0]["description"] == "Description1"
-            assert collection[0]["label"] == "Label1"
-            assert collection[0]["type"] == "Type1"
-            assert collection[0]["from"] == "From1"
-            assert collection[0]["to"] == "To1"
+            # Verify that the index was queried for the timepoints within the timeline
+            mock_index.timepoint.assert_any_call("timeline_id", "from_id")
+            mock_index.timepoint.assert_any_call("timeline_id", "to_id")
+
+            # Verify the row returned
+            row = dict(zip(TimingPanel.COLUMNS, result))
+            assert row["name"] == "Timing1"
+            assert row["description"] == "Description1"
+            assert row["label"] == "Label1"
+            assert row["type"] == "Type1"
+            assert row["from"] == "From1"
+            assert row["to"] == "To1"
             assert (
-                collection[0]["timingValue"] == "1 Days"
+                row["timingValue"] == "1 Days"
             )  # ISO 8601 duration P1D is converted to "1 Days"
-            assert collection[0]["window"] == "Window1"
-            assert collection[0]["toFrom"] == "ToFrom1"
+            assert row["window"] == "Window1"
+            assert row["toFrom"] == "ToFrom1"
 
     def test_decode_iso8601_duration_years(self):
         """Test _decode_iso8601_duration with years."""
         ct_version = CTVersion()
         panel = TimingPanel(ct_version)
-        
+
         assert panel._decode_iso8601_duration("P1Y") == "1 Years"
         assert panel._decode_iso8601_duration("P5Y") == "5 Years"
         assert panel._decode_iso8601_duration("P10Y") == "10 Years"
@@ -143,7 +136,7 @@ class TestTimingPanel:
         """Test _decode_iso8601_duration with months."""
         ct_version = CTVersion()
         panel = TimingPanel(ct_version)
-        
+
         assert panel._decode_iso8601_duration("P1M") == "1 Months"
         assert panel._decode_iso8601_duration("P6M") == "6 Months"
         assert panel._decode_iso8601_duration("P12M") == "12 Months"
@@ -152,7 +145,7 @@ class TestTimingPanel:
         """Test _decode_iso8601_duration with weeks."""
         ct_version = CTVersion()
         panel = TimingPanel(ct_version)
-        
+
         assert panel._decode_iso8601_duration("P1W") == "1 Weeks"
         assert panel._decode_iso8601_duration("P4W") == "4 Weeks"
         assert panel._decode_iso8601_duration("P52W") == "52 Weeks"
@@ -161,7 +154,7 @@ class TestTimingPanel:
         """Test _decode_iso8601_duration with days."""
         ct_version = CTVersion()
         panel = TimingPanel(ct_version)
-        
+
         assert panel._decode_iso8601_duration("P1D") == "1 Days"
         assert panel._decode_iso8601_duration("P7D") == "7 Days"
         assert panel._decode_iso8601_duration("P30D") == "30 Days"
@@ -171,7 +164,7 @@ class TestTimingPanel:
         """Test _decode_iso8601_duration with hours (PT prefix)."""
         ct_version = CTVersion()
         panel = TimingPanel(ct_version)
-        
+
         assert panel._decode_iso8601_duration("PT1H") == "1 Hours"
         assert panel._decode_iso8601_duration("PT12H") == "12 Hours"
         assert panel._decode_iso8601_duration("PT24H") == "24 Hours"
@@ -180,7 +173,7 @@ class TestTimingPanel:
         """Test _decode_iso8601_duration with minutes (PT prefix)."""
         ct_version = CTVersion()
         panel = TimingPanel(ct_version)
-        
+
         assert panel._decode_iso8601_duration("PT1M") == "1 Minutes"
         assert panel._decode_iso8601_duration("PT30M") == "30 Minutes"
         assert panel._decode_iso8601_duration("PT60M") == "60 Minutes"
@@ -189,7 +182,7 @@ class TestTimingPanel:
         """Test _decode_iso8601_duration with seconds (PT prefix)."""
         ct_version = CTVersion()
         panel = TimingPanel(ct_version)
-        
+
         assert panel._decode_iso8601_duration("PT1S") == "1 Seconds"
         assert panel._decode_iso8601_duration("PT30S") == "30 Seconds"
         assert panel._decode_iso8601_duration("PT3600S") == "3600 Seconds"
@@ -198,7 +191,7 @@ class TestTimingPanel:
         """Test _decode_iso8601_duration with lowercase prefixes."""
         ct_version = CTVersion()
         panel = TimingPanel(ct_version)
-        
+
         # PT prefix should work with lowercase (method uses .upper())
         assert panel._decode_iso8601_duration("pt1H") == "1 Hours"
         assert panel._decode_iso8601_duration("Pt5M") == "5 Minutes"
@@ -207,16 +200,16 @@ class TestTimingPanel:
         """Test _decode_iso8601_duration with invalid formats."""
         ct_version = CTVersion()
         panel = TimingPanel(ct_version)
-        
+
         # Invalid unit character returns with None as units_str
         assert panel._decode_iso8601_duration("P1X") == "1 Day"
         assert panel._decode_iso8601_duration("PT1Q") == "1 Day"
-        
+
     def test_decode_iso8601_duration_no_number(self):
         """Test _decode_iso8601_duration with no numeric value returns default."""
         ct_version = CTVersion()
         panel = TimingPanel(ct_version)
-        
+
         # No number should return default
         assert panel._decode_iso8601_duration("PD") == "1 Day"
         assert panel._decode_iso8601_duration("PTH") == "1 Day"
@@ -225,7 +218,7 @@ class TestTimingPanel:
         """Test _decode_iso8601_duration with empty string raises IndexError."""
         ct_version = CTVersion()
         panel = TimingPanel(ct_version)
-        
+
         # Empty string causes IndexError due to value[-1] access
         try:
             result = panel._decode_iso8601_duration("")
@@ -237,7 +230,7 @@ class TestTimingPanel:
         """Test _decode_iso8601_duration with large numeric values."""
         ct_version = CTVersion()
         panel = TimingPanel(ct_version)
-        
+
         assert panel._decode_iso8601_duration("P100Y") == "100 Years"
         assert panel._decode_iso8601_duration("P999D") == "999 Days"
         assert panel._decode_iso8601_duration("PT1000H") == "1000 Hours"
@@ -248,10 +241,10 @@ class TestTimingPanel:
         ct_version = CTVersion()
 
         # Create a TimingPanel instance
-        panel = TimingPanel(ct_version)
+        mock_index = MagicMock(spec=StudyIndex)
+        panel = TimingPanel(ct_version, mock_index)
 
         # Create mock objects
-        collection = []
         mock_timing = MagicMock(spec=Timing)
         mock_timeline = MagicMock(spec=ScheduleTimeline)
         mock_type = MagicMock()
@@ -266,19 +259,11 @@ class TestTimingPanel:
         mock_timing.valueLabel = "Value1"
         mock_timing.windowLabel = "Window1"
         mock_timing.relativeToFrom = mock_relative_to_from
-
-        mock_timing.model_dump.return_value = {
-            "name": "Timing1",
-            "description": "Description1",
-            "label": "Label1",
-            "type": mock_type,
-            "relativeFromScheduledInstanceId": "from_id",
-            "relativeToScheduledInstanceId": "to_id",
-            "valueLabel": "Value1",
-            "windowLabel": "Window1",
-            "relativeToFrom": mock_relative_to_from,
-        }
-        mock_timeline.find_timepoint.return_value = None
+        mock_timing.name = "Timing1"
+        mock_timing.description = "Description1"
+        mock_timing.label = "Label1"
+        mock_timeline.id = "timeline_id"
+        mock_index.timepoint.return_value = None
 
         # Mock the helper methods
         with (
@@ -290,26 +275,44 @@ class TestTimingPanel:
             mock_encode_to_from.return_value = "ToFrom1"
 
             # Call the _add_timing method
-            panel._add_timing(collection, mock_timing, mock_timeline)
+            result = panel._add_timing(mock_timing, mock_timeline)
 
             # Verify that the helper methods were called with the correct arguments
             mock_encode_type.assert_called_once_with(mock_type)
             mock_encode_to_from.assert_called_once_with(mock_relative_to_from)
 
-            # Verify that the timeline's find_timepoint method was called with the correct arguments
-            mock_timeline.find_timepoint.assert_any_call("from_id")
-            mock_timeline.find_timepoint.assert_any_call("to_id")
-
-            # Verify that the collection was updated correctly
-            assert len(collection) == 1
-            assert collection[0]["name"] == "Timing1"
-            assert collection[0]["description"] == "Description1"
-            assert collection[0]["label"] == "Label1"
-            assert collection[0]["type"] == "Type1"
-            assert collection[0]["from"] == ""
-            assert collection[0]["to"] == ""
+            # Verify that the index was queried for the timepoints within the timeline
+            mock_index.timepoint.assert_any_call("timeline_id", "from_id")
+            mock_index.timepoint.assert_any_call("timeline_id", "to_id")
+
+            # Verify the row returned
+            row = dict(zip(TimingPanel.COLUMNS, result))
+            assert row["name"] == "Timing1"
+            assert row["description"] == "Description1"
+            assert row["label"] == "Label1"
+            assert row["type"] == "Type1"
+            assert row["from"] == ""
+            assert row["to"] == ""
             assert (
-                collection[0]["timingValue"] == "1 Days"
+                row["timingValue"] == "1 Days"
             )  # ISO 8601 duration P1D is converted to "1 Days"
-            assert collection[0]["window"] == "Window1"
-            assert collection[0]["toFrom"] == "ToFrom1"
+            assert row["window"] == "Window1"
+            assert row["toFrom"] == "ToFrom1"
+
+    def test_execute_lazy(self):
+        """Test lazy timing rows are produced as the table is read."""
+        panel = TimingPanel(CTVersion(), MagicMock(spec=StudyIndex))
+        mock_study = MagicMock()
+        mock_version = MagicMock()
+        mock_design = MagicMock()
+        mock_timeline = MagicMock()
+        mock_timing = MagicMock()
+        mock_study.versions = [mock_version]
+        mock_version.studyDesigns = [mock_design]
+        mock_design.scheduleTimelines = [mock_timeline]
+        mock_timeline.timings = [mock_timing]
+        with patch.object(panel, "_add_timing") as mock_add_timing:
+            mock_add_timing.return_value = ("row",)
+            table = panel.execute(mock_study, lazy=True)
+            mock_add_timing.assert_not_called()
+            assert list(table) == [tuple(TimingPanel.COLUMNS), ("row",)]
@@ -0,0 +1,52 @@
+import openpyxl
+import pytest
+
+from usdm3_excel.export.design_runner import (
+    DesignRunner,
+    _export_in_process,
+    _initialise,
+)
+from usdm3_excel.export.design_selection import DesignSelection
+from tests.helpers.design_helper import load_designs
+
+
+def design_name(path):
+    rows = list(openpyxl.load_workbook(path)["studyDesign"].values)
+    return rows[0][1]
+
+
+class TestDesignRunner:
+    """Tests for the DesignRunner class."""
+
+    @pytest.mark.parametrize("mode", [None] + DesignRunner.MODES)
+    def test_execute(self, mode, tmp_path):
+        """Test each design is exported to its own workbook."""
+        wrapper = load_designs()
+        jobs = [
+            (x, str(tmp_path / f"{x.name}.xlsx"))
+            for x in DesignSelection.all(wrapper.study)
+        ]
+        results = DesignRunner(mode, 2).execute(wrapper, jobs, {"writer": "xml"})
+        assert [x.error_count() for x in results] == [0, 0, 0]
+        assert [design_name(path) for _, path in jobs] == [
+            "STUDY-DESIGN-1",
+            "Second design",
+            "STUDY-DESIGN-1",
+        ]
+
+    def test_execute_no_jobs(self):
+        """Test nothing is exported without jobs."""
+        assert DesignRunner(DesignRunner.MODES[0]).execute(None, []) == []
+
+    def test_export_in_process(self, tmp_path):
+        """Test the process worker uses the study given at initialisation."""
+        _initialise(load_designs())
+        path = str(tmp_path / "design.xlsx")
+        errors = _export_in_process(DesignSelection(0, 1), path, {})
+        assert errors.error_count() == 0
+        assert design_name(path) == "Second design"
+
+    def test_unknown_mode(self):
+        """Test an unknown mode is rejected."""
+        with pytest.raises(ValueError, match="Unknown parallel mode 'gpu'"):
+            DesignRunner("gpu")
@@ -0,0 +1,36 @@
+from usdm3_excel.export.design_selection import DesignSelection
+from tests.helpers.design_helper import load_designs
+
+
+class TestDesignSelection:
+    """Tests for the DesignSelection class."""
+
+    def test_all(self):
+        """Test every design of every version is selected in order."""
+        selections = DesignSelection.all(load_designs().study)
+        assert [(x.version, x.design) for x in selections] == [(0, 0), (0, 1), (1, 0)]
+        assert [x.name for x in selections] == ["v1_d1", "v1_d2", "v2_d1"]
+
+    def test_view(self):
+        """Test a view holds just the design selected and shares the rest."""
+        wrapper = load_designs()
+        view = DesignSelection(0, 1).view(wrapper)
+        study = view.study
+        assert len(study.versions) == 1
+        assert study.versions[0].id == wrapper.study.versions[0].id
+        assert study.versions[0].studyDesigns == [
+            wrapper.study.versions[0].studyDesigns[1]
+        ]
+        assert (
+            study.versions[0].studyDesigns[0]
+            is (wrapper.study.versions[0].studyDesigns[1])
+        )
+        assert study.documentedBy is wrapper.study.documentedBy
+        assert len(wrapper.study.versions) == 2
+        assert len(wrapper.study.versions[0].studyDesigns) == 2
+
+    def test_view_second_version(self):
+        """Test a design of a later version is selected with its version."""
+        wrapper = load_designs()
+        view = DesignSelection(1, 0).view(wrapper)
+        assert view.study.versions[0].id == "SecondVersion"
@@ -0,0 +1,244 @@
+import threading
+import pytest
+from concurrent.futures import CancelledError
+from unittest.mock import MagicMock, call, patch
+
+from usdm3_excel.export.sheet_runner import (
+    SheetRunner,
+    compute,
+    create_sheet,
+    _compute_in_process,
+    _initialise,
+)
+from usdm3_excel.export.base.base_sheet import BaseSheet
+from usdm3_excel.export.plan.plan_renderer import PlanRenderer
+from usdm3_excel.export.plan.sheet_plan import SheetPlan
+from usdm3_excel.export.plan.workbook_plan import WorkbookPlan
+from usdm3_excel.export.base.study_index import StudyIndex
+from usdm4_excel.export.base.base_sheet import BaseSheet as USDM4BaseSheet
+from usdm4_excel.export.base.ct_version import CTVersion
+from usdm4_excel.export.configuration_sheet.configuration_sheet import (
+    ConfigurationSheet,
+)
+from usdm4_excel.export.excel_table_writer.excel_table_writer import ExcelTableWriter
+
+
+class FirstSheet(BaseSheet):
+    def save(self, study):
+        self.ct_version.add("B", "2")
+        self.ct_version.add("A", "1")
+        self.etw.add_table([[study.name, self.index.name]], "first")
+
+
+class SecondSheet(USDM4BaseSheet):
+    def save(self, study):
+        self.ct_version.add("C", "3")
+        self.ct_version.add("A", "4")
+        last_row = self.etw.add_table([["x"], ["y"]], "second")
+        self.etw.format_cells("second", (1, 1, last_row, 1), font_style="bold")
+
+
+class PartSheet(BaseSheet):
+    @classmethod
+    def parts(cls, study):
+        return study.parts
+
+    def save(self, study):
+        self.etw.add_table([["whole"]], "part")
+
+    def save_part(self, study, part):
+        self.ct_version.add("P", str(part))
+        self.ct_version.add(f"P{part}", "1")
+        self.etw.add_table([[part]], f"part{part}")
+
+
+class Study:
+    name = "study"
+    parts = [1, 2, 3]
+
+
+class Index:
+    name = "index"
+
+
+class TestSheetRunner:
+    """Tests for the SheetRunner class."""
+
+    def test_create_sheet(self):
+        """Test usdm3 sheets are given the index and usdm4 sheets are not."""
+        ct_version = CTVersion()
+        mock_etw = MagicMock(spec=ExcelTableWriter)
+        mock_index = MagicMock(spec=StudyIndex)
+        sheet = create_sheet(FirstSheet, ct_version, mock_etw, mock_index)
+        assert sheet.index is mock_index
+        sheet = create_sheet(SecondSheet, ct_version, mock_etw, mock_index)
+        assert not hasattr(sheet, "index")
+
+    def test_compute(self):
+        """Test a sheet is computed against its own recorder and CT version."""
+        plan = compute(FirstSheet, Study(), Index())
+        assert plan.operations == [
+            {
+                "type": "table",
+                "sheet": "first",
+                "row": 1,
+                "col": 1,
+                "data": [["study", "index"]],
+            }
+        ]
+        assert plan.ct_versions == {"B": "2", "A": "1"}
+
+    def test_compute_in_process(self):
+        """Test the process worker uses the study given at initialisation."""
+        _initialise(Study(), Index())
+        plan = _compute_in_process(FirstSheet)
+        assert plan.operations[0]["data"] == [["study", "index"]]
+
+    def test_create_sheet_lazy(self):
+        """Test usdm3 sheets are told whether their panels may be lazy."""
+        mock_etw = MagicMock(spec=ExcelTableWriter)
+        sheet = create_sheet(FirstSheet, CTVersion(), mock_etw, Index())
+        assert not sheet.lazy
+        sheet = create_sheet(FirstSheet, CTVersion(), mock_etw, Index(), True)
+        assert sheet.lazy
+
+    def test_execute_lazy(self):
+        """Test sequential sheets are computed lazily when asked."""
+        with patch("usdm3_excel.export.sheet_runner.compute") as mock_compute:
+            mock_compute.return_value = SheetPlan()
+            SheetRunner(lazy=True).execute([FirstSheet], Study(), Index(), CTVersion())
+        assert mock_compute.call_args.args[3] is True
+
+    def test_lazy_parallel(self):
+        """Test lazy tables are not combined with parallel sheets."""
+        with pytest.raises(ValueError, match="only produced by sequential sheets"):
+            SheetRunner(SheetRunner.THREAD, lazy=True)
+
+    def test_unknown_mode(self):
+        """Test an unknown mode is rejected."""
+        with pytest.raises(ValueError, match="Unknown parallel mode 'gpu'"):
+            SheetRunner("gpu")
+
+    @pytest.mark.parametrize("mode", [None] + SheetRunner.MODES)
+    def test_execute(self, mode):
+        """Test plans are returned in sheet order with merged CT versions."""
+        ct_version = CTVersion()
+        mock_etw = MagicMock(spec=ExcelTableWriter)
+        plans = SheetRunner(mode, 2).execute(
+            [FirstSheet, SecondSheet, ConfigurationSheet],
+            Study(),
+            Index(),
+            ct_version,
+        )
+        assert len(plans) == 3
+        for plan in plans:
+            PlanRenderer(None).render_sheet(plan, mock_etw)
+        assert ct_version.versions == {"B": "2", "A": "4", "C": "3"}
+        assert list(ct_version.versions) == ["B", "A", "C"]
+        assert mock_etw.mock_calls[:3] == [
+            call.add_table([["study", "index"]], "first", 1, 1),
+            call.add_table([["x"], ["y"]], "second", 1, 1),
+            call.format_cells("second", (1, 1, 2, 1), font_style="bold"),
+        ]
+        assert mock_etw.mock_calls[3] == call.add_table(
+            [
+                ["CT Version", "B=2"],
+                ["CT Version", "A=4"],
+                ["CT Version", "C=3"],
+            ],
+            "configuration",
+            1,
+            1,
+        )
+
+    @pytest.mark.parametrize("mode", [None] + SheetRunner.MODES)
+    def test_execute_previous(self, mode):
+        """Test plans with a matching fingerprint are reused."""
+        sheets = [FirstSheet, SecondSheet, ConfigurationSheet]
+        with patch("usdm3_excel.export.sheet_runner.SheetFingerprint") as fingerprint:
+            fingerprint.return_value.value.side_effect = lambda x: x.__name__
+            first = SheetRunner(mode, 2).execute(
+                sheets, Study(), Index(), CTVersion(), WorkbookPlan()
+            )
+            assert [x.name for x in first] == [x.__name__ for x in sheets]
+            assert [x.fingerprint for x in first] == ["FirstSheet", "SecondSheet", None]
+            first[0].fingerprint = "stale"
+            ct_version = CTVersion()
+            second = SheetRunner(mode, 2).execute(
+                sheets, Study(), Index(), ct_version, WorkbookPlan(first)
+            )
+        assert second[0] is not first[0]
+        assert second[0].fingerprint == "FirstSheet"
+        assert second[1] is first[1]
+        assert ct_version.versions == {"B": "2", "A": "4", "C": "3"}
+
+    def test_execute_all_reused(self):
+        """Test nothing is computed when every plan is reused."""
+        with patch("usdm3_excel.export.sheet_runner.SheetFingerprint") as fingerprint:
+            fingerprint.return_value.value.return_value = "same"
+            previous = WorkbookPlan([SheetPlan(name="FirstSheet", fingerprint="same")])
+            with patch("usdm3_excel.export.sheet_runner.compute") as mock_compute:
+                plans = SheetRunner("thread").execute(
+                    [FirstSheet], Study(), Index(), CTVersion(), previous
+                )
+        mock_compute.assert_not_called()
+        assert plans == previous.sheets
+
+    @pytest.mark.parametrize("mode", [None] + SheetRunner.MODES)
+    def test_execute_cancelled(self, mode):
+        """Test no sheet is started once the export is cancelled."""
+        cancel = threading.Event()
+        cancel.set()
+        runner = SheetRunner(mode, 2, cancel=cancel)
+        with patch("usdm3_excel.export.sheet_runner.compute") as mock_compute:
+            with pytest.raises(CancelledError):
+                runner.execute(
+                    [FirstSheet, ConfigurationSheet], Study(), Index(), CTVersion()
+                )
+        mock_compute.assert_not_called()
+
+    def test_execute_cancelled_between_sheets(self):
+        """Test the sheet running when cancelled is finished and the next is not."""
+        runner = SheetRunner(cancel=threading.Event())
+
+        def cancelled(*args):
+            runner.cancel.set()
+            return SheetPlan()
+
+        with patch("usdm3_excel.export.sheet_runner.compute") as mock_compute:
+            mock_compute.side_effect = cancelled
+            with pytest.raises(CancelledError):
+                runner.execute(
+                    [FirstSheet, ConfigurationSheet], Study(), Index(), CTVersion()
+                )
+        mock_compute.assert_called_once()
+
+    @pytest.mark.parametrize("mode", [None] + SheetRunner.MODES)
+    def test_execute_parts(self, mode):
+        """Test the parts of a sheet are computed apart and joined in order."""
+        ct_version = CTVersion()
+        plans = SheetRunner(mode, 2).execute(
+            [PartSheet, FirstSheet], Study(), Index(), ct_version
+        )
+        assert [x.name for x in plans] == ["PartSheet", "FirstSheet"]
+        assert [x["sheet"] for x in plans[0].operations] == ["part1", "part2", "part3"]
+        assert list(plans[0].ct_versions.items()) == [
+            ("P", "3"),
+            ("P1", "1"),
+            ("P2", "1"),
+            ("P3", "1"),
+        ]
+        assert ct_version.versions["P"] == "3"
+
+    def test_execute_single_part(self):
+        """Test a sheet with a single part is saved whole."""
+        study = Study()
+        study.parts = [1]
+        plans = SheetRunner().execute([PartSheet], study, Index(), CTVersion())
+        assert plans[0].operations[0]["sheet"] == "part"
+
+    def test_compute_part_in_process(self):
+        """Test the process worker computes the part given."""
+        _initialise(Study(), Index())
+        plan = _compute_in_process(PartSheet, 2)
+        assert plan.operations[0]["data"] == [[2]]
@@ -0,0 +1,19 @@
+import copy
+import json
+from simple_error_log import Errors
+from usdm4 import USDM4
+
+
+def load_designs():
+    with open("tests/test_files/usdm_2.json") as f:
+        data = json.load(f)
+    version = data["study"]["versions"][0]
+    design = copy.deepcopy(version["studyDesigns"][0])
+    design["id"] = "SecondDesign"
+    design["name"] = "Second design"
+    version["studyDesigns"].append(design)
+    second = copy.deepcopy(version)
+    second["id"] = "SecondVersion"
+    second["studyDesigns"] = second["studyDesigns"][:1]
+    data["study"]["versions"].append(second)
+    return USDM4().loadd(data, Errors())
@@ -0,0 +1,98 @@
+import datetime
+import json
+import uuid
+from pydantic import BaseModel, PrivateAttr
+from simple_error_log import Errors
+from usdm4 import USDM4
+from usdm3_excel.loader.trusted_loader import TrustedLoader
+
+
+class Private(BaseModel):
+    name: str
+    _cache: dict = PrivateAttr(default_factory=dict)
+
+
+class Holder(BaseModel):
+    items: list[Private] = []
+
+
+class TestTrustedLoader:
+    """Tests for the TrustedLoader class."""
+
+    def test_load_matches_validation(self):
+        """Test the study built matches the validated one."""
+        for path in ["tests/test_files/usdm_1.json", "tests/test_files/usdm_2.json"]:
+            errors = Errors()
+            result = TrustedLoader().load(path, errors)
+            expected = USDM4().load(path, Errors())
+            assert errors.error_count() == 0
+            assert result.model_dump() == expected.model_dump()
+            assert result.study.model_fields_set == expected.study.model_fields_set
+
+    def test_conversions(self, tmp_path):
+        """Test the scalar conversions made by validation are applied."""
+        path = tmp_path / "usdm.json"
+        with open("tests/test_files/usdm_1.json") as f:
+            data = json.load(f)
+        data["study"]["id"] = "550e8400-e29b-41d4-a716-446655440000"
+        with open(path, "w") as f:
+            json.dump(data, f)
+        wrapper = TrustedLoader().load(str(path), Errors())
+        assert wrapper.study.id == uuid.UUID(data["study"]["id"])
+        date = wrapper.study.versions[0].amendments[0].dateValues[0]
+        assert isinstance(date.dateValue, datetime.date)
+        assert wrapper.model_dump() == USDM4().load(str(path), Errors()).model_dump()
+
+    def test_union_selection(self):
+        """Test the first model with all required fields is chosen as validation would."""
+        wrapper = TrustedLoader().load("tests/test_files/usdm_1.json", Errors())
+        expected = USDM4().load("tests/test_files/usdm_1.json", Errors())
+        timeline = wrapper.study.versions[0].studyDesigns[0].scheduleTimelines[0]
+        types = [type(x) for x in timeline.instances]
+        timeline = expected.study.versions[0].studyDesigns[0].scheduleTimelines[0]
+        assert types == [type(x) for x in timeline.instances]
+
+    def test_union_fallback(self, tmp_path):
+        """Test the first model is used when none have all required fields."""
+        path = tmp_path / "usdm.json"
+        with open("tests/test_files/usdm_2.json") as f:
+            data = json.load(f)
+        design = data["study"]["versions"][0]["studyDesigns"][0]
+        design.pop("model")
+        with open(path, "w") as f:
+            json.dump(data, f)
+        wrapper = TrustedLoader().load(str(path), Errors())
+        design = wrapper.study.versions[0].studyDesigns[0]
+        assert type(design).__name__ == "InterventionalStudyDesign"
+
+    def test_model_with_private_attributes(self):
+        """Test models needing more than plain construction are validated."""
+        holder = TrustedLoader()._build(Holder, {"items": [{"name": "A"}]})
+        assert holder.items[0].name == "A"
+        assert holder.items[0]._cache == {}
+
+    def test_load_failure(self):
+        """Test a file that cannot be read is reported as an error."""
+        errors = Errors()
+        assert TrustedLoader().load("tests/test_files/missing.json", errors) is None
+        assert errors.error_count() == 1
+        assert errors.to_dict()[0]["message"].startswith(
+            "Failed to load file 'tests/test_files/missing.json' into USDM"
+        )
+
+    def test_loadd(self):
+        """Test a study held as a dict is built."""
+        with open("tests/test_files/usdm_2.json") as f:
+            data = json.load(f)
+        errors = Errors()
+        result = TrustedLoader().loadd(data, errors)
+        assert errors.error_count() == 0
+        assert result.model_dump() == USDM4().loadd(data, Errors()).model_dump()
+
+    def test_loadd_failure(self):
+        """Test a dict that cannot be built is reported as an error."""
+        errors = Errors()
+        assert TrustedLoader().loadd(None, errors) is None
+        assert errors.to_dict()[0]["message"].startswith(
+            "Failed to load a dict into USDM"
+        )
@@ -0,0 +1,73 @@
+import json
+import tracemalloc
+
+from usdm3_excel.profiling.export_profile import ExportProfile, measure
+
+
+class TestExportProfile:
+    """Tests for the ExportProfile class."""
+
+    def test_measure(self):
+        """Test a stage is measured."""
+        profile = ExportProfile()
+        profile.start()
+        with profile.measure(ExportProfile.LOAD, "usdm"):
+            data = [bytearray(1024) for _ in range(100)]
+        profile.stop()
+        assert len(data) == 100
+        assert not tracemalloc.is_tracing()
+        entry = profile.stages[0]
+        assert entry["stage"] == "load"
+        assert entry["name"] == "usdm"
+        assert entry["count"] == 1
+        assert entry["wall"] > 0.0
+        assert entry["cpu"] >= 0.0
+        assert entry["peak_bytes"] >= 100 * 1024
+        assert entry["allocated_bytes"] >= 100 * 1024
+        assert profile.wall >= entry["wall"]
+
+    def test_combine(self):
+        """Test repeated measurements of a stage are combined."""
+        profile = ExportProfile()
+        profile.start()
+        with profile.measure(ExportProfile.TABLE, "sheet"):
+            data = bytearray(64 * 1024)
+        with profile.measure(ExportProfile.TABLE, "sheet"):
+            del data
+        with profile.measure(ExportProfile.FORMAT, "sheet"):
+            pass
+        profile.stop()
+        assert [(x["stage"], x["count"]) for x in profile.stages] == [
+            ("table", 2),
+            ("format", 1),
+        ]
+        assert profile.stages[0]["peak_bytes"] >= 64 * 1024
+        assert profile.stages[0]["allocated_bytes"] < 64 * 1024
+
+    def test_already_tracing(self):
+        """Test tracing started elsewhere is left running."""
+        tracemalloc.start()
+        try:
+            profile = ExportProfile()
+            profile.start()
+            profile.stop()
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
+
+    def test_to_json(self):
+        """Test the report as JSON."""
+        profile = ExportProfile()
+        profile.start()
+        with profile.measure(ExportProfile.SAVE, "workbook"):
+            pass
+        profile.stop()
+        data = json.loads(profile.to_json())
+        assert data["usdm3_excel"]
+        assert data["wall"] == profile.wall
+        assert [x["stage"] for x in data["stages"]] == ["save"]
+
+    def test_measure_without_profile(self):
+        """Test measuring is skipped without a profile."""
+        with measure(None, ExportProfile.LOAD, "usdm"):
+            pass
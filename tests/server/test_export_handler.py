@@ -0,0 +1,123 @@
+import http.client
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+
+from usdm3_excel.server.export_handler import ExportHandler
+from usdm3_excel.server.export_server import ExportServer
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), ExportHandler)
+    httpd.export_server = MagicMock(
+        workers=2, CONTENT_TYPE=ExportServer.CONTENT_TYPE, max_size=16
+    )
+    httpd.export_server.request_options.return_value = {"writer": "xml"}
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    thread.join()
+    httpd.server_close()
+
+
+def request(httpd, path, data=None):
+    host, port = httpd.server_address[:2]
+    try:
+        with urllib.request.urlopen(f"http://{host}:{port}{path}", data) as response:
+            return response.status, response.headers["Content-Type"], response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers["Content-Type"], e.read()
+
+
+def post(httpd, length, data=b"{}"):
+    # Sends the Content-Length given rather than that of the data
+    host, port = httpd.server_address[:2]
+    connection = http.client.HTTPConnection(host, port)
+    try:
+        connection.putrequest("POST", "/convert")
+        connection.putheader("Content-Length", length)
+        connection.endheaders(data)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+class TestExportHandler:
+    """Tests for the ExportHandler class."""
+
+    def test_health(self, server):
+        """Test the health check reports the workers."""
+        status, _, body = request(server, "/health")
+        assert status == 200
+        assert json.loads(body) == {"status": "ok", "workers": 2}
+
+    def test_not_found(self, server):
+        """Test unknown paths are not found."""
+        assert request(server, "/other")[0] == 404
+        assert request(server, "/other", b"{}")[0] == 404
+
+    def test_convert(self, server):
+        """Test the workbook is returned for the posted JSON and options."""
+        server.export_server.convert.return_value = (b"workbook", [])
+        status, content_type, body = request(server, "/convert?writer=xml", b"{}")
+        assert status == 200
+        assert content_type == ExportServer.CONTENT_TYPE
+        assert body == b"workbook"
+        server.export_server.request_options.assert_called_once_with("writer=xml")
+        server.export_server.convert.assert_called_once_with(b"{}", {"writer": "xml"})
+
+    def test_convert_empty(self, server):
+        """Test a request without a body is rejected."""
+        status, _, body = request(server, "/convert", b"")
+        assert status == 400
+        assert json.loads(body) == {"error": "The request body must be the USDM JSON"}
+
+    @pytest.mark.parametrize("length", ["abc", "-2"])
+    def test_convert_invalid_length(self, server, length):
+        """Test a malformed or negative Content-Length is rejected."""
+        assert post(server, length) == (
+            400,
+            {"error": "The Content-Length of the request is invalid"},
+        )
+        server.export_server.convert.assert_not_called()
+
+    def test_convert_too_large(self, server):
+        """Test a body above the limit of the server is rejected unread."""
+        server.export_server.convert.return_value = (b"workbook", [])
+        status, _, body = request(server, "/convert", b"{" + b" " * 16 + b"}")
+        assert status == 413
+        assert json.loads(body) == {
+            "error": "The request body is larger than the limit of 16 bytes"
+        }
+        server.export_server.convert.assert_not_called()
+        assert request(server, "/convert", b" " * 14 + b"{}")[0] == 200
+
+    def test_convert_bad_options(self, server):
+        """Test bad options are rejected."""
+        server.export_server.request_options.side_effect = ValueError("Bad option")
+        status, _, body = request(server, "/convert?x=1", b"{}")
+        assert status == 400
+        assert json.loads(body) == {"error": "Bad option"}
+
+    def test_convert_errors(self, server):
+        """Test export errors are returned as JSON."""
+        server.export_server.convert.return_value = (None, [{"message": "Failed"}])
+        status, content_type, body = request(server, "/convert", b"{}")
+        assert status == 422
+        assert content_type == "application/json"
+        assert json.loads(body) == {"errors": [{"message": "Failed"}]}
+
+    def test_convert_failure(self, server):
+        """Test a failure of the server itself."""
+        server.export_server.convert.side_effect = RuntimeError("Worker crashed")
+        status, _, body = request(server, "/convert", b"{}")
+        assert status == 500
+        assert json.loads(body) == {"error": "Worker crashed"}
@@ -0,0 +1,176 @@
+import io
+import os
+import signal
+import threading
+import time
+import urllib.request
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock, patch
+
+import openpyxl
+import pytest
+
+from usdm3_excel.cache.export_cache import ExportCache
+from usdm3_excel.server.export_server import (
+    ExportServer,
+    export,
+    initialise_worker,
+)
+
+USDM_1 = "tests/test_files/usdm_1.json"
+
+
+def ready() -> None:
+    # Stands in for the worker initialisers, the workers not needing the package
+    pass
+
+
+def crash(data, options, cache):
+    # Stands in for export in the workers, ending the process for the request
+    # posting crash while the others are still running
+    if data == b"crash":
+        os._exit(1)
+    time.sleep(0.2)
+    return data, []
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class TestExportServer:
+    """Tests for the ExportServer class and worker functions."""
+
+    def test_initialise_worker(self):
+        """Test workers leave interrupts to the server."""
+        previous = signal.getsignal(signal.SIGINT)
+        try:
+            initialise_worker()
+            assert signal.getsignal(signal.SIGINT) == signal.SIG_IGN
+        finally:
+            signal.signal(signal.SIGINT, previous)
+
+    def test_export(self):
+        """Test converting in process."""
+        workbook, errors = export(read(USDM_1), {"writer": "xml"})
+        assert errors == []
+        assert openpyxl.load_workbook(io.BytesIO(workbook)).sheetnames[0] == "study"
+
+    def test_export_failure(self):
+        """Test a bad study is reported rather than raised."""
+        workbook, errors = export(b"{not json", {})
+        assert workbook is None
+        messages = [x["message"].split("\n")[0] for x in errors]
+        assert messages == ["Failed to parse the USDM JSON"]
+
+    def test_export_exception(self):
+        """Test an exception raised by the export is reported."""
+        with patch("usdm3_excel.USDM3Excel.to_bytes", side_effect=OSError("disk")):
+            workbook, errors = export(b"{}", {})
+        assert workbook is None
+        messages = [x["message"].split("\n")[0] for x in errors]
+        assert messages == ["Failed to convert the USDM JSON"]
+
+    def test_defaults(self):
+        """Test the default settings."""
+        server = ExportServer()
+        assert server.host == "127.0.0.1"
+        assert server.port == ExportServer.DEFAULT_PORT
+        assert server.workers == os.cpu_count()
+        assert server.options == {}
+        assert server.cache is None
+        assert server.max_size == ExportServer.DEFAULT_MAX_SIZE
+        assert ExportServer(max_size=1024).max_size == 1024
+
+    def test_request_options(self):
+        """Test the options of a request override those of the server."""
+        server = ExportServer(options={"writer": "streaming", "trusted": True})
+        assert server.request_options("") == {"writer": "streaming", "trusted": True}
+        assert server.request_options(
+            "writer=xml&compression=max&trusted=0&deterministic"
+        ) == {
+            "writer": "xml",
+            "compression": "max",
+            "trusted": False,
+            "deterministic": True,
+        }
+        assert server.options == {"writer": "streaming", "trusted": True}
+
+    def test_request_options_invalid(self):
+        """Test unknown options and values are rejected."""
+        server = ExportServer()
+        with pytest.raises(ValueError, match="Unknown option 'parallel'"):
+            server.request_options("parallel=process")
+        with pytest.raises(ValueError, match="Unknown writer 'csv'"):
+            server.request_options("writer=csv")
+        with pytest.raises(ValueError, match="Unknown compression 'zip'"):
+            server.request_options("compression=zip")
+
+    def test_serve(self, tmp_path):
+        """Test converting over HTTP with warm workers."""
+        cache = ExportCache(os.path.join(tmp_path, "cache"))
+        server = ExportServer(port=0, workers=1, options={"writer": "xml"}, cache=cache)
+        server.start()
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            host, port = server.address
+            request = urllib.request.Request(
+                f"http://{host}:{port}/convert?deterministic=1", read(USDM_1)
+            )
+            with urllib.request.urlopen(request) as response:
+                workbook = response.read()
+        finally:
+            server.shutdown()
+            thread.join()
+        assert openpyxl.load_workbook(io.BytesIO(workbook)).sheetnames[0] == "study"
+        assert len(os.listdir(cache.directory)) == 1
+
+    def test_convert_crashed_worker(self):
+        """Test a broken pool is replaced and the request converted again."""
+        server = ExportServer(workers=1)
+        pool = MagicMock()
+        pool.submit.return_value.result.side_effect = BrokenProcessPool()
+        server._pool = pool
+        with (
+            patch.object(server, "_new_pool") as mock_new_pool,
+            patch("usdm3_excel.server.export_server.initialise_worker", ready),
+            patch("usdm3_excel.server.export_server.export", crash),
+        ):
+            mock_new_pool.return_value = pool
+            assert server.convert(b"ok", {}) == (b"ok", [])
+            with pytest.raises(RuntimeError, match="Worker process terminated"):
+                server.convert(b"crash", {})
+        assert server._pool is pool
+        assert mock_new_pool.call_count == 2
+
+    def test_convert_concurrent_crash(self):
+        """Test only the request crashing a worker fails, not those beside it."""
+        server = ExportServer(workers=2)
+        results = {}
+
+        def convert(data):
+            try:
+                results[data] = server.convert(data, {})
+            except RuntimeError as e:
+                results[data] = str(e)
+
+        with (
+            patch("usdm3_excel.server.export_server.initialise", ready),
+            patch("usdm3_excel.server.export_server.initialise_worker", ready),
+            patch("usdm3_excel.server.export_server.export", crash),
+        ):
+            server._pool = server._new_pool()
+            threads = [
+                threading.Thread(target=convert, args=(x,)) for x in [b"ok", b"crash"]
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            server._pool.shutdown()
+        assert results == {
+            b"ok": (b"ok", []),
+            b"crash": "Worker process terminated while converting the USDM JSON",
+        }
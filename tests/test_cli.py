@@ -0,0 +1,199 @@
+import json
+import os
+import pytest
+import runpy
+from unittest.mock import patch
+
+from usdm3_excel.cli import main
+
+USDM_1 = "tests/test_files/usdm_1.json"
+
+
+def test_convert(tmp_path):
+    output = os.path.join(tmp_path, "out.xlsx")
+    assert main(["convert", USDM_1, output]) == 0
+    assert os.path.exists(output)
+
+
+def test_convert_streaming(tmp_path):
+    output = os.path.join(tmp_path, "out.xlsx")
+    assert main(["convert", "--writer", "streaming", USDM_1, output]) == 0
+    assert os.path.exists(output)
+
+
+def test_convert_xml(tmp_path):
+    output = os.path.join(tmp_path, "out.xlsx")
+    assert main(["convert", "--writer", "xml", USDM_1, output]) == 0
+    assert os.path.exists(output)
+
+
+def test_convert_compression(tmp_path):
+    output = os.path.join(tmp_path, "out.xlsx")
+    assert main(["convert", "--compression", "max", USDM_1, output]) == 0
+    assert os.path.exists(output)
+
+
+def test_convert_deterministic(tmp_path):
+    outputs = [os.path.join(tmp_path, f"out_{i}.xlsx") for i in range(2)]
+    for output in outputs:
+        assert main(["convert", "--deterministic", USDM_1, output]) == 0
+    with open(outputs[0], "rb") as f, open(outputs[1], "rb") as g:
+        assert f.read() == g.read()
+
+
+def test_convert_plan(tmp_path):
+    output = os.path.join(tmp_path, "out.xlsx")
+    plan = os.path.join(tmp_path, "plan.json")
+    assert main(["convert", "--plan", plan, USDM_1, output]) == 0
+    assert os.path.exists(plan)
+
+
+def test_convert_profile(tmp_path):
+    output = os.path.join(tmp_path, "out.xlsx")
+    report = os.path.join(tmp_path, "profile.json")
+    assert main(["convert", "--profile", report, USDM_1, output]) == 0
+    with open(report) as f:
+        data = json.load(f)
+    assert data["stages"][0]["stage"] == "load"
+
+
+def test_convert_all_designs(tmp_path, capsys):
+    output = os.path.join(tmp_path, "out.xlsx")
+    assert main(["convert", "--all-designs", USDM_1, output]) == 0
+    path = os.path.join(tmp_path, "out_v1_d1.xlsx")
+    assert os.path.exists(path)
+    assert capsys.readouterr().out.split() == [path]
+
+
+def test_convert_all_designs_plan(tmp_path):
+    output = os.path.join(tmp_path, "out.xlsx")
+    with pytest.raises(SystemExit):
+        main(["convert", "--all-designs", "--plan", "plan.json", USDM_1, output])
+
+
+def test_convert_cache(tmp_path):
+    output = os.path.join(tmp_path, "out.xlsx")
+    cache_dir = os.path.join(tmp_path, "cache")
+    args = ["convert", "--cache-dir", cache_dir, "--cache-size", "10"]
+    assert main(args + [USDM_1, output]) == 0
+    assert len(os.listdir(cache_dir)) == 1
+    os.remove(output)
+    with patch("usdm3_excel.USDM3Excel.to_plan") as mock_to_plan:
+        assert main(args + [USDM_1, output]) == 0
+        mock_to_plan.assert_not_called()
+    assert os.path.exists(output)
+
+
+def test_convert_trusted(tmp_path):
+    output = os.path.join(tmp_path, "out.xlsx")
+    with patch("usdm3_excel.USDM3Excel.to_excel", return_value=None) as mock_to_excel:
+        assert main(["convert", "--trusted", USDM_1, output]) == 0
+    assert mock_to_excel.call_args.kwargs["trusted"] is True
+
+
+def test_convert_failure(tmp_path, capsys):
+    output = os.path.join(tmp_path, "out.xlsx")
+    assert main(["convert", "tests/test_files/missing.json", output]) == 1
+    assert "No such file or directory" in capsys.readouterr().err
+
+
+def test_convert_exception(tmp_path, capsys):
+    output = os.path.join(tmp_path, "missing", "out.xlsx")
+    assert main(["convert", USDM_1, output]) == 1
+    assert f"Failed to convert '{USDM_1}'" in capsys.readouterr().err
+    assert not os.path.exists(output)
+
+
+def test_batch(tmp_path, capsys):
+    report = os.path.join(tmp_path, "report.json")
+    output_dir = os.path.join(tmp_path, "out")
+    with patch("usdm3_excel.USDM3Excel.to_excel_many") as mock_many:
+        from usdm3_excel.batch.batch_runner import convert
+
+        mock_many.side_effect = lambda jobs, workers, **options: [
+            convert(*x, options) for x in jobs
+        ]
+        result = main(
+            [
+                "batch",
+                USDM_1,
+                USDM_1,
+                "tests/test_files/missing.json",
+                "-o",
+                output_dir,
+                "-w",
+                "2",
+                "--report",
+                report,
+            ]
+        )
+    assert result == 1
+    jobs = mock_many.call_args.args[0]
+    assert [os.path.basename(x[1]) for x in jobs] == [
+        "usdm_1.xlsx",
+        "usdm_1_1.xlsx",
+        "missing.xlsx",
+    ]
+    assert mock_many.call_args.kwargs == {
+        "workers": 2,
+        "writer": "openpyxl",
+        "parallel": None,
+        "trusted": False,
+        "compression": None,
+        "deterministic": False,
+    }
+    assert "2 converted, 1 failed" in capsys.readouterr().out
+    with open(report) as f:
+        data = json.load(f)
+    assert [x["status"] for x in data] == ["success", "success", "failed"]
+
+
+def test_batch_success(tmp_path):
+    output_dir = os.path.join(tmp_path, "out")
+    with patch("usdm3_excel.USDM3Excel.to_excel_many") as mock_many:
+        mock_many.return_value = []
+        assert main(["batch", USDM_1, "-o", output_dir]) == 0
+    assert os.path.isdir(output_dir)
+
+
+def test_no_command():
+    with pytest.raises(SystemExit):
+        main([])
+
+
+def test_module_entry():
+    with patch("usdm3_excel.cli.main", return_value=0), pytest.raises(SystemExit) as e:
+        runpy.run_module("usdm3_excel", run_name="__main__")
+    assert e.value.code == 0
+
+
+def test_serve(capsys):
+    with patch("usdm3_excel.server.export_server.ExportServer") as mock_server_class:
+        server = mock_server_class.return_value
+        server.address = ("127.0.0.1", 9000)
+        server.workers = 2
+        server.serve_forever.side_effect = KeyboardInterrupt()
+        assert (
+            main(
+                ["serve", "--port", "9000", "-w", "2", "--writer", "xml"]
+                + ["--max-size", "5"]
+            )
+            == 0
+        )
+    args = mock_server_class.call_args.args
+    assert args[:3] == ("127.0.0.1", 9000, 2)
+    assert args[3]["writer"] == "xml"
+    assert args[5] == 5 * 1024 * 1024
+    server.start.assert_called_once_with()
+    assert "http://127.0.0.1:9000/convert with 2 workers" in capsys.readouterr().out
+
+
+def test_serve_default_port():
+    with patch("usdm3_excel.server.export_server.ExportServer") as mock_server_class:
+        mock_server_class.DEFAULT_PORT = 8765
+        server = mock_server_class.return_value
+        server.address = ("127.0.0.1", 8765)
+        server.serve_forever.side_effect = KeyboardInterrupt()
+        assert main(["serve"]) == 0
+    assert mock_server_class.call_args.args[1] == 8765
+    assert mock_server_class.call_args.args[5] is None
@@ -1,8 +1,26 @@
+import asyncio
+import io
 import os
 import json
+import pathlib
+import subprocess
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import openpyxl
 import pytest
 from unittest.mock import MagicMock, patch, mock_open
+from simple_error_log import Errors
+from usdm4 import USDM4
 from usdm3_excel import USDM3Excel
+from usdm3_excel.export.excel_table_writer.excel_table_writer import (
+    ExcelTableWriter as USDM3ExcelTableWriter,
+)
+from usdm3_excel.export.excel_table_writer.xml_table_writer import XmlTableWriter
+from usdm3_excel.export.plan.workbook_plan import WorkbookPlan
+from usdm3_excel.cache.export_cache import ExportCache
+from usdm3_excel.export import sheet_runner
+from tests.helpers.design_helper import load_designs
 from usdm4_excel.export.base.ct_version import CTVersion
 from usdm4_excel.export.excel_table_writer.excel_table_writer import ExcelTableWriter
 
@@ -50,23 +68,39 @@ class TestUSDM3Excel:
                 return_value=mock_etw,
             ),
             patch("usdm4.USDM4") as mock_usdm4_class,
-            patch("usdm3_excel.StudySheet") as mock_study_sheet_class,
             patch(
-                "usdm3_excel.StudyIdentifiersSheet"
+                "usdm3_excel.export.study_sheet.study_sheet.StudySheet"
+            ) as mock_study_sheet_class,
+            patch(
+                "usdm3_excel.export.study_identifiers_sheet.study_identifiers_sheet.StudyIdentifiersSheet"
             ) as mock_study_identifiers_sheet_class,
-            patch("usdm3_excel.StudyContentSheet") as mock_study_content_sheet_class,
             patch(
-                "usdm3_excel.StudyActivitiesSheet"
+                "usdm3_excel.export.study_content_sheet.study_content_sheet.StudyContentSheet"
+            ) as mock_study_content_sheet_class,
+            patch(
+                "usdm4_excel.export.study_activities_sheet.study_activities_sheet.StudyActivitiesSheet"
             ) as mock_study_activities_sheet_class,
-            patch("usdm3_excel.StudyTimingSheet") as mock_study_timing_sheet_class,
             patch(
-                "usdm3_excel.StudyEncountersSheet"
+                "usdm3_excel.export.study_timing_sheet.study_timing_sheet.StudyTimingSheet"
+            ) as mock_study_timing_sheet_class,
+            patch(
+                "usdm4_excel.export.study_encounters_sheet.study_encounters_sheet.StudyEncountersSheet"
             ) as mock_study_encounters_sheet_class,
-            patch("usdm3_excel.StudyEpochsSheet") as mock_study_epochs_sheet_class,
-            patch("usdm3_excel.StudyArmsSheet") as mock_study_arms_sheet_class,
-            patch("usdm3_excel.StudyDesignSheet") as mock_study_design_sheet_class,
-            patch("usdm3_excel.StudyTimelineSheet") as mock_study_timeline_sheet_class,
-            patch("usdm3_excel.ConfigurationSheet") as mock_configuration_sheet_class,
+            patch(
+                "usdm4_excel.export.study_epochs_sheet.study_epochs_sheet.StudyEpochsSheet"
+            ) as mock_study_epochs_sheet_class,
+            patch(
+                "usdm4_excel.export.study_arms_sheet.study_arms_sheet.StudyArmsSheet"
+            ) as mock_study_arms_sheet_class,
+            patch(
+                "usdm3_excel.export.study_design_sheet.study_design_sheet.StudyDesignSheet"
+            ) as mock_study_design_sheet_class,
+            patch(
+                "usdm3_excel.export.study_timeline_sheet.study_timeline_sheet.StudyTimelineSheet"
+            ) as mock_study_timeline_sheet_class,
+            patch(
+                "usdm4_excel.export.configuration_sheet.configuration_sheet.ConfigurationSheet"
+            ) as mock_configuration_sheet_class,
             patch(
                 "usdm4_excel.export.study_procedures_sheet.study_procedures_sheet.StudyProceduresSheet"
             ) as mock_study_procedures_sheet_class,
@@ -125,3 +159,497 @@ class TestUSDM3Excel:
                 print(f"File {output_file} deleted")
             except Exception as e:
                 print(f"Exception raised delting file {e}")
+
+    def test_to_excel_many(self):
+        """Test the batch API delegates to the batch runner."""
+        usdm3_excel = USDM3Excel()
+        jobs = [("a.json", "a.xlsx")]
+        with patch("usdm3_excel.BatchRunner") as mock_runner_class:
+            mock_runner_class.return_value.execute.return_value = ["result"]
+            assert usdm3_excel.to_excel_many(jobs, workers=4) == ["result"]
+            mock_runner_class.assert_called_once_with(4, {}, None)
+            mock_runner_class.return_value.execute.assert_called_once_with(jobs)
+
+    def test_to_excel_many_options(self):
+        """Test export options are passed to the batch runner."""
+        usdm3_excel = USDM3Excel()
+        with patch("usdm3_excel.BatchRunner") as mock_runner_class:
+            usdm3_excel.to_excel_many([], writer="streaming")
+            mock_runner_class.assert_called_once_with(
+                None, {"writer": "streaming"}, None
+            )
+
+    def test_errors(self):
+        """Test the error log is available before an export."""
+        usdm3_excel = USDM3Excel()
+        assert usdm3_excel.errors().count() == 0
+
+    def test_to_excel_unknown_writer(self):
+        """Test an unknown writer backend is rejected."""
+        usdm3_excel = USDM3Excel()
+        with pytest.raises(ValueError, match="Unknown writer 'fast'"):
+            usdm3_excel.to_excel("test.json", "test.xlsx", writer="fast")
+
+    def test_to_plan(self, tmp_path):
+        """Test a plan rendered after a JSON round trip matches a direct export."""
+        usdm3_excel = USDM3Excel()
+        direct = str(tmp_path / "direct.xlsx")
+        rendered = str(tmp_path / "rendered.xlsx")
+        usdm3_excel.to_excel("tests/test_files/usdm_1.json", direct)
+        plan = usdm3_excel.to_plan("tests/test_files/usdm_1.json")
+        assert usdm3_excel.errors().error_count() == 0
+        usdm3_excel.from_plan(WorkbookPlan.from_json(plan.to_json()), rendered)
+        expected = openpyxl.load_workbook(direct)
+        result = openpyxl.load_workbook(rendered)
+        assert result.sheetnames == expected.sheetnames
+        for name in expected.sheetnames:
+            assert list(result[name].values) == list(expected[name].values)
+
+    def test_from_plan_unknown_writer(self):
+        """Test an unknown writer backend is rejected when rendering a plan."""
+        usdm3_excel = USDM3Excel()
+        with pytest.raises(ValueError, match="Unknown writer 'fast'"):
+            usdm3_excel.from_plan(WorkbookPlan(), "test.xlsx", writer="fast")
+
+    def test_to_excel_cached(self, tmp_path):
+        """Test a repeated export is served from the cache."""
+        cache = ExportCache(str(tmp_path / "cache"))
+        usdm3_excel = USDM3Excel(cache)
+        first = str(tmp_path / "first.xlsx")
+        second = str(tmp_path / "second.xlsx")
+        usdm3_excel.to_excel("tests/test_files/usdm_1.json", first)
+        assert cache.size() > 0
+        with patch.object(usdm3_excel, "to_plan") as mock_to_plan:
+            usdm3_excel.to_excel("tests/test_files/usdm_1.json", second)
+            mock_to_plan.assert_not_called()
+            assert usdm3_excel.errors().count() == 0
+        with open(first, "rb") as f, open(second, "rb") as g:
+            assert f.read() == g.read()
+
+    def test_to_excel_cache_writer(self, tmp_path):
+        """Test exports with a different writer are cached separately."""
+        cache = ExportCache(str(tmp_path / "cache"))
+        usdm3_excel = USDM3Excel(cache)
+        output = str(tmp_path / "out.xlsx")
+        usdm3_excel.to_excel("tests/test_files/usdm_1.json", output)
+        usdm3_excel.to_excel("tests/test_files/usdm_1.json", output, "streaming")
+        assert len(os.listdir(cache.directory)) == 2
+
+    def test_to_excel_compression(self, tmp_path):
+        """Test the compression of the workbook, which is cached separately."""
+        cache = ExportCache(str(tmp_path / "cache"))
+        usdm3_excel = USDM3Excel(cache)
+        stored = usdm3_excel.to_bytes(
+            "tests/test_files/usdm_1.json", compression="store"
+        )
+        deflated = usdm3_excel.to_bytes("tests/test_files/usdm_1.json")
+        assert len(stored) > len(deflated)
+        assert len(os.listdir(cache.directory)) == 2
+        with pytest.raises(ValueError, match="Unknown compression 'zip'"):
+            usdm3_excel.to_excel(
+                "tests/test_files/usdm_1.json", io.BytesIO(), compression="zip"
+            )
+
+    def test_to_excel_deterministic(self, tmp_path):
+        """Test identical input gives identical bytes, cached separately."""
+        cache = ExportCache(str(tmp_path / "cache"))
+        usdm3_excel = USDM3Excel(cache)
+        path = "tests/test_files/usdm_1.json"
+        first = USDM3Excel().to_bytes(path, deterministic=True)
+        second = usdm3_excel.to_bytes(path, deterministic=True, parallel="thread")
+        assert first == second
+        assert first != usdm3_excel.to_bytes(path)
+        assert len(os.listdir(cache.directory)) == 2
+
+    def test_to_excel_cache_errors(self, tmp_path):
+        """Test exports reporting errors are not cached."""
+        cache = ExportCache(str(tmp_path / "cache"))
+        usdm3_excel = USDM3Excel(cache)
+
+        def to_plan(*args):
+            usdm3_excel._errors.error("Invalid study")
+
+        with (
+            patch.object(usdm3_excel, "to_plan", side_effect=to_plan),
+            patch.object(usdm3_excel, "from_plan"),
+        ):
+            usdm3_excel.to_excel("tests/test_files/usdm_1.json", "x.xlsx")
+        assert cache.size() == 0
+
+    def test_to_excel_cache_trusted(self, tmp_path):
+        """Test trusted exports are not served to exports validating the input."""
+        cache = ExportCache(str(tmp_path / "cache"))
+        usdm3_excel = USDM3Excel(cache)
+        with open("tests/test_files/usdm_1.json") as f:
+            data = json.load(f)
+        data["study"]["versions"][0]["titles"][0]["text"] = None
+        usdm = json.dumps(data).encode()
+        assert usdm3_excel.to_bytes(usdm, trusted=True)
+        assert usdm3_excel.errors().error_count() == 0
+        assert cache.size() > 0
+        usdm3_excel.to_bytes(usdm)
+        assert usdm3_excel.errors().error_count() == 1
+
+    def test_to_excel_invalid_removes_existing(self, tmp_path):
+        """Test a failed export removes the workbook of an earlier one."""
+        usdm = tmp_path / "invalid.json"
+        usdm.write_text("{not json")
+        output = tmp_path / "out.xlsx"
+        output.write_bytes(b"earlier workbook")
+        usdm3_excel = USDM3Excel()
+        usdm3_excel.to_excel(str(usdm), str(output))
+        assert usdm3_excel.errors().error_count() == 1
+        assert not output.exists()
+
+    def test_to_excel_cache_missing_file(self, tmp_path):
+        """Test a missing file is reported as it is without a cache."""
+        usdm3_excel = USDM3Excel(ExportCache(str(tmp_path / "cache")))
+        usdm3_excel.to_excel("tests/test_files/missing.json", "x.xlsx")
+        assert usdm3_excel.errors().error_count() == 1
+        assert not os.path.exists("x.xlsx")
+
+    def test_to_excel_incremental(self, tmp_path):
+        """Test only sheets whose inputs changed are rebuilt."""
+        usdm = str(tmp_path / "usdm.json")
+        plan = str(tmp_path / "plan.json")
+        with open("tests/test_files/usdm_1.json") as f:
+            data = json.load(f)
+        with open(usdm, "w") as f:
+            json.dump(data, f)
+        usdm3_excel = USDM3Excel()
+        usdm3_excel.to_excel(usdm, str(tmp_path / "first.xlsx"), plan_filepath=plan)
+        design = data["study"]["versions"][0]["studyDesigns"][0]
+        design["arms"][0]["name"] = "Changed Arm"
+        with open(usdm, "w") as f:
+            json.dump(data, f)
+        incremental = str(tmp_path / "incremental.xlsx")
+        full = str(tmp_path / "full.xlsx")
+        with patch(
+            "usdm3_excel.export.sheet_runner.compute",
+            side_effect=sheet_runner.compute,
+        ) as mock_compute:
+            usdm3_excel.to_excel(usdm, incremental, plan_filepath=plan)
+        assert [x.args[0].__name__ for x in mock_compute.call_args_list] == [
+            "StudyArmsSheet",
+            "StudyDesignSheet",
+        ]
+        usdm3_excel.to_excel(usdm, full)
+        expected = openpyxl.load_workbook(full)
+        result = openpyxl.load_workbook(incremental)
+        for name in expected.sheetnames:
+            assert list(result[name].values) == list(expected[name].values)
+
+    def test_to_excel_unreadable_plan(self, tmp_path):
+        """Test an unreadable plan file rebuilds every sheet."""
+        plan = str(tmp_path / "plan.json")
+        with open(plan, "w") as f:
+            f.write("not json")
+        usdm3_excel = USDM3Excel()
+        usdm3_excel.to_excel(
+            "tests/test_files/usdm_1.json",
+            str(tmp_path / "out.xlsx"),
+            plan_filepath=plan,
+        )
+        with open(plan) as f:
+            result = WorkbookPlan.from_json(f.read())
+        assert len(result.sheets) == 14
+        assert all(x.fingerprint for x in result.sheets[1:-1])
+
+    def test_to_excel_trusted(self, tmp_path):
+        """Test a trusted export gives the same workbook as a validated one."""
+        usdm3_excel = USDM3Excel()
+        validated = str(tmp_path / "validated.xlsx")
+        trusted = str(tmp_path / "trusted.xlsx")
+        usdm3_excel.to_excel("tests/test_files/usdm_1.json", validated)
+        with patch("usdm4.USDM4") as mock_usdm4:
+            usdm3_excel.to_excel("tests/test_files/usdm_1.json", trusted, trusted=True)
+            mock_usdm4.assert_not_called()
+        expected = openpyxl.load_workbook(validated)
+        result = openpyxl.load_workbook(trusted)
+        for name in expected.sheetnames:
+            assert list(result[name].values) == list(expected[name].values)
+
+    def test_to_excel_xml(self, tmp_path):
+        """Test the XML writer gives the same workbook from lazy tables."""
+        usdm3_excel = USDM3Excel()
+        expected = str(tmp_path / "openpyxl.xlsx")
+        output = str(tmp_path / "xml.xlsx")
+        usdm3_excel.to_excel("tests/test_files/usdm_2.json", expected)
+        with patch.object(
+            usdm3_excel, "to_plan", wraps=usdm3_excel.to_plan
+        ) as mock_to_plan:
+            usdm3_excel.to_excel("tests/test_files/usdm_2.json", output, "xml")
+        assert mock_to_plan.call_args.args[5] is True
+        expected = openpyxl.load_workbook(expected)
+        result = openpyxl.load_workbook(output)
+        assert result.sheetnames == expected.sheetnames
+        for name in expected.sheetnames:
+            assert list(result[name].values) == list(expected[name].values)
+
+    def test_to_bytes(self, tmp_path):
+        """Test each kind of input gives the workbook written to a file."""
+        path = "tests/test_files/usdm_2.json"
+        usdm3_excel = USDM3Excel()
+        output = str(tmp_path / "out.xlsx")
+        usdm3_excel.to_excel(path, output)
+        expected = openpyxl.load_workbook(output)
+        with open(path, "rb") as f:
+            data = f.read()
+        sources = [
+            path,
+            pathlib.Path(path),
+            data,
+            json.loads(data),
+            USDM4().load(path, Errors()),
+        ]
+        for source in sources:
+            result = usdm3_excel.to_bytes(source, writer="streaming")
+            assert usdm3_excel.errors().error_count() == 0
+            result = openpyxl.load_workbook(io.BytesIO(result))
+            assert result.sheetnames == expected.sheetnames
+            for name in expected.sheetnames:
+                assert list(result[name].values) == list(expected[name].values)
+
+    def test_to_bytes_trusted(self):
+        """Test bytes input can be loaded as trusted."""
+        with open("tests/test_files/usdm_2.json", "rb") as f:
+            data = f.read()
+        usdm3_excel = USDM3Excel()
+        with patch("usdm4.USDM4") as mock_usdm4:
+            assert usdm3_excel.to_bytes(data, trusted=True).startswith(b"PK")
+            mock_usdm4.assert_not_called()
+
+    def test_to_bytes_invalid_json(self):
+        """Test bytes that are not JSON are reported."""
+        usdm3_excel = USDM3Excel()
+        assert usdm3_excel.to_bytes(b"{not json") == b""
+        assert (
+            usdm3_excel.errors()
+            .to_dict()[0]["message"]
+            .startswith("Failed to parse the USDM JSON")
+        )
+
+    @pytest.mark.parametrize(
+        "usdm, trusted",
+        [("missing.json", False), ("missing.json", True), ({"study": 1}, False)],
+    )
+    def test_to_excel_invalid(self, tmp_path, usdm, trusted):
+        """Test input that cannot be loaded is reported and nothing is written."""
+        usdm3_excel = USDM3Excel()
+        output = tmp_path / "out.xlsx"
+        if isinstance(usdm, str):
+            usdm = str(tmp_path / usdm)
+        for _ in range(2):
+            assert usdm3_excel.to_excel(usdm, output, trusted=trusted) is None
+            assert usdm3_excel.errors().error_count() == 1
+            assert not output.exists()
+        assert usdm3_excel.to_plan(str(tmp_path / "missing.json")) is None
+
+    def test_to_excel_cached_stream(self, tmp_path):
+        """Test exports to a stream are cached and served from the cache."""
+        cache = ExportCache(str(tmp_path / "cache"))
+        usdm3_excel = USDM3Excel(cache)
+        with open("tests/test_files/usdm_2.json", "rb") as f:
+            data = f.read()
+        first = usdm3_excel.to_bytes(data)
+        assert cache.size() == len(first)
+        with patch.object(usdm3_excel, "to_plan") as mock_to_plan:
+            assert usdm3_excel.to_bytes(data) == first
+            assert usdm3_excel.to_bytes("tests/test_files/usdm_2.json") == first
+            mock_to_plan.assert_not_called()
+
+    def test_to_excel_not_cached(self, tmp_path):
+        """Test inputs without bytes to key on are not cached."""
+        cache = ExportCache(str(tmp_path / "cache"))
+        usdm3_excel = USDM3Excel(cache)
+        with open("tests/test_files/usdm_2.json") as f:
+            usdm3_excel.to_bytes(json.load(f))
+        assert cache.size() == 0
+
+    def test_to_excel_profile(self, tmp_path):
+        """Test every stage of an export is reported when profiling."""
+        usdm3_excel = USDM3Excel()
+        output = str(tmp_path / "out.xlsx")
+        assert usdm3_excel.to_excel("tests/test_files/usdm_2.json", output) is None
+        report = usdm3_excel.to_excel(
+            "tests/test_files/usdm_2.json", output, profile=True
+        )
+        stages = {}
+        for entry in report.stages:
+            stages.setdefault(entry["stage"], []).append(entry["name"])
+        assert stages["load"] == ["usdm"]
+        assert len(stages["blank"]) == 7
+        assert "studyDesignPopulations" in stages["blank"]
+        assert len(stages["sheet"]) == 13
+        assert stages["sheet"][-1] == "ConfigurationSheet"
+        assert "StudyTimelineSheet" in stages["table"]
+        assert "StudyTimelineSheet" in stages["format"]
+        assert stages["save"] == ["workbook"]
+        assert report.wall > 0.0
+        assert openpyxl.load_workbook(output).sheetnames
+
+    def test_to_excel_profile_cache(self, tmp_path):
+        """Test cache use is reported when profiling."""
+        usdm3_excel = USDM3Excel(ExportCache(str(tmp_path / "cache")))
+        path = "tests/test_files/usdm_2.json"
+        report = usdm3_excel.to_excel(path, str(tmp_path / "a.xlsx"), profile=True)
+        assert [x["name"] for x in report.stages if x["stage"] == "cache"] == [
+            "get",
+            "put",
+        ]
+        report = usdm3_excel.to_excel(path, io.BytesIO(), profile=True)
+        assert [x["stage"] for x in report.stages] == ["cache"]
+
+    def test_to_excel_profile_parallel(self):
+        """Test profiling cannot be combined with parallel sheets."""
+        usdm3_excel = USDM3Excel()
+        with pytest.raises(ValueError, match="not in parallel"):
+            usdm3_excel.to_excel(
+                "test.json", "test.xlsx", parallel="thread", profile=True
+            )
+
+    def test_to_excel_async(self):
+        """Test the workbook is streamed back in chunks."""
+        usdm3_excel = USDM3Excel()
+        path = "tests/test_files/usdm_2.json"
+
+        async def export():
+            return [
+                x
+                async for x in usdm3_excel.to_excel_async(
+                    path,
+                    deterministic=True,
+                    executor=executor,
+                    chunk_size=4096,
+                )
+            ]
+
+        with ThreadPoolExecutor(1) as executor:
+            chunks = asyncio.run(export())
+        assert len(chunks) > 1
+        assert all(len(x) <= 4096 for x in chunks)
+        assert b"".join(chunks) == usdm3_excel.to_bytes(path, deterministic=True)
+
+    def test_to_excel_async_cancelled(self):
+        """Test cancelling stops the export before the next sheet."""
+        usdm3_excel = USDM3Excel()
+        started = threading.Event()
+        release = threading.Event()
+        computed = []
+        original = sheet_runner.compute
+
+        def compute(klass, *args):
+            computed.append(klass.__name__)
+            started.set()
+            release.wait(5)
+            return original(klass, *args)
+
+        async def consume():
+            async for _ in usdm3_excel.to_excel_async(
+                "tests/test_files/usdm_2.json", executor=executor
+            ):
+                pass
+
+        async def export():
+            task = asyncio.ensure_future(consume())
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            release.set()
+
+        with patch.object(sheet_runner, "compute", compute):
+            with ThreadPoolExecutor(1) as executor:
+                asyncio.run(export())
+        assert computed == ["StudySheet"]
+
+    def test_to_excel_async_unknown_writer(self):
+        """Test an unknown writer is rejected before the export starts."""
+
+        async def export():
+            async for _ in USDM3Excel().to_excel_async("test.json", writer="csv"):
+                pass
+
+        with pytest.raises(ValueError, match="Unknown writer 'csv'"):
+            asyncio.run(export())
+
+    def test_to_excel_async_process_executor(self):
+        """Test a process pool is rejected, the export being run in this process."""
+
+        async def export(executor):
+            async for _ in USDM3Excel().to_excel_async(
+                "tests/test_files/usdm_1.json", executor=executor
+            ):
+                pass
+
+        with ProcessPoolExecutor(1) as executor:
+            with pytest.raises(ValueError, match="not a ProcessPoolExecutor"):
+                asyncio.run(export(executor))
+
+    def test_to_excel_designs(self, tmp_path):
+        """Test each design is exported to its own workbook from one load."""
+        usdm3_excel = USDM3Excel()
+        wrapper = load_designs()
+        with patch.object(usdm3_excel, "_load", wraps=usdm3_excel._load) as mock_load:
+            paths = usdm3_excel.to_excel_designs(
+                wrapper, tmp_path / "study.xlsx", parallel="thread"
+            )
+        mock_load.assert_called_once()
+        assert paths == [
+            str(tmp_path / "study_v1_d1.xlsx"),
+            str(tmp_path / "study_v1_d2.xlsx"),
+            str(tmp_path / "study_v2_d1.xlsx"),
+        ]
+        assert usdm3_excel.errors().error_count() == 0
+        design = openpyxl.load_workbook(paths[1])["studyDesign"]
+        assert design["B1"].value == "Second design"
+
+    def test_to_excel_designs_single(self, tmp_path):
+        """Test the only design of a study gives the usual workbook."""
+        usdm3_excel = USDM3Excel()
+        path = "tests/test_files/usdm_2.json"
+        paths = usdm3_excel.to_excel_designs(
+            path, str(tmp_path / "study.xlsx"), deterministic=True
+        )
+        assert paths == [str(tmp_path / "study_v1_d1.xlsx")]
+        with open(paths[0], "rb") as f:
+            assert f.read() == usdm3_excel.to_bytes(path, deterministic=True)
+
+    def test_to_excel_designs_invalid(self, tmp_path):
+        """Test nothing is exported when the study cannot be loaded."""
+        usdm3_excel = USDM3Excel()
+        assert usdm3_excel.to_excel_designs(b"{not json", tmp_path / "x.xlsx") == []
+        assert usdm3_excel.errors().error_count() == 1
+        with pytest.raises(ValueError, match="Unknown parallel mode"):
+            usdm3_excel.to_excel_designs(b"{}", tmp_path / "x.xlsx", parallel="gpu")
+
+
+class TestLazyImports:
+    """Tests for the modules of the package imported when first used."""
+
+    @pytest.mark.parametrize("module", ["usdm3_excel", "usdm3_excel.cli"])
+    def test_import_is_light(self, module):
+        """Test importing the package does not import usdm4 or the writers."""
+        code = (
+            f"import sys, {module}; "
+            "print(sorted(m for m in ['usdm4', 'openpyxl', 'usdm4_excel'] "
+            "if m in sys.modules))"
+        )
+        env = dict(os.environ, PYTHONPATH="src")
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, env=env
+        )
+        assert result.stdout.strip() == "[]"
+
+    def test_option_names(self):
+        """Test the option names offered match those of the export."""
+        from usdm3_excel.export.excel_table_writer.xlsx_archive import XlsxArchive
+        from usdm3_excel.export.sheet_runner import SheetRunner
+
+        assert USDM3Excel.PARALLEL_MODES == SheetRunner.MODES
+        assert USDM3Excel.COMPRESSIONS == list(XlsxArchive.COMPRESSION)
+
+    def test_writer(self):
+        """Test a writer is imported when it is asked for."""
+        assert USDM3Excel()._writer("openpyxl") is USDM3ExcelTableWriter
+        assert USDM3Excel()._writer("xml") is XmlTableWriter
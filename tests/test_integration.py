@@ -4,13 +4,13 @@ from tests.helpers.excel_yaml_helper import ExcelYamlHelper
 SAVE = False
 
 
-def run_test(usdm_file, excel_file, yaml_file):
+def run_test(usdm_file, excel_file, yaml_file, **options):
     usdm3_excel = USDM3Excel()
-    usdm3_excel.to_excel(usdm_file, excel_file)
+    usdm3_excel.to_excel(usdm_file, excel_file, **options)
     helper = ExcelYamlHelper(excel_file, yaml_file)
     if SAVE:
         helper.save()
-    assert helper.compare
+    assert helper.compare()
 
 
 def test_integration_1():
@@ -27,3 +27,21 @@ def test_integration_2():
         "tests/test_files/usdm_excel_2.xlsx",
         "tests/test_files/usdm_excel_2.yaml",
     )
+
+
+def test_integration_streaming(tmp_path):
+    run_test(
+        "tests/test_files/usdm_1.json",
+        str(tmp_path / "usdm_excel_1.xlsx"),
+        "tests/test_files/usdm_excel_1.yaml",
+        writer="streaming",
+    )
+
+
+def test_integration_parallel(tmp_path):
+    run_test(
+        "tests/test_files/usdm_2.json",
+        str(tmp_path / "usdm_excel_2.xlsx"),
+        "tests/test_files/usdm_excel_2.yaml",
+        parallel="thread",
+    )